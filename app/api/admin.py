@@ -1,24 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from app.schemes.admin import AdminCreate, AdminUpdate, AdminResponse
 from app.services.admin import AdminService
-from app.api.dependencies import get_admin_service
+from app.api.dependencies import get_admin_service, get_after_cursor, UnitOfWorkRoute
+from app.utils.pagination import set_next_cursor
+from app.utils.responses import FastJSONResponse
 
-router = APIRouter(prefix="/admins", tags=["admins"])
+router = APIRouter(prefix="/admins", tags=["admins"], default_response_class=FastJSONResponse, route_class=UnitOfWorkRoute)
 
 @router.get("/", response_model=list[AdminResponse])
-def get_admins(
+async def get_admins(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    after: Optional[int] = Depends(get_after_cursor),
     service: AdminService = Depends(get_admin_service)
 ):
-    return service.get_all_admins(skip, limit)
+    items = await service.get_all_admins(skip, limit, after)
+    set_next_cursor(response, items, limit)
+    return items
 
 @router.get("/{admin_id}", response_model=AdminResponse)
-def get_admin(
+async def get_admin(
     admin_id: int,
     service: AdminService = Depends(get_admin_service)
 ):
-    admin = service.get_admin_by_id(admin_id)
+    admin = await service.get_admin_by_id(admin_id)
     if not admin:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -27,19 +34,19 @@ def get_admin(
     return admin
 
 @router.post("/", response_model=AdminResponse, status_code=status.HTTP_201_CREATED)
-def create_admin(
+async def create_admin(
     admin_data: AdminCreate,
     service: AdminService = Depends(get_admin_service)
 ):
-    return service.create_admin(admin_data)
+    return await service.create_admin(admin_data)
 
 @router.put("/{admin_id}", response_model=AdminResponse)
-def update_admin(
+async def update_admin(
     admin_id: int,
     admin_data: AdminUpdate,
     service: AdminService = Depends(get_admin_service)
 ):
-    admin = service.update_admin(admin_id, admin_data)
+    admin = await service.update_admin(admin_id, admin_data)
     if not admin:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -48,23 +55,23 @@ def update_admin(
     return admin
 
 @router.delete("/{admin_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_admin(
+async def delete_admin(
     admin_id: int,
     service: AdminService = Depends(get_admin_service)
 ):
-    if not service.delete_admin(admin_id):
+    if not await service.delete_admin(admin_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Admin not found"
         )
 
 @router.post("/login")
-def login_admin(
+async def login_admin(
     login: str,
     password: str,
     service: AdminService = Depends(get_admin_service)
 ):
-    admin = service.authenticate(login, password)
+    admin = await service.authenticate(login, password)
     if not admin:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -1,24 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from app.schemes.categories import CategoryCreate, CategoryUpdate, CategoryResponse
 from app.services.categories import CategoryService
-from app.api.dependencies import get_category_service
+from app.api.dependencies import get_category_service, get_after_cursor, UnitOfWorkRoute
+from app.utils.pagination import set_next_cursor
+from app.utils.responses import FastJSONResponse
 
-router = APIRouter(prefix="/categories", tags=["categories"])
+router = APIRouter(prefix="/categories", tags=["categories"], default_response_class=FastJSONResponse, route_class=UnitOfWorkRoute)
 
 @router.get("/", response_model=list[CategoryResponse])
-def get_categories(
+async def get_categories(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    after: Optional[int] = Depends(get_after_cursor),
     category_service: CategoryService = Depends(get_category_service)
 ):
-    return category_service.get_all_categories(skip, limit)
+    items = await category_service.get_all_categories(skip, limit, after)
+    set_next_cursor(response, items, limit)
+    return items
 
 @router.get("/{category_id}", response_model=CategoryResponse)
-def get_category(
+async def get_category(
     category_id: int,
     category_service: CategoryService = Depends(get_category_service)
 ):
-    category = category_service.get_category_by_id(category_id)
+    category = await category_service.get_category_by_id(category_id)
     if not category:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -27,19 +34,19 @@ def get_category(
     return category
 
 @router.post("/", response_model=CategoryResponse, status_code=status.HTTP_201_CREATED)
-def create_category(
+async def create_category(
     category_data: CategoryCreate,
     category_service: CategoryService = Depends(get_category_service)
 ):
-    return category_service.create_category(category_data)
+    return await category_service.create_category(category_data)
 
 @router.put("/{category_id}", response_model=CategoryResponse)
-def update_category(
+async def update_category(
     category_id: int,
     category_data: CategoryUpdate,
     category_service: CategoryService = Depends(get_category_service)
 ):
-    category = category_service.update_category(category_id, category_data)
+    category = await category_service.update_category(category_id, category_data)
     if not category:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -48,11 +55,11 @@ def update_category(
     return category
 
 @router.delete("/{category_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_category(
+async def delete_category(
     category_id: int,
     category_service: CategoryService = Depends(get_category_service)
 ):
-    if not category_service.delete_category(category_id):
+    if not await category_service.delete_category(category_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Category not found"
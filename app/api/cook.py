@@ -1,24 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from app.schemes.cook import CookCreate, CookUpdate, CookResponse
 from app.services.cook import CookService
-from app.api.dependencies import get_cook_service
+from app.api.dependencies import get_cook_service, get_after_cursor, UnitOfWorkRoute
+from app.utils.pagination import set_next_cursor
+from app.utils.responses import FastJSONResponse
 
-router = APIRouter(prefix="/cooks", tags=["cooks"])
+router = APIRouter(prefix="/cooks", tags=["cooks"], default_response_class=FastJSONResponse, route_class=UnitOfWorkRoute)
 
 @router.get("/", response_model=list[CookResponse])
-def get_cooks(
+async def get_cooks(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    after: Optional[int] = Depends(get_after_cursor),
     service: CookService = Depends(get_cook_service)
 ):
-    return service.get_all_cooks(skip, limit)
+    items = await service.get_all_cooks(skip, limit, after)
+    set_next_cursor(response, items, limit)
+    return items
 
 @router.get("/{cook_id}", response_model=CookResponse)
-def get_cook(
+async def get_cook(
     cook_id: int,
     service: CookService = Depends(get_cook_service)
 ):
-    cook = service.get_cook_by_id(cook_id)
+    cook = await service.get_cook_by_id(cook_id)
     if not cook:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -27,19 +34,19 @@ def get_cook(
     return cook
 
 @router.post("/", response_model=CookResponse, status_code=status.HTTP_201_CREATED)
-def create_cook(
+async def create_cook(
     cook_data: CookCreate,
     service: CookService = Depends(get_cook_service)
 ):
-    return service.create_cook(cook_data)
+    return await service.create_cook(cook_data)
 
 @router.put("/{cook_id}", response_model=CookResponse)
-def update_cook(
+async def update_cook(
     cook_id: int,
     cook_data: CookUpdate,
     service: CookService = Depends(get_cook_service)
 ):
-    cook = service.update_cook(cook_id, cook_data)
+    cook = await service.update_cook(cook_id, cook_data)
     if not cook:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -48,23 +55,23 @@ def update_cook(
     return cook
 
 @router.delete("/{cook_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_cook(
+async def delete_cook(
     cook_id: int,
     service: CookService = Depends(get_cook_service)
 ):
-    if not service.delete_cook(cook_id):
+    if not await service.delete_cook(cook_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Cook not found"
         )
 
 @router.post("/login")
-def login_cook(
+async def login_cook(
     login: str,
     password: str,
     service: CookService = Depends(get_cook_service)
 ):
-    cook = service.authenticate(login, password)
+    cook = await service.authenticate(login, password)
     if not cook:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -1,28 +1,37 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from app.schemes.cook_statistics import (
     CookStatisticsCreate, 
     CookStatisticsUpdate, 
     CookStatisticsResponse
 )
+from app.schemes.prep_time import PrepTimeResponse
 from app.services.cook_statistics import CookStatisticsService
-from app.api.dependencies import get_cook_statistics_service
+from app.services.prep_time import PrepTimeService
+from app.api.dependencies import get_cook_statistics_service, get_after_cursor, get_prep_time_service, UnitOfWorkRoute
+from app.utils.pagination import set_next_cursor
+from app.utils.responses import FastJSONResponse
 
-router = APIRouter(prefix="/cook-statistics", tags=["cook-statistics"])
+router = APIRouter(prefix="/cook-statistics", tags=["cook-statistics"], default_response_class=FastJSONResponse, route_class=UnitOfWorkRoute)
 
 @router.get("/", response_model=list[CookStatisticsResponse])
-def get_all_cook_statistics(
+async def get_all_cook_statistics(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    after: Optional[int] = Depends(get_after_cursor),
     service: CookStatisticsService = Depends(get_cook_statistics_service)
 ):
-    return service.get_all_statistics(skip, limit)
+    items = await service.get_all_statistics(skip, limit, after)
+    set_next_cursor(response, items, limit)
+    return items
 
 @router.get("/{stat_id}", response_model=CookStatisticsResponse)
-def get_cook_statistic(
+async def get_cook_statistic(
     stat_id: int,
     service: CookStatisticsService = Depends(get_cook_statistics_service)
 ):
-    stat = service.get_statistic_by_id(stat_id)
+    stat = await service.get_statistic_by_id(stat_id)
     if not stat:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -31,11 +40,11 @@ def get_cook_statistic(
     return stat
 
 @router.get("/cook/{cook_id}", response_model=CookStatisticsResponse)
-def get_statistic_by_cook(
+async def get_statistic_by_cook(
     cook_id: int,
     service: CookStatisticsService = Depends(get_cook_statistics_service)
 ):
-    stat = service.get_statistic_by_cook(cook_id)
+    stat = await service.get_statistic_by_cook(cook_id)
     if not stat:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -43,26 +52,39 @@ def get_statistic_by_cook(
         )
     return stat
 
+@router.get("/cook/{cook_id}/prep-time", response_model=PrepTimeResponse)
+async def get_cook_prep_time(
+    cook_id: int,
+    service: PrepTimeService = Depends(get_prep_time_service)
+):
+    prep_time = await service.get_prep_time("cook", cook_id)
+    if not prep_time:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No preparation times for this cook yet"
+        )
+    return prep_time
+
 @router.post("/", response_model=CookStatisticsResponse, status_code=status.HTTP_201_CREATED)
-def create_cook_statistic(
+async def create_cook_statistic(
     stat_data: CookStatisticsCreate,
     service: CookStatisticsService = Depends(get_cook_statistics_service)
 ):
-    existing = service.get_statistic_by_cook(stat_data.cook_id)
+    existing = await service.get_statistic_by_cook(stat_data.cook_id)
     if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Statistics for cook {stat_data.cook_id} already exists"
         )
-    return service.create_statistic(stat_data)
+    return await service.create_statistic(stat_data)
 
 @router.put("/{stat_id}", response_model=CookStatisticsResponse)
-def update_cook_statistic(
+async def update_cook_statistic(
     stat_id: int,
     stat_data: CookStatisticsUpdate,
     service: CookStatisticsService = Depends(get_cook_statistics_service)
 ):
-    stat = service.update_statistic(stat_id, stat_data)
+    stat = await service.update_statistic(stat_id, stat_data)
     if not stat:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -71,12 +93,12 @@ def update_cook_statistic(
     return stat
 
 @router.patch("/cook/{cook_id}/update-orders", response_model=CookStatisticsResponse)
-def update_cook_active_orders(
+async def update_cook_active_orders(
     cook_id: int,
     change: int = 1,
     service: CookStatisticsService = Depends(get_cook_statistics_service)
 ):
-    stat = service.update_cook_active_orders(cook_id, change)
+    stat = await service.update_cook_active_orders(cook_id, change)
     if not stat:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -85,11 +107,11 @@ def update_cook_active_orders(
     return stat
 
 @router.delete("/{stat_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_cook_statistic(
+async def delete_cook_statistic(
     stat_id: int,
     service: CookStatisticsService = Depends(get_cook_statistics_service)
 ):
-    if not service.delete_statistic(stat_id):
+    if not await service.delete_statistic(stat_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Cook statistics not found"
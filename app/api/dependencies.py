@@ -1,6 +1,9 @@
-from fastapi import Depends
-from sqlalchemy.orm import Session
-from app.database.database import get_db
+from typing import Optional
+from fastapi import Depends, HTTPException, status
+from app.database.db_manager import DBManager
+from app.database.migration_runner import MigrationRunner
+from app.dependencies import AsyncSessionLocal, UnitOfWorkRoute, get_db_manager, statistics_buffer
+from app.utils.pagination import decode_cursor
 
 # Импортируем репозитории
 from app.repositories.dishes import DishRepository
@@ -16,6 +19,7 @@ from app.repositories.cook import CookRepository
 from app.repositories.users import UserRepository
 from app.repositories.roles import RoleRepository
 from app.repositories.migration import MigrationRepository
+from app.repositories.prep_time import PrepTimeRepository
 
 # Импортируем сервисы
 from app.services.dishes import DishService
@@ -31,46 +35,63 @@ from app.services.cook import CookService
 from app.services.users import UserService
 from app.services.roles import RoleService
 from app.services.migration import MigrationService
+from app.services.prep_time import PrepTimeService
 
-# Dependency для репозиториев
-def get_dish_repository(db: Session = Depends(get_db)):
-    return DishRepository(db)
+# Keyset-пагинация списков: ?after=<курсор из X-Next-Cursor>
+def get_after_cursor(after: Optional[str] = None) -> Optional[int]:
+    if after is None:
+        return None
+    try:
+        return decode_cursor(after)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
 
-def get_order_repository(db: Session = Depends(get_db)):
-    return OrderRepository(db)
+# Dependency для репозиториев: все берутся из DBManager запроса,
+# поэтому работают в одной сессии и фиксируются одним commit
+def get_dish_repository(db: DBManager = Depends(get_db_manager)):
+    return db.dishes
 
-def get_table_repository(db: Session = Depends(get_db)):
-    return TableRepository(db)
+def get_order_repository(db: DBManager = Depends(get_db_manager)):
+    return db.orders
 
-def get_category_repository(db: Session = Depends(get_db)):
-    return CategoryRepository(db)
+def get_table_repository(db: DBManager = Depends(get_db_manager)):
+    return db.tables
 
-def get_order_item_repository(db: Session = Depends(get_db)):
-    return OrderItemRepository(db)
+def get_category_repository(db: DBManager = Depends(get_db_manager)):
+    return db.categories
 
-def get_waiter_statistics_repository(db: Session = Depends(get_db)):
-    return WaiterStatisticsRepository(db)
+def get_order_item_repository(db: DBManager = Depends(get_db_manager)):
+    return db.order_items
 
-def get_cook_statistics_repository(db: Session = Depends(get_db)):
-    return CookStatisticsRepository(db)
+def get_waiter_statistics_repository(db: DBManager = Depends(get_db_manager)):
+    return db.waiter_statistics
 
-def get_waiter_repository(db: Session = Depends(get_db)):
-    return WaiterRepository(db)
+def get_cook_statistics_repository(db: DBManager = Depends(get_db_manager)):
+    return db.cook_statistics
 
-def get_admin_repository(db: Session = Depends(get_db)):
-    return AdminRepository(db)
+def get_prep_time_repository(db: DBManager = Depends(get_db_manager)):
+    return db.prep_time
 
-def get_cook_repository(db: Session = Depends(get_db)):
-    return CookRepository(db)
+def get_waiter_repository(db: DBManager = Depends(get_db_manager)):
+    return db.waiters
 
-def get_user_repository(db: Session = Depends(get_db)):
-    return UserRepository(db)
+def get_admin_repository(db: DBManager = Depends(get_db_manager)):
+    return db.admins
 
-def get_role_repository(db: Session = Depends(get_db)):
-    return RoleRepository(db)
+def get_cook_repository(db: DBManager = Depends(get_db_manager)):
+    return db.cooks
 
-def get_migration_repository(db: Session = Depends(get_db)):
-    return MigrationRepository(db)
+def get_user_repository(db: DBManager = Depends(get_db_manager)):
+    return db.users
+
+def get_role_repository(db: DBManager = Depends(get_db_manager)):
+    return db.roles
+
+def get_migration_repository(db: DBManager = Depends(get_db_manager)):
+    return db.migrations
 
 # Dependency для сервисов
 def get_dish_service(repo: DishRepository = Depends(get_dish_repository)):
@@ -89,10 +110,13 @@ def get_order_item_service(repo: OrderItemRepository = Depends(get_order_item_re
     return OrderItemService(repo)
 
 def get_waiter_statistics_service(repo: WaiterStatisticsRepository = Depends(get_waiter_statistics_repository)):
-    return WaiterStatisticsService(repo)
+    return WaiterStatisticsService(repo, statistics_buffer)
 
 def get_cook_statistics_service(repo: CookStatisticsRepository = Depends(get_cook_statistics_repository)):
-    return CookStatisticsService(repo)
+    return CookStatisticsService(repo, statistics_buffer)
+
+def get_prep_time_service(repo: PrepTimeRepository = Depends(get_prep_time_repository)):
+    return PrepTimeService(repo, statistics_buffer)
 
 def get_waiter_service(repo: WaiterRepository = Depends(get_waiter_repository)):
     return WaiterService(repo)
@@ -110,4 +134,9 @@ def get_role_service(repo: RoleRepository = Depends(get_role_repository)):
     return RoleService(repo)
 
 def get_migration_service(repo: MigrationRepository = Depends(get_migration_repository)):
-    return MigrationService(repo)
\ No newline at end of file
+    return MigrationService(repo)
+
+# Runner открывает по транзакции на миграцию, поэтому берёт фабрику
+# сессий пишущего движка, а не DBManager запроса
+def get_migration_runner():
+    return MigrationRunner(AsyncSessionLocal)
@@ -1,21 +1,28 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from app.schemes.dishes import DishCreate, DishUpdate, DishResponse
+from app.schemes.prep_time import PrepTimeResponse
 from app.services.dishes import DishService
-from app.api.dependencies import get_dish_service
+from app.services.prep_time import PrepTimeService
+from app.api.dependencies import get_dish_service, get_after_cursor, get_prep_time_service, UnitOfWorkRoute
+from app.utils.pagination import page_response
+from app.utils.responses import FastJSONResponse
 import logging
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/dishes", tags=["dishes"])
+router = APIRouter(prefix="/dishes", tags=["dishes"], default_response_class=FastJSONResponse, route_class=UnitOfWorkRoute)
 @router.get("/", response_model=list[DishResponse])
-def get_dishes(
+async def get_dishes(
     skip: int = 0,
     limit: int = 100,
+    after: Optional[int] = Depends(get_after_cursor),
     dish_service: DishService = Depends(get_dish_service)
 ):
     """Get all dishes with pagination"""
     try:
-        return dish_service.get_all_dishes(skip, limit)
+        items = await dish_service.get_all_dishes(skip, limit, after)
+        return page_response(items, limit)
     except Exception as e:
         logger.error(f"Error getting dishes: {e}")
         raise HTTPException(
@@ -24,13 +31,13 @@ def get_dishes(
         )
 
 @router.get("/{dish_id}", response_model=DishResponse)
-def get_dish(
+async def get_dish(
     dish_id: int,
     dish_service: DishService = Depends(get_dish_service)
 ):
     """Get single dish by ID"""
     try:
-        dish = dish_service.get_dish_by_id(dish_id)
+        dish = await dish_service.get_dish_by_id(dish_id)
         if not dish:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -46,14 +53,28 @@ def get_dish(
             detail="Error retrieving dish"
         )
 
+@router.get("/{dish_id}/prep-time", response_model=PrepTimeResponse)
+async def get_dish_prep_time(
+    dish_id: int,
+    service: PrepTimeService = Depends(get_prep_time_service)
+):
+    """Preparation time percentiles (p50/p90/p99, minutes) for a dish"""
+    prep_time = await service.get_prep_time("dish", dish_id)
+    if not prep_time:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No preparation times for this dish yet"
+        )
+    return prep_time
+
 @router.post("/", response_model=DishResponse, status_code=status.HTTP_201_CREATED)
-def create_dish(
+async def create_dish(
     dish_data: DishCreate,
     dish_service: DishService = Depends(get_dish_service)
 ):
     """Create new dish"""
     try:
-        dish = dish_service.create_dish(dish_data)
+        dish = await dish_service.create_dish(dish_data)
         if not dish:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -70,14 +91,14 @@ def create_dish(
         )
 
 @router.put("/{dish_id}", response_model=DishResponse)
-def update_dish(
+async def update_dish(
     dish_id: int,
     dish_data: DishUpdate,
     dish_service: DishService = Depends(get_dish_service)
 ):
     """Update existing dish"""
     try:
-        dish = dish_service.update_dish(dish_id, dish_data)
+        dish = await dish_service.update_dish(dish_id, dish_data)
         if not dish:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -94,13 +115,13 @@ def update_dish(
         )
 
 @router.delete("/{dish_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_dish(
+async def delete_dish(
     dish_id: int,
     dish_service: DishService = Depends(get_dish_service)
 ):
     """Delete dish"""
     try:
-        if not dish_service.delete_dish(dish_id):
+        if not await dish_service.delete_dish(dish_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Dish not found"
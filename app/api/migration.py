@@ -1,24 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from app.schemes.migration import MigrationCreate, MigrationUpdate, MigrationResponse
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Response
+from app.schemes.migration import MigrationCreate, MigrationUpdate, MigrationResponse, MigrationRunResponse
 from app.services.migration import MigrationService
-from app.api.dependencies import get_migration_service
+from app.database.migration_runner import MigrationRunner
+from app.api.dependencies import get_migration_service, get_migration_runner, get_after_cursor, UnitOfWorkRoute
+from app.utils.pagination import set_next_cursor
+from app.utils.responses import FastJSONResponse
 
-router = APIRouter(prefix="/migrations", tags=["migrations"])
+router = APIRouter(prefix="/migrations", tags=["migrations"], default_response_class=FastJSONResponse, route_class=UnitOfWorkRoute)
 
 @router.get("/", response_model=list[MigrationResponse])
-def get_migrations(
+async def get_migrations(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    after: Optional[int] = Depends(get_after_cursor),
     service: MigrationService = Depends(get_migration_service)
 ):
-    return service.get_all_migrations(skip, limit)
+    items = await service.get_all_migrations(skip, limit, after)
+    set_next_cursor(response, items, limit)
+    return items
 
 @router.get("/{migration_id}", response_model=MigrationResponse)
-def get_migration(
+async def get_migration(
     migration_id: int,
     service: MigrationService = Depends(get_migration_service)
 ):
-    migration = service.get_migration_by_id(migration_id)
+    migration = await service.get_migration_by_id(migration_id)
     if not migration:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -27,33 +35,37 @@ def get_migration(
     return migration
 
 @router.get("/version/{version}", response_model=MigrationResponse)
-def get_migration_by_version(
+async def get_migration_by_version(
     version: str,
     service: MigrationService = Depends(get_migration_service)
 ):
-    migrations = service.get_all_migrations()
-    for migration in migrations:
-        if migration.version == version:
-            return migration
-    raise HTTPException(
-        status_code=status.HTTP_404_NOT_FOUND,
-        detail="Migration not found"
-    )
+    migration = await service.get_migration_by_version(version)
+    if not migration:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Migration not found"
+        )
+    return migration
 
 @router.post("/", response_model=MigrationResponse, status_code=status.HTTP_201_CREATED)
-def create_migration(
+async def create_migration(
     migration_data: MigrationCreate,
     service: MigrationService = Depends(get_migration_service)
 ):
-    return service.create_migration(migration_data)
+    return await service.create_migration(migration_data)
+
+@router.post("/apply", response_model=MigrationRunResponse)
+async def apply_pending_migrations(runner: MigrationRunner = Depends(get_migration_runner)):
+    """Применить ожидающие миграции по порядку версий, каждую в своей транзакции"""
+    return await runner.run()
 
 @router.put("/{migration_id}", response_model=MigrationResponse)
-def update_migration(
+async def update_migration(
     migration_id: int,
     migration_data: MigrationUpdate,
     service: MigrationService = Depends(get_migration_service)
 ):
-    migration = service.update_migration(migration_id, migration_data)
+    migration = await service.update_migration(migration_id, migration_data)
     if not migration:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -62,22 +74,22 @@ def update_migration(
     return migration
 
 @router.delete("/{migration_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_migration(
+async def delete_migration(
     migration_id: int,
     service: MigrationService = Depends(get_migration_service)
 ):
-    if not service.delete_migration(migration_id):
+    if not await service.delete_migration(migration_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Migration not found"
         )
 
 @router.patch("/{migration_id}/success", response_model=MigrationResponse)
-def mark_migration_success(
+async def mark_migration_success(
     migration_id: int,
     service: MigrationService = Depends(get_migration_service)
 ):
-    migration = service.mark_as_success(migration_id)
+    migration = await service.mark_as_success(migration_id)
     if not migration:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -86,11 +98,11 @@ def mark_migration_success(
     return migration
 
 @router.patch("/{migration_id}/failed", response_model=MigrationResponse)
-def mark_migration_failed(
+async def mark_migration_failed(
     migration_id: int,
     service: MigrationService = Depends(get_migration_service)
 ):
-    migration = service.mark_as_failed(migration_id)
+    migration = await service.mark_as_failed(migration_id)
     if not migration:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,21 +1,26 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from app.schemes.order import OrderCreate, OrderUpdate, OrderResponse
 from app.services.order import OrderService
-from app.api.dependencies import get_order_service
+from app.api.dependencies import get_order_service, get_after_cursor, UnitOfWorkRoute
+from app.utils.pagination import page_response
+from app.utils.responses import FastJSONResponse
 import logging
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/orders", tags=["orders"])
+router = APIRouter(prefix="/orders", tags=["orders"], default_response_class=FastJSONResponse, route_class=UnitOfWorkRoute)
 @router.get("/", response_model=list[OrderResponse])
-def get_orders(
+async def get_orders(
     skip: int = 0,
     limit: int = 100,
+    after: Optional[int] = Depends(get_after_cursor),
     order_service: OrderService = Depends(get_order_service)
 ):
     """Get all orders with pagination"""
     try:
-        return order_service.get_all_orders(skip, limit)
+        items = await order_service.get_all_orders(skip, limit, after)
+        return page_response(items, limit)
     except Exception as e:
         logger.error(f"Error getting orders: {e}")
         raise HTTPException(
@@ -24,13 +29,13 @@ def get_orders(
         )
 
 @router.get("/{order_id}", response_model=OrderResponse)
-def get_order(
+async def get_order(
     order_id: int,
     order_service: OrderService = Depends(get_order_service)
 ):
     """Get single order by ID"""
     try:
-        order = order_service.get_order_by_id(order_id)
+        order = await order_service.get_order_by_id(order_id)
         if not order:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -47,13 +52,13 @@ def get_order(
         )
 
 @router.post("/", response_model=OrderResponse, status_code=status.HTTP_201_CREATED)
-def create_order(
+async def create_order(
     order_data: OrderCreate,
     order_service: OrderService = Depends(get_order_service)
 ):
     """Create new order"""
     try:
-        order = order_service.create_order(order_data)
+        order = await order_service.create_order(order_data)
         if not order:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -70,14 +75,14 @@ def create_order(
         )
 
 @router.put("/{order_id}", response_model=OrderResponse)
-def update_order(
+async def update_order(
     order_id: int,
     order_data: OrderUpdate,
     order_service: OrderService = Depends(get_order_service)
 ):
     """Update existing order"""
     try:
-        order = order_service.update_order(order_id, order_data)
+        order = await order_service.update_order(order_id, order_data)
         if not order:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -94,13 +99,13 @@ def update_order(
         )
 
 @router.delete("/{order_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_order(
+async def delete_order(
     order_id: int,
     order_service: OrderService = Depends(get_order_service)
 ):
     """Delete order"""
     try:
-        if not order_service.delete_order(order_id):
+        if not await order_service.delete_order(order_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Order not found"
@@ -1,21 +1,34 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
-from app.schemes.order_items import OrderItemCreate, OrderItemUpdate, OrderItemResponse
+from app.schemes.order_items import (
+    OrderItemBatchCreate,
+    OrderItemBatchDelete,
+    OrderItemBatchResponse,
+    OrderItemBatchUpdate,
+    OrderItemCreate,
+    OrderItemResponse,
+    OrderItemUpdate,
+)
 from app.services.order_items import OrderItemService
-from app.api.dependencies import get_order_item_service
+from app.api.dependencies import get_order_item_service, get_after_cursor, UnitOfWorkRoute
+from app.utils.pagination import page_response
+from app.utils.responses import FastJSONResponse
 import logging
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/order-items", tags=["order-items"])
+router = APIRouter(prefix="/order-items", tags=["order-items"], default_response_class=FastJSONResponse, route_class=UnitOfWorkRoute)
 @router.get("/", response_model=list[OrderItemResponse])
-def get_order_items(
+async def get_order_items(
     skip: int = 0,
     limit: int = 100,
+    after: Optional[int] = Depends(get_after_cursor),
     service: OrderItemService = Depends(get_order_item_service)
 ):
     """Get all order items with pagination"""
     try:
-        return service.get_all_order_items(skip, limit)
+        items = await service.get_all_order_items(skip, limit, after)
+        return page_response(items, limit)
     except Exception as e:
         logger.error(f"Error getting order items: {e}")
         raise HTTPException(
@@ -23,14 +36,79 @@ def get_order_items(
             detail="Error retrieving order items"
         )
 
+# Пакетные маршруты объявлены до /{item_id}, иначе "batch" попадёт в item_id.
+# Весь пакет — одна транзакция: при ошибке откатывается целиком.
+@router.post("/batch", response_model=OrderItemBatchResponse, status_code=status.HTTP_201_CREATED)
+async def create_order_items(
+    batch: OrderItemBatchCreate,
+    service: OrderItemService = Depends(get_order_item_service)
+):
+    """Create many order items with one multi-row INSERT"""
+    try:
+        items = await service.create_order_items(batch)
+        return {"ids": [item["id"] for item in items], "items": items}
+    except Exception as e:
+        logger.error(f"Error creating order items batch: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error creating order items"
+        )
+
+@router.put("/batch", response_model=OrderItemBatchResponse)
+async def update_order_items(
+    batch: OrderItemBatchUpdate,
+    service: OrderItemService = Depends(get_order_item_service)
+):
+    """Update many order items in one transaction"""
+    try:
+        items = await service.update_order_items(batch)
+        missing = [entry.id for entry, item in zip(batch.items, items) if item is None]
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Order items not found: {missing}"
+            )
+        return {"ids": [item["id"] for item in items], "items": items}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error updating order items batch: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error updating order items"
+        )
+
+@router.delete("/batch", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_order_items(
+    batch: OrderItemBatchDelete,
+    service: OrderItemService = Depends(get_order_item_service)
+):
+    """Delete many order items with one DELETE"""
+    try:
+        deleted = set(await service.delete_order_items(batch))
+        missing = [item_id for item_id in batch.ids if item_id not in deleted]
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Order items not found: {missing}"
+            )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error deleting order items batch: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error deleting order items"
+        )
+
 @router.get("/{item_id}", response_model=OrderItemResponse)
-def get_order_item(
+async def get_order_item(
     item_id: int,
     service: OrderItemService = Depends(get_order_item_service)
 ):
     """Get single order item by ID"""
     try:
-        item = service.get_order_item_by_id(item_id)
+        item = await service.get_order_item_by_id(item_id)
         if not item:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -47,13 +125,13 @@ def get_order_item(
         )
 
 @router.post("/", response_model=OrderItemResponse, status_code=status.HTTP_201_CREATED)
-def create_order_item(
+async def create_order_item(
     item_data: OrderItemCreate,
     service: OrderItemService = Depends(get_order_item_service)
 ):
     """Create new order item"""
     try:
-        item = service.create_order_item(item_data)
+        item = await service.create_order_item(item_data)
         if not item:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -70,14 +148,14 @@ def create_order_item(
         )
 
 @router.put("/{item_id}", response_model=OrderItemResponse)
-def update_order_item(
+async def update_order_item(
     item_id: int,
     item_data: OrderItemUpdate,
     service: OrderItemService = Depends(get_order_item_service)
 ):
     """Update existing order item"""
     try:
-        item = service.update_order_item(item_id, item_data)
+        item = await service.update_order_item(item_id, item_data)
         if not item:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -94,13 +172,13 @@ def update_order_item(
         )
 
 @router.delete("/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_order_item(
+async def delete_order_item(
     item_id: int,
     service: OrderItemService = Depends(get_order_item_service)
 ):
     """Delete order item"""
     try:
-        if not service.delete_order_item(item_id):
+        if not await service.delete_order_item(item_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Order item not found"
@@ -1,24 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from app.schemes.roles import RoleCreate, RoleUpdate, RoleResponse
 from app.services.roles import RoleService
-from app.api.dependencies import get_role_service
+from app.api.dependencies import get_role_service, get_after_cursor, UnitOfWorkRoute
+from app.utils.pagination import set_next_cursor
+from app.utils.responses import FastJSONResponse
 
-router = APIRouter(prefix="/roles", tags=["roles"])
+router = APIRouter(prefix="/roles", tags=["roles"], default_response_class=FastJSONResponse, route_class=UnitOfWorkRoute)
 
 @router.get("/", response_model=list[RoleResponse])
-def get_roles(
+async def get_roles(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    after: Optional[int] = Depends(get_after_cursor),
     service: RoleService = Depends(get_role_service)
 ):
-    return service.get_all_roles(skip, limit)
+    items = await service.get_all_roles(skip, limit, after)
+    set_next_cursor(response, items, limit)
+    return items
 
 @router.get("/{role_id}", response_model=RoleResponse)
-def get_role(
+async def get_role(
     role_id: int,
     service: RoleService = Depends(get_role_service)
 ):
-    role = service.get_role_by_id(role_id)
+    role = await service.get_role_by_id(role_id)
     if not role:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -27,26 +34,26 @@ def get_role(
     return role
 
 @router.post("/", response_model=RoleResponse, status_code=status.HTTP_201_CREATED)
-def create_role(
+async def create_role(
     role_data: RoleCreate,
     service: RoleService = Depends(get_role_service)
 ):
-    existing = service.get_all_roles()
+    existing = await service.get_all_roles()
     for role in existing:
         if role.name == role_data.name:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Role with this name already exists"
             )
-    return service.create_role(role_data)
+    return await service.create_role(role_data)
 
 @router.put("/{role_id}", response_model=RoleResponse)
-def update_role(
+async def update_role(
     role_id: int,
     role_data: RoleUpdate,
     service: RoleService = Depends(get_role_service)
 ):
-    role = service.update_role(role_id, role_data)
+    role = await service.update_role(role_id, role_data)
     if not role:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -55,11 +62,11 @@ def update_role(
     return role
 
 @router.delete("/{role_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_role(
+async def delete_role(
     role_id: int,
     service: RoleService = Depends(get_role_service)
 ):
-    if not service.delete_role(role_id):
+    if not await service.delete_role(role_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Role not found"
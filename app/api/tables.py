@@ -1,21 +1,26 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from app.schemes.tables import TableCreate, TableUpdate, TableResponse
 from app.services.tables import TableService
-from app.api.dependencies import get_table_service
+from app.api.dependencies import get_table_service, get_after_cursor, UnitOfWorkRoute
+from app.utils.pagination import page_response
+from app.utils.responses import FastJSONResponse
 import logging
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/tables", tags=["tables"])
+router = APIRouter(prefix="/tables", tags=["tables"], default_response_class=FastJSONResponse, route_class=UnitOfWorkRoute)
 @router.get("/", response_model=list[TableResponse])
-def get_tables(
+async def get_tables(
     skip: int = 0,
     limit: int = 100,
+    after: Optional[int] = Depends(get_after_cursor),
     table_service: TableService = Depends(get_table_service)
 ):
     """Get all tables with pagination"""
     try:
-        return table_service.get_all_tables(skip, limit)
+        items = await table_service.get_all_tables(skip, limit, after)
+        return page_response(items, limit)
     except Exception as e:
         logger.error(f"Error getting tables: {e}")
         raise HTTPException(
@@ -24,13 +29,13 @@ def get_tables(
         )
 
 @router.get("/{table_id}", response_model=TableResponse)
-def get_table(
+async def get_table(
     table_id: int,
     table_service: TableService = Depends(get_table_service)
 ):
     """Get single table by ID"""
     try:
-        table = table_service.get_table_by_id(table_id)
+        table = await table_service.get_table_by_id(table_id)
         if not table:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -47,13 +52,13 @@ def get_table(
         )
 
 @router.post("/", response_model=TableResponse, status_code=status.HTTP_201_CREATED)
-def create_table(
+async def create_table(
     table_data: TableCreate,
     table_service: TableService = Depends(get_table_service)
 ):
     """Create new table"""
     try:
-        table = table_service.create_table(table_data)
+        table = await table_service.create_table(table_data)
         if not table:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -70,14 +75,14 @@ def create_table(
         )
 
 @router.put("/{table_id}", response_model=TableResponse)
-def update_table(
+async def update_table(
     table_id: int,
     table_data: TableUpdate,
     table_service: TableService = Depends(get_table_service)
 ):
     """Update existing table"""
     try:
-        table = table_service.update_table(table_id, table_data)
+        table = await table_service.update_table(table_id, table_data)
         if not table:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -94,13 +99,13 @@ def update_table(
         )
 
 @router.delete("/{table_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_table(
+async def delete_table(
     table_id: int,
     table_service: TableService = Depends(get_table_service)
 ):
     """Delete table"""
     try:
-        if not table_service.delete_table(table_id):
+        if not await table_service.delete_table(table_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Table not found"
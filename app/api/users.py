@@ -1,14 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Body
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Body, Response
 from pydantic import BaseModel
 from app.schemes.users import UserCreate, UserUpdate, UserResponse
 from app.services.users import UserService
-from app.api.dependencies import get_user_service
+from app.api.dependencies import get_user_service, get_after_cursor, UnitOfWorkRoute
+from app.utils.pagination import set_next_cursor
+from app.utils.responses import FastJSONResponse
 import hashlib
 import logging
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/users", tags=["users"])
+router = APIRouter(prefix="/users", tags=["users"], default_response_class=FastJSONResponse, route_class=UnitOfWorkRoute)
 # Login request schema
 class LoginRequest(BaseModel):
     username: str
@@ -22,14 +25,18 @@ class LoginResponse(BaseModel):
     role: str = None
 
 @router.get("/", response_model=list[UserResponse])
-def get_users(
+async def get_users(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    after: Optional[int] = Depends(get_after_cursor),
     service: UserService = Depends(get_user_service)
 ):
     """Get all users with pagination"""
     try:
-        return service.get_all_users(skip, limit)
+        items = await service.get_all_users(skip, limit, after)
+        set_next_cursor(response, items, limit)
+        return items
     except Exception as e:
         logger.error(f"Error getting users: {e}")
         raise HTTPException(
@@ -38,13 +45,13 @@ def get_users(
         )
 
 @router.get("/{user_id}", response_model=UserResponse)
-def get_user(
+async def get_user(
     user_id: int,
     service: UserService = Depends(get_user_service)
 ):
     """Get single user by ID"""
     try:
-        user = service.get_user_by_id(user_id)
+        user = await service.get_user_by_id(user_id)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -61,13 +68,13 @@ def get_user(
         )
 
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def create_user(
+async def create_user(
     user_data: UserCreate,
     service: UserService = Depends(get_user_service)
 ):
     """Create new user"""
     try:
-        user = service.create_user(user_data)
+        user = await service.create_user(user_data)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -84,14 +91,14 @@ def create_user(
         )
 
 @router.put("/{user_id}", response_model=UserResponse)
-def update_user(
+async def update_user(
     user_id: int,
     user_data: UserUpdate,
     service: UserService = Depends(get_user_service)
 ):
     """Update existing user"""
     try:
-        user = service.update_user(user_id, user_data)
+        user = await service.update_user(user_id, user_data)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -108,13 +115,13 @@ def update_user(
         )
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user(
+async def delete_user(
     user_id: int,
     service: UserService = Depends(get_user_service)
 ):
     """Delete user"""
     try:
-        if not service.delete_user(user_id):
+        if not await service.delete_user(user_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found"
@@ -129,7 +136,7 @@ def delete_user(
         )
 
 @router.post("/login", response_model=LoginResponse)
-def login_user(
+async def login_user(
     login_data: LoginRequest,
     service: UserService = Depends(get_user_service)
 ):
@@ -137,7 +144,7 @@ def login_user(
     try:
         logger.info(f"Login attempt for user: {login_data.username}")
         
-        user = service.authenticate(login_data.username, login_data.password)
+        user = await service.authenticate(login_data.username, login_data.password)
         if not user:
             logger.warning(f"Failed login for user: {login_data.username}")
             raise HTTPException(
@@ -1,24 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from app.schemes.waiter import WaiterCreate, WaiterUpdate, WaiterResponse
 from app.services.waiter import WaiterService
-from app.api.dependencies import get_waiter_service
+from app.api.dependencies import get_waiter_service, get_after_cursor, UnitOfWorkRoute
+from app.utils.pagination import set_next_cursor
+from app.utils.responses import FastJSONResponse
 
-router = APIRouter(prefix="/waiters", tags=["waiters"])
+router = APIRouter(prefix="/waiters", tags=["waiters"], default_response_class=FastJSONResponse, route_class=UnitOfWorkRoute)
 
 @router.get("/", response_model=list[WaiterResponse])
-def get_waiters(
+async def get_waiters(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    after: Optional[int] = Depends(get_after_cursor),
     service: WaiterService = Depends(get_waiter_service)
 ):
-    return service.get_all_waiters(skip, limit)
+    items = await service.get_all_waiters(skip, limit, after)
+    set_next_cursor(response, items, limit)
+    return items
 
 @router.get("/{waiter_id}", response_model=WaiterResponse)
-def get_waiter(
+async def get_waiter(
     waiter_id: int,
     service: WaiterService = Depends(get_waiter_service)
 ):
-    waiter = service.get_waiter_by_id(waiter_id)
+    waiter = await service.get_waiter_by_id(waiter_id)
     if not waiter:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -27,20 +34,20 @@ def get_waiter(
     return waiter
 
 @router.post("/", response_model=WaiterResponse, status_code=status.HTTP_201_CREATED)
-def create_waiter(
+async def create_waiter(
     waiter_data: WaiterCreate,
     service: WaiterService = Depends(get_waiter_service)
 ):
     # В реальном приложении нужно проверять уникальность логина
-    return service.create_waiter(waiter_data)
+    return await service.create_waiter(waiter_data)
 
 @router.put("/{waiter_id}", response_model=WaiterResponse)
-def update_waiter(
+async def update_waiter(
     waiter_id: int,
     waiter_data: WaiterUpdate,
     service: WaiterService = Depends(get_waiter_service)
 ):
-    waiter = service.update_waiter(waiter_id, waiter_data)
+    waiter = await service.update_waiter(waiter_id, waiter_data)
     if not waiter:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -49,23 +56,23 @@ def update_waiter(
     return waiter
 
 @router.delete("/{waiter_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_waiter(
+async def delete_waiter(
     waiter_id: int,
     service: WaiterService = Depends(get_waiter_service)
 ):
-    if not service.delete_waiter(waiter_id):
+    if not await service.delete_waiter(waiter_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Waiter not found"
         )
 
 @router.post("/login")
-def login_waiter(
+async def login_waiter(
     login: str,
     password: str,
     service: WaiterService = Depends(get_waiter_service)
 ):
-    waiter = service.authenticate(login, password)
+    waiter = await service.authenticate(login, password)
     if not waiter:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -1,28 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from app.schemes.waiter_statistics import (
     WaiterStatisticsCreate, 
     WaiterStatisticsUpdate, 
     WaiterStatisticsResponse
 )
 from app.services.waiter_statistics import WaiterStatisticsService
-from app.api.dependencies import get_waiter_statistics_service
+from app.api.dependencies import get_waiter_statistics_service, get_after_cursor, UnitOfWorkRoute
+from app.utils.pagination import set_next_cursor
+from app.utils.responses import FastJSONResponse
 
-router = APIRouter(prefix="/waiter-statistics", tags=["waiter-statistics"])
+router = APIRouter(prefix="/waiter-statistics", tags=["waiter-statistics"], default_response_class=FastJSONResponse, route_class=UnitOfWorkRoute)
 
 @router.get("/", response_model=list[WaiterStatisticsResponse])
-def get_all_statistics(
+async def get_all_statistics(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    after: Optional[int] = Depends(get_after_cursor),
     service: WaiterStatisticsService = Depends(get_waiter_statistics_service)
 ):
-    return service.get_all_statistics(skip, limit)
+    items = await service.get_all_statistics(skip, limit, after)
+    set_next_cursor(response, items, limit)
+    return items
 
 @router.get("/{stat_id}", response_model=WaiterStatisticsResponse)
-def get_statistic(
+async def get_statistic(
     stat_id: int,
     service: WaiterStatisticsService = Depends(get_waiter_statistics_service)
 ):
-    stat = service.get_statistic_by_id(stat_id)
+    stat = await service.get_statistic_by_id(stat_id)
     if not stat:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -31,11 +38,11 @@ def get_statistic(
     return stat
 
 @router.get("/waiter/{waiter_id}", response_model=WaiterStatisticsResponse)
-def get_statistic_by_waiter(
+async def get_statistic_by_waiter(
     waiter_id: int,
     service: WaiterStatisticsService = Depends(get_waiter_statistics_service)
 ):
-    stat = service.get_statistic_by_waiter(waiter_id)
+    stat = await service.get_statistic_by_waiter(waiter_id)
     if not stat:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -44,26 +51,26 @@ def get_statistic_by_waiter(
     return stat
 
 @router.post("/", response_model=WaiterStatisticsResponse, status_code=status.HTTP_201_CREATED)
-def create_statistic(
+async def create_statistic(
     stat_data: WaiterStatisticsCreate,
     service: WaiterStatisticsService = Depends(get_waiter_statistics_service)
 ):
     # Проверяем, существует ли уже статистика для этого официанта
-    existing = service.get_statistic_by_waiter(stat_data.waiter_id)
+    existing = await service.get_statistic_by_waiter(stat_data.waiter_id)
     if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Statistics for waiter {stat_data.waiter_id} already exists"
         )
-    return service.create_statistic(stat_data)
+    return await service.create_statistic(stat_data)
 
 @router.put("/{stat_id}", response_model=WaiterStatisticsResponse)
-def update_statistic(
+async def update_statistic(
     stat_id: int,
     stat_data: WaiterStatisticsUpdate,
     service: WaiterStatisticsService = Depends(get_waiter_statistics_service)
 ):
-    stat = service.update_statistic(stat_id, stat_data)
+    stat = await service.update_statistic(stat_id, stat_data)
     if not stat:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -72,13 +79,13 @@ def update_statistic(
     return stat
 
 @router.patch("/waiter/{waiter_id}/add-order", response_model=WaiterStatisticsResponse)
-def add_order_to_statistic(
+async def add_order_to_statistic(
     waiter_id: int,
     revenue: float = 0.0,
     tips: float = 0.0,
     service: WaiterStatisticsService = Depends(get_waiter_statistics_service)
 ):
-    stat = service.add_order_to_statistic(waiter_id, revenue, tips)
+    stat = await service.add_order_to_statistic(waiter_id, revenue, tips)
     if not stat:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -87,11 +94,11 @@ def add_order_to_statistic(
     return stat
 
 @router.delete("/{stat_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_statistic(
+async def delete_statistic(
     stat_id: int,
     service: WaiterStatisticsService = Depends(get_waiter_statistics_service)
 ):
-    if not service.delete_statistic(stat_id):
+    if not await service.delete_statistic(stat_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Statistics not found"
@@ -9,13 +9,53 @@ class Settings:
     DB_NAME: str = os.getenv("DB_NAME", "restaurant_db")
     DB_USER: str = os.getenv("DB_USER", "postgres")
     DB_PASS: str = os.getenv("DB_PASS", "postgres")
-    
+
+    # SQLite (main.py)
+    SQLITE_PATH: str = os.getenv("SQLITE_PATH", "restaurant.db")
+    # Пулы пишущих и read-only подключений (GET) — у main.py и у движков app/api
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_READ_POOL_SIZE: int = int(os.getenv("DB_READ_POOL_SIZE", "5"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "5"))
+
+    # Профиль производительности SQLite (PRAGMA)
+    SQLITE_JOURNAL_MODE: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT: int = int(os.getenv("SQLITE_BUSY_TIMEOUT", "5000"))  # мс
+    SQLITE_CACHE_SIZE: int = int(os.getenv("SQLITE_CACHE_SIZE", "-20000"))  # <0: размер в КиБ
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", str(128 * 1024 * 1024)))
+    SQLITE_TEMP_STORE: str = os.getenv("SQLITE_TEMP_STORE", "MEMORY")
+
+    # Логирование SQL (вместо echo=True): доля логируемых запросов и журнал медленных
+    SQL_LOG_SAMPLE_RATE: float = float(os.getenv("SQL_LOG_SAMPLE_RATE", "0"))
+    SQL_SLOW_QUERY_MS: float = float(os.getenv("SQL_SLOW_QUERY_MS", "200"))
+    SQL_SLOW_QUERY_LOG_SIZE: int = int(os.getenv("SQL_SLOW_QUERY_LOG_SIZE", "200"))
+    SQL_SLOW_QUERY_FILE: str = os.getenv("SQL_SLOW_QUERY_FILE", "")
+
+    # Сверка счётчиков дашборда с исходными таблицами, сек (0 — отключить)
+    STAT_COUNTERS_CHECK_INTERVAL: int = int(os.getenv("STAT_COUNTERS_CHECK_INTERVAL", "3600"))
+
+    # Сводки заказов по часам/дням: период фонового агрегатора, сек (0 — отключить),
+    # и сколько часов пересчитывать одной транзакцией
+    ROLLUP_INTERVAL: int = int(os.getenv("ROLLUP_INTERVAL", "60"))
+    ROLLUP_BATCH_HOURS: int = int(os.getenv("ROLLUP_BATCH_HOURS", "168"))
+
+    # Кэш справочников app/api (категории, роли, блюда, пользователи, повара):
+    # время жизни записи, сек (0 — выключить), и число записей в каждом кэше
+    REFERENCE_CACHE_TTL: float = float(os.getenv("REFERENCE_CACHE_TTL", "300"))
+    REFERENCE_CACHE_SIZE: int = int(os.getenv("REFERENCE_CACHE_SIZE", "1000"))
+
+    # Write-behind статистики официантов и поваров: приращения копятся в памяти
+    # и пишутся одной транзакцией раз в N мс или после N событий
+    STATISTICS_FLUSH_INTERVAL_MS: int = int(os.getenv("STATISTICS_FLUSH_INTERVAL_MS", "500"))
+    STATISTICS_FLUSH_EVENTS: int = int(os.getenv("STATISTICS_FLUSH_EVENTS", "200"))
+
     # JWT
     SECRET_KEY: str = os.getenv("SECRET_KEY", "dev-secret-key-change-this-in-production")
     ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
     
     # Приложение
+    APP_ENV: str = os.getenv("APP_ENV", "production")  # dev: тестовые данные в пустой БД
     DEBUG: bool = os.getenv("DEBUG", "True").lower() == "true"
     ALLOWED_HOSTS: List[str] = os.getenv("ALLOWED_HOSTS", "localhost,127.0.0.1").split(",")
     
@@ -0,0 +1,317 @@
+# app/database/bootstrap.py
+import json
+import logging
+import sqlite3
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from app.database.counters import COUNTERS_SCHEMA, rebuild_counters
+from app.database.rollups import ROLLUPS_SCHEMA
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_BATCH_SIZE = 500
+
+
+def legacy_dish_names(raw: Optional[str]) -> Optional[List[str]]:
+    """Названия блюд из устаревшего orders.dishes; None — это не JSON-список строк.
+
+    До order_items POST /api/orders/ сохранял JSON клиента как есть, поэтому
+    в колонке встречаются и объекты, и скаляры.
+    """
+    try:
+        names = json.loads(raw) if raw else []
+    except ValueError:
+        return None
+    if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+        return None
+    return names
+
+
+def migrate_order_dishes_json(conn: sqlite3.Connection) -> None:
+    """Переносит orders.dishes (JSON со списком названий) в order_items.
+
+    Заказы читаются пачками по id, поэтому память не растёт с размером
+    истории. Названия, которых нет в меню, остаются в orders.dishes (их
+    отдаёт GET /api/orders/) и попадают в лог. Значения, которые не
+    являются списком названий, не трогаются и тоже попадают в лог — для
+    ручного разбора.
+    """
+    menu = {}
+    for dish_id, name, price, available in conn.execute(
+        'SELECT id, name, price, available FROM dishes ORDER BY available, id DESC'
+    ):
+        # При совпадении названий предпочитаем доступное блюдо с меньшим id
+        menu[name] = (dish_id, price)
+
+    last_id = 0
+    migrated = 0
+    unmatched = Counter()
+    while True:
+        batch = conn.execute(
+            "SELECT id, dishes FROM orders WHERE id > ? AND dishes IS NOT NULL AND dishes != '[]' "
+            "ORDER BY id LIMIT ?",
+            (last_id, MIGRATION_BATCH_SIZE)
+        ).fetchall()
+        if not batch:
+            break
+
+        items = []
+        leftovers = []
+        for order_id, raw in batch:
+            last_id = order_id
+            names = legacy_dish_names(raw)
+            if names is None:
+                logger.warning(f"⚠️  Order {order_id}: dishes is not a JSON list of dish names, skipped")
+                continue
+
+            missing = []
+            for name, quantity in Counter(names).items():
+                if name in menu:
+                    menu_id, price = menu[name]
+                    items.append((order_id, menu_id, quantity, price, price * quantity))
+                else:
+                    missing.append(name)
+                    unmatched[name] += 1
+            leftovers.append((json.dumps(missing, ensure_ascii=False), order_id))
+            migrated += 1
+
+        conn.executemany(
+            'INSERT INTO order_items (order_id, menu_id, quantity, price, subtotal) VALUES (?, ?, ?, ?, ?)',
+            items
+        )
+        conn.executemany('UPDATE orders SET dishes = ? WHERE id = ?', leftovers)
+
+    logger.info(f"📦 Order lines migrated from JSON for {migrated} orders")
+    if unmatched:
+        logger.warning(f"⚠️  Dishes not found in menu, left in orders.dishes: {dict(unmatched)}")
+
+
+# Версия схемы хранится в PRAGMA user_version. Каждая новая версия — это
+# список шагов в SCHEMA_MIGRATIONS (SQL или функция от подключения); уже
+# применённые версии повторно не выполняются.
+SCHEMA_MIGRATIONS: Dict[int, List[Union[str, Callable[[sqlite3.Connection], None]]]] = {
+    1: [
+        # Таблица пользователей (Users/Employees)
+        '''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            password TEXT NOT NULL,
+            name TEXT NOT NULL,
+            role TEXT NOT NULL CHECK(role IN ('waiter', 'chef', 'admin')),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        # Таблица блюд
+        '''
+        CREATE TABLE IF NOT EXISTS dishes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            price REAL NOT NULL,
+            category TEXT NOT NULL,
+            cooking_time INTEGER DEFAULT 15,
+            description TEXT,
+            available INTEGER DEFAULT 1,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        # Таблица столов
+        '''
+        CREATE TABLE IF NOT EXISTS tables (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_number INTEGER UNIQUE NOT NULL,
+            capacity INTEGER NOT NULL,
+            location TEXT NOT NULL,
+            status TEXT NOT NULL CHECK(status IN ('free', 'occupied', 'reserved')) DEFAULT 'free',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        # Таблица заказов
+        '''
+        CREATE TABLE IF NOT EXISTS orders (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_id INTEGER NOT NULL,
+            waiter_id INTEGER NOT NULL,
+            status TEXT NOT NULL CHECK(status IN ('pending', 'cooking', 'ready', 'completed')) DEFAULT 'pending',
+            total_amount REAL DEFAULT 0,
+            dishes TEXT DEFAULT '[]',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY(table_id) REFERENCES tables(id),
+            FOREIGN KEY(waiter_id) REFERENCES users(id)
+        )
+        ''',
+    ],
+    2: [
+        # Позиции заказов (та же таблица, что у OrderItemsModel)
+        '''
+        CREATE TABLE IF NOT EXISTS order_items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            order_id INTEGER NOT NULL,
+            menu_id INTEGER NOT NULL,
+            quantity INTEGER NOT NULL DEFAULT 1,
+            price REAL NOT NULL,
+            subtotal REAL NOT NULL DEFAULT 0,
+            FOREIGN KEY(order_id) REFERENCES orders(id) ON DELETE CASCADE,
+            FOREIGN KEY(menu_id) REFERENCES dishes(id)
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_order_items_order_id ON order_items(order_id)',
+        migrate_order_dishes_json,
+    ],
+    3: [
+        # Индексы под фильтры горячих запросов (см. tests/test_query_plans.py)
+        'CREATE INDEX IF NOT EXISTS idx_orders_waiter_status ON orders(waiter_id, status)',
+        'CREATE INDEX IF NOT EXISTS idx_orders_table_status ON orders(table_id, status)',
+        'CREATE INDEX IF NOT EXISTS idx_orders_status ON orders(status, created_at)',
+        'CREATE INDEX IF NOT EXISTS idx_tables_status ON tables(status)',
+        'CREATE INDEX IF NOT EXISTS idx_order_items_menu_id ON order_items(menu_id)',
+        'CREATE INDEX IF NOT EXISTS idx_dishes_name ON dishes(name)',
+        # Частичный индекс: меню читает только доступные блюда
+        'CREATE INDEX IF NOT EXISTS idx_dishes_available ON dishes(id) WHERE available = 1',
+    ],
+    4: [
+        # Счётчики дашборда на триггерах (см. app/database/counters.py)
+        *COUNTERS_SCHEMA,
+        rebuild_counters,
+    ],
+    5: [
+        # Почасовые и дневные сводки заказов (см. app/database/rollups.py);
+        # заполняет их фоновый агрегатор, а не миграция
+        *ROLLUPS_SCHEMA,
+    ],
+}
+
+SCHEMA_VERSION = max(SCHEMA_MIGRATIONS)
+
+# Тестовые данные для режима разработки (APP_ENV=dev)
+TEST_USERS = [
+    ('ofikNum1', '123321', 'Официант 1', 'waiter'),
+    ('adminNum1', '123321', 'Администратор', 'admin'),
+    ('povarNum1', '123321', 'Повар 1', 'chef'),
+]
+
+TEST_DISHES = [
+    ('Борщ', 350, 'Основное', 20, 'Классический украинский борщ', 1),
+    ('Стейк', 1200, 'Основное', 25, 'Мраморная говядина на гриле', 1),
+    ('Салат', 450, 'Основное', 15, 'Свежий овощной салат', 1),
+    ('Кофе', 150, 'Напитки', 5, 'Крепкий эспрессо', 1),
+    ('Чизкейк', 300, 'Десерт', 10, 'Нью-йоркский чизкейк', 1),
+    ('Пицца', 650, 'Основное', 30, 'Пицца Маргарита', 1),
+    ('Чай', 100, 'Напитки', 5, 'Черный чай', 1),
+    ('Тирамису', 350, 'Десерт', 10, 'Итальянский десерт', 1),
+]
+
+TEST_TABLES = [
+    (1, 4, 'У окна', 'free'),
+    (2, 6, 'Центр', 'occupied'),
+    (3, 2, 'Бар', 'free'),
+    (4, 8, 'VIP', 'reserved'),
+    (5, 4, 'Терраса', 'free'),
+    (6, 4, 'У окна', 'occupied'),
+    (7, 2, 'Бар', 'free'),
+    (8, 6, 'Центр', 'free'),
+]
+
+TEST_ORDERS = [
+    (1, 2, 1, 'pending', 1200),
+    (2, 4, 1, 'cooking', 800),
+    (3, 1, 1, 'ready', 450),
+]
+
+TEST_ORDER_ITEMS = [
+    (1, 'Борщ'),
+    (1, 'Чай'),
+    (2, 'Стейк'),
+    (3, 'Салат'),
+]
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate_schema(conn: sqlite3.Connection) -> List[int]:
+    """Применяет недостающие версии схемы в одной транзакции"""
+    current = get_schema_version(conn)
+    if current >= SCHEMA_VERSION:
+        return []
+
+    applied = []
+    conn.execute("BEGIN")
+    try:
+        for version in range(current + 1, SCHEMA_VERSION + 1):
+            for step in SCHEMA_MIGRATIONS[version]:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(step)
+            applied.append(version)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return applied
+
+
+def seed_test_data(conn: sqlite3.Connection) -> bool:
+    """Заполняет пустую БД тестовыми данными одной транзакцией"""
+    if conn.execute("SELECT 1 FROM users LIMIT 1").fetchone():
+        return False
+
+    with conn:
+        conn.executemany(
+            'INSERT OR IGNORE INTO users (username, password, name, role) VALUES (?, ?, ?, ?)',
+            TEST_USERS
+        )
+        conn.executemany(
+            'INSERT INTO dishes (name, price, category, cooking_time, description, available) VALUES (?, ?, ?, ?, ?, ?)',
+            TEST_DISHES
+        )
+        conn.executemany(
+            'INSERT OR IGNORE INTO tables (table_number, capacity, location, status) VALUES (?, ?, ?, ?)',
+            TEST_TABLES
+        )
+        conn.executemany(
+            'INSERT OR IGNORE INTO orders (id, table_id, waiter_id, status, total_amount) VALUES (?, ?, ?, ?, ?)',
+            TEST_ORDERS
+        )
+        conn.executemany(
+            'INSERT INTO order_items (order_id, menu_id, quantity, price, subtotal) '
+            'SELECT ?, id, 1, price, price FROM dishes WHERE name = ? ORDER BY id LIMIT 1',
+            TEST_ORDER_ITEMS
+        )
+    return True
+
+
+def bootstrap_database(conn: sqlite3.Connection, seed: bool = False) -> Dict[str, Any]:
+    """Идемпотентная подготовка БД при старте: миграции схемы и (в dev) тестовые данные.
+
+    Существующие данные не удаляются. Если схема уже актуальна, выполняется
+    только чтение PRAGMA user_version.
+    """
+    started = time.perf_counter()
+    previous_version = get_schema_version(conn)
+    applied = migrate_schema(conn)
+    seeded = seed_test_data(conn) if seed else False
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    report = {
+        "schema_version": SCHEMA_VERSION,
+        "previous_version": previous_version,
+        "applied_versions": applied,
+        "seeded": seeded,
+        "boot": "cold" if applied else "warm",
+        "elapsed_ms": round(elapsed_ms, 2),
+    }
+    logger.info(
+        f"🗄️  Database bootstrap ({report['boot']}): schema v{previous_version} → v{SCHEMA_VERSION}, "
+        f"seeded={seeded}, {elapsed_ms:.1f} ms"
+    )
+    return report
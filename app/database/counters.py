@@ -0,0 +1,170 @@
+# app/database/counters.py
+import logging
+import sqlite3
+import time
+from typing import Any, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Счётчики дашборда хранятся в stat_counters и поддерживаются триггерами.
+# owner_id — id официанта для его заказов, 0 — общие счётчики ресторана.
+GLOBAL_OWNER = 0
+ACTIVE_ORDER_STATUSES = ('pending', 'cooking')
+_ACTIVE_IN = ", ".join(f"'{status}'" for status in ACTIVE_ORDER_STATUSES)
+
+_ACTIVE = "CASE WHEN {row}.status IN (%s) THEN {sign}1 ELSE 0 END" % _ACTIVE_IN
+_OCCUPIED = "CASE WHEN {row}.status = 'occupied' THEN {sign}1 ELSE 0 END"
+
+
+def _bump(owner: str, name: str, delta: str) -> str:
+    return (
+        f"INSERT INTO stat_counters (owner_id, name, value) VALUES ({owner}, '{name}', {delta}) "
+        f"ON CONFLICT(owner_id, name) DO UPDATE SET value = value + excluded.value;"
+    )
+
+
+COUNTERS_SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS stat_counters (
+        owner_id INTEGER NOT NULL,
+        name TEXT NOT NULL,
+        value INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (owner_id, name)
+    ) WITHOUT ROWID
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_orders_counters_insert AFTER INSERT ON orders BEGIN
+        {_bump("new.waiter_id", "orders_total", "1")}
+        {_bump("new.waiter_id", "orders_active", _ACTIVE.format(row="new", sign=""))}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_orders_counters_delete AFTER DELETE ON orders BEGIN
+        {_bump("old.waiter_id", "orders_total", "-1")}
+        {_bump("old.waiter_id", "orders_active", _ACTIVE.format(row="old", sign="-"))}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_orders_counters_update AFTER UPDATE OF waiter_id, status ON orders BEGIN
+        {_bump("old.waiter_id", "orders_total", "-1")}
+        {_bump("old.waiter_id", "orders_active", _ACTIVE.format(row="old", sign="-"))}
+        {_bump("new.waiter_id", "orders_total", "1")}
+        {_bump("new.waiter_id", "orders_active", _ACTIVE.format(row="new", sign=""))}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_tables_counters_insert AFTER INSERT ON tables BEGIN
+        {_bump(GLOBAL_OWNER, "tables_occupied", _OCCUPIED.format(row="new", sign=""))}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_tables_counters_delete AFTER DELETE ON tables BEGIN
+        {_bump(GLOBAL_OWNER, "tables_occupied", _OCCUPIED.format(row="old", sign="-"))}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_tables_counters_update AFTER UPDATE OF status ON tables BEGIN
+        {_bump(GLOBAL_OWNER, "tables_occupied", _OCCUPIED.format(row="old", sign="-"))}
+        {_bump(GLOBAL_OWNER, "tables_occupied", _OCCUPIED.format(row="new", sign=""))}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_users_counters_insert AFTER INSERT ON users BEGIN
+        {_bump(GLOBAL_OWNER, "employees", "1")}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_users_counters_delete AFTER DELETE ON users BEGIN
+        {_bump(GLOBAL_OWNER, "employees", "-1")}
+    END
+    ''',
+]
+
+# Эталонные значения счётчиков, посчитанные по исходным таблицам
+_SOURCE_QUERIES = [
+    "SELECT waiter_id, 'orders_total', COUNT(*) FROM orders GROUP BY waiter_id",
+    f"SELECT waiter_id, 'orders_active', COUNT(*) FROM orders "
+    f"WHERE status IN ({_ACTIVE_IN}) GROUP BY waiter_id",
+    f"SELECT {GLOBAL_OWNER}, 'tables_occupied', COUNT(*) FROM tables WHERE status = 'occupied'",
+    f"SELECT {GLOBAL_OWNER}, 'employees', COUNT(*) FROM users",
+]
+
+
+def _source_counters(conn: sqlite3.Connection) -> Dict[Tuple[int, str], int]:
+    counters = {}
+    for sql in _SOURCE_QUERIES:
+        for owner_id, name, value in conn.execute(sql):
+            counters[(owner_id, name)] = value
+    return counters
+
+
+def rebuild_counters(conn: sqlite3.Connection) -> int:
+    """Пересчитывает stat_counters по исходным таблицам.
+
+    Транзакцией не управляет: вызывается из миграции схемы или из
+    check_counters, которые сами открывают и фиксируют транзакцию.
+    """
+    counters = _source_counters(conn)
+    conn.execute('DELETE FROM stat_counters')
+    conn.executemany(
+        'INSERT INTO stat_counters (owner_id, name, value) VALUES (?, ?, ?)',
+        [(owner_id, name, value) for (owner_id, name), value in counters.items()]
+    )
+    return len(counters)
+
+
+def check_counters(conn: sqlite3.Connection, repair: bool = False) -> Dict[str, Any]:
+    """Сверяет stat_counters с исходными таблицами и при repair=True пересобирает их.
+
+    Сверка идёт в одной транзакции, поэтому сравниваются согласованные
+    снимки счётчиков и исходных таблиц.
+    """
+    started = time.perf_counter()
+    conn.execute('BEGIN IMMEDIATE' if repair else 'BEGIN')
+    try:
+        expected = _source_counters(conn)
+        stored = {
+            (owner_id, name): value
+            for owner_id, name, value in conn.execute('SELECT owner_id, name, value FROM stat_counters')
+        }
+        drift = [
+            {
+                "owner_id": owner_id,
+                "name": name,
+                "stored": stored.get((owner_id, name), 0),
+                "expected": expected.get((owner_id, name), 0),
+            }
+            for owner_id, name in sorted(expected.keys() | stored.keys())
+            if stored.get((owner_id, name), 0) != expected.get((owner_id, name), 0)
+        ]
+        repaired = bool(drift) and repair
+        if repaired:
+            rebuild_counters(conn)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    if drift:
+        logger.warning(f"⚠️  Stat counters drift: {len(drift)} value(s), repaired={repaired}")
+    return {
+        "checked": len(expected),
+        "drift": drift,
+        "repaired": repaired,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+def read_user_counters(conn: sqlite3.Connection, user_id: int) -> Dict[str, int]:
+    """Счётчики официанта и общие счётчики одним чтением по первичному ключу"""
+    rows = conn.execute(
+        'SELECT owner_id, name, value FROM stat_counters WHERE owner_id IN (?, ?)',
+        (GLOBAL_OWNER, user_id)
+    ).fetchall()
+    values = {(owner_id, name): value for owner_id, name, value in rows}
+    return {
+        "total_orders": values.get((user_id, 'orders_total'), 0),
+        "active_orders": values.get((user_id, 'orders_active'), 0),
+        "occupied_tables": values.get((GLOBAL_OWNER, 'tables_occupied'), 0),
+        "total_employees": values.get((GLOBAL_OWNER, 'employees'), 0),
+    }
@@ -3,25 +3,32 @@ from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 
-# SQLite база данных
-SQLALCHEMY_DATABASE_URL = "sqlite:///./restaurant.db"
+from app.config import settings
+from app.database.pragmas import apply_sqlite_pragmas
+from app.database.sql_logging import install_sql_logging
+
+# SQLite база данных (тот же файл, что и у main.py)
+SQLALCHEMY_DATABASE_URL = f"sqlite:///{settings.SQLITE_PATH}"
 
 # Создаем движок SQLAlchemy
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     connect_args={"check_same_thread": False},
-    echo=True  # Показывает SQL запросы в консоли
 )
 
+# Выборочный лог SQL и журнал медленных запросов (SQL_LOG_SAMPLE_RATE, SQL_SLOW_QUERY_MS)
+install_sql_logging(engine, "orm")
+
 # Создаем фабрику сессий
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Базовый класс для моделей
 Base = declarative_base()
 
-# Включаем поддержку внешних ключей для SQLite
+# Включаем поддержку внешних ключей и профиль производительности для SQLite
 @event.listens_for(engine, "connect")
 def set_sqlite_pragma(dbapi_connection, connection_record):
+    apply_sqlite_pragmas(dbapi_connection)
     cursor = dbapi_connection.cursor()
     cursor.execute("PRAGMA foreign_keys=ON")
     cursor.close()
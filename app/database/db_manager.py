@@ -1,23 +1,63 @@
-from app.database.database import async_session_maker
-from app.repositories.roles_repository import RolesRepository
-from app.repositories.users import UsersRepository
+# app/database/db_manager.py
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.repositories.admin import AdminRepository
+from app.repositories.categories import CategoryRepository
+from app.repositories.cook import CookRepository
+from app.repositories.cook_statistics import CookStatisticsRepository
+from app.repositories.dishes import DishRepository
+from app.repositories.migration import MigrationRepository
+from app.repositories.order_items import OrderItemRepository
+from app.repositories.orders import OrderRepository
+from app.repositories.prep_time import PrepTimeRepository
+from app.repositories.roles import RoleRepository
+from app.repositories.tables import TableRepository
+from app.repositories.users import UserRepository
+from app.repositories.waiter import WaiterRepository
+from app.repositories.waiter_statistics import WaiterStatisticsRepository
 
 
 class DBManager:
-    def __init__(self, session_factory: async_session_maker):
+    """Unit of work: одна сессия и все репозитории поверх неё.
+
+    Репозитории только делают flush, фиксирует изменения ``commit()``.
+    Всё, что не зафиксировано к выходу из ``async with``, откатывается.
+
+        async with DBManager(AsyncSessionLocal) as db:
+            order = await db.orders.update(order_id, data)
+            await db.waiter_statistics.increment_orders(order.waiters_id)
+            await db.commit()
+    """
+
+    def __init__(self, session_factory: async_sessionmaker):
         self.session_factory = session_factory
 
     async def __aenter__(self):
-        self.session = self.session_factory()
-        # TODO Добавить сюда созданные репозитории
-        # Пример:
-        self.users = UsersRepository(self.session)
-        self.roles = RolesRepository(self.session)
+        self.session: AsyncSession = self.session_factory()
+
+        self.admins = AdminRepository(self.session)
+        self.categories = CategoryRepository(self.session)
+        self.cooks = CookRepository(self.session)
+        self.cook_statistics = CookStatisticsRepository(self.session)
+        self.dishes = DishRepository(self.session)
+        self.migrations = MigrationRepository(self.session)
+        self.order_items = OrderItemRepository(self.session)
+        self.orders = OrderRepository(self.session)
+        self.prep_time = PrepTimeRepository(self.session)
+        self.roles = RoleRepository(self.session)
+        self.tables = TableRepository(self.session)
+        self.users = UserRepository(self.session)
+        self.waiters = WaiterRepository(self.session)
+        self.waiter_statistics = WaiterStatisticsRepository(self.session)
         return self
 
     async def __aexit__(self, *args):
+        # После commit() откатывать нечего, rollback ничего не стоит
         await self.session.rollback()
         await self.session.close()
 
     async def commit(self):
         await self.session.commit()
+
+    async def rollback(self):
+        await self.session.rollback()
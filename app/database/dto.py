@@ -0,0 +1,37 @@
+# app/database/dto.py
+from dataclasses import make_dataclass
+from functools import lru_cache
+from typing import Any, List, Type
+
+from pydantic import BaseModel
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+@lru_cache(maxsize=None)
+def response_row_type(schema: Type[BaseModel]) -> type:
+    """Лёгкий тип строки с полями ``schema`` в том же порядке (dataclass со __slots__).
+
+    Экземпляр — один объект без __dict__, identity map и проверки типов;
+    orjson сериализует такие dataclass'ы сам, без вызова pydantic на строку.
+    """
+    return make_dataclass(f"{schema.__name__}Row", [(name, Any) for name in schema.model_fields], slots=True)
+
+
+def select_response(model, schema: Type[BaseModel]) -> Select:
+    """SELECT только колонок, которые есть в схеме ответа, в порядке её полей"""
+    columns = model.__table__.columns
+    return select(*(columns[name] for name in schema.model_fields))
+
+
+async def fetch_response_rows(session: AsyncSession, schema: Type[BaseModel], statement: Select) -> List[Any]:
+    """Строки ``statement`` (из ``select_response``) как объекты ``response_row_type``.
+
+    Путь только для чтения доверенных строк своей БД: ORM-объекты не
+    создаются, pydantic-валидация пропускается. Обработчик отдаёт результат
+    готовым ответом (``page_response``), чтобы FastAPI не валидировал его
+    повторно по response_model.
+    """
+    row_type = response_row_type(schema)
+    result = await session.execute(statement)
+    return [row_type(*row) for row in result.tuples()]
@@ -0,0 +1,18 @@
+# app/database/keyset.py
+from typing import Optional
+
+from sqlalchemy import Select
+
+
+def paginate(statement: Select, key, skip: int = 0, limit: int = 100, after: Optional[int] = None) -> Select:
+    """Страница списка: keyset по ``key`` (?after=) или старый OFFSET (?skip=).
+
+    ``WHERE key > :after ORDER BY key LIMIT n`` начинает с нужного места
+    индекса, и глубокие страницы стоят столько же, сколько первая. OFFSET
+    перебирает и отбрасывает все предыдущие строки. Остаётся для
+    обратной совместимости.
+    """
+    statement = statement.order_by(key).limit(limit)
+    if after is not None:
+        return statement.where(key > after)
+    return statement.offset(skip)
@@ -0,0 +1,210 @@
+# app/database/migration_runner.py
+import logging
+import re
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.database.db_manager import DBManager
+from app.database.reference_cache import REFERENCE_CACHES
+
+logger = logging.getLogger(__name__)
+
+# "running" — пакетная миграция, прерванная посередине: продолжается с места остановки
+PENDING_STATUSES = ("pending", "running")
+BATCH_PARAMETER = ":batch_size"
+
+
+def version_key(version: str):
+    """Естественный порядок версий: "2" < "10", "001_a" < "001_b" """
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", version or "")]
+
+
+def split_statements(sql: str) -> List[str]:
+    """Делит sql_content на отдельные выражения.
+
+    Границу выражения определяет sqlite3.complete_statement, поэтому ``;``
+    внутри строк и тел триггеров не режет выражение.
+    """
+    statements = []
+    buffer = ""
+    for chunk in (sql or "").split(";"):
+        buffer += chunk + ";"
+        if sqlite3.complete_statement(buffer):
+            if buffer.strip(" \t\r\n;"):
+                statements.append(buffer.strip())
+            buffer = ""
+    if buffer.strip(" \t\r\n;"):
+        raise ValueError("Unterminated SQL statement in migration")
+    return statements
+
+
+async def _begin(session: AsyncSession):
+    """Явный BEGIN IMMEDIATE на подключении сессии.
+
+    sqlite3 сам открывает транзакцию только перед DML, и DDL миграции
+    выполнялся бы в autocommit. IMMEDIATE сразу берёт блокировку записи:
+    второй runner ждёт, а не применяет ту же миграцию параллельно.
+    """
+    connection = await session.connection()
+    await connection.exec_driver_sql("BEGIN IMMEDIATE")
+    return connection
+
+
+async def _execute(connection, statements: List[str], params: Dict[str, Any]) -> int:
+    rows = 0
+    for statement in statements:
+        result = await connection.exec_driver_sql(statement, params)
+        # У DDL rowcount = -1
+        rows += max(result.rowcount, 0)
+    return rows
+
+
+class MigrationRunner:
+    """Применяет ожидающие записи MigrationHistory в порядке версий.
+
+    Каждая миграция — своя транзакция: SQL и запись результата (статус,
+    длительность, число строк) фиксируются вместе или не фиксируются вовсе.
+    На первой ошибке runner останавливается: следующие версии могут
+    зависеть от неё.
+
+    Миграция с ``batch_size`` — пакетная миграция данных: sql_content
+    выполняется с параметром ``:batch_size`` до тех пор, пока очередной
+    пакет не затронет меньше строк. Каждый пакет коммитится отдельно вместе
+    с прогрессом (batches_done, rows_affected), поэтому долгий UPDATE не
+    держит блокировку записи целиком, а после сбоя продолжается с того же
+    места. SQL пакета должен сам отбирать необработанные строки, например
+    ``UPDATE t SET x = ... WHERE id IN (SELECT id FROM t WHERE x IS NULL LIMIT :batch_size)``.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker):
+        self.session_factory = session_factory
+
+    async def pending(self) -> List[Dict[str, Any]]:
+        async with DBManager(self.session_factory) as db:
+            migrations = await db.migrations.get_by_statuses(PENDING_STATUSES)
+            snapshots = [
+                {
+                    "id": m.id,
+                    "version": m.version,
+                    "status": m.status,
+                    "sql_content": m.sql_content,
+                    "batch_size": m.batch_size,
+                    "batches_done": m.batches_done or 0,
+                    "rows_affected": m.rows_affected or 0,
+                    "duration_ms": m.duration_ms or 0.0,
+                }
+                for m in migrations
+            ]
+        return sorted(snapshots, key=lambda m: version_key(m["version"]))
+
+    async def run(self) -> Dict[str, Any]:
+        """Применяет все ожидающие миграции; возвращает applied, failed и остаток"""
+        migrations = await self.pending()
+        applied: List[Dict[str, Any]] = []
+        failed: Optional[Dict[str, Any]] = None
+
+        for migration in migrations:
+            if migration["batch_size"]:
+                result = await self._apply_batched(migration)
+            else:
+                result = await self._apply(migration)
+            if result is None:
+                # Уже применена другим runner'ом
+                continue
+            if result["status"] != "success":
+                failed = result
+                break
+            applied.append(result)
+
+        if applied:
+            # Миграции данных могли поменять справочники в обход репозиториев
+            for cache in REFERENCE_CACHES:
+                cache.clear()
+        return {"applied": applied, "failed": failed, "pending": len(migrations) - len(applied)}
+
+    async def _claim(self, db: DBManager, migration_id: int) -> bool:
+        current = await db.migrations.get_by_id(migration_id)
+        return current is not None and current.status in PENDING_STATUSES
+
+    async def _apply(self, migration: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        started = time.perf_counter()
+        try:
+            statements = split_statements(migration["sql_content"])
+            async with DBManager(self.session_factory) as db:
+                connection = await _begin(db.session)
+                if not await self._claim(db, migration["id"]):
+                    return None
+                rows = await _execute(connection, statements, {})
+                result = await db.migrations.record_run(
+                    migration["id"],
+                    status="success",
+                    duration_ms=round((time.perf_counter() - started) * 1000, 2),
+                    rows_affected=rows,
+                    error=None,
+                )
+                await db.commit()
+        except Exception as e:
+            return await self._fail(migration, started, e)
+
+        logger.info(f"✅ Migration {migration['version']} applied: {rows} rows in {result['duration_ms']} ms")
+        return result
+
+    async def _apply_batched(self, migration: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        started = time.perf_counter()
+        batch_size = migration["batch_size"]
+        # Прерванная или возвращённая в pending после ошибки миграция продолжает счёт
+        resumed = migration["batches_done"] > 0
+        batches = migration["batches_done"] if resumed else 0
+        rows = migration["rows_affected"] if resumed else 0
+        previous_ms = migration["duration_ms"] if resumed else 0.0
+
+        try:
+            if BATCH_PARAMETER not in (migration["sql_content"] or ""):
+                raise ValueError(f"Batched migration must use {BATCH_PARAMETER}")
+            statements = split_statements(migration["sql_content"])
+
+            while True:
+                async with DBManager(self.session_factory) as db:
+                    connection = await _begin(db.session)
+                    if not await self._claim(db, migration["id"]):
+                        return None
+                    affected = await _execute(connection, statements, {"batch_size": batch_size})
+                    batches += 1
+                    rows += affected
+                    done = affected < batch_size
+                    result = await db.migrations.record_run(
+                        migration["id"],
+                        status="success" if done else "running",
+                        duration_ms=round(previous_ms + (time.perf_counter() - started) * 1000, 2),
+                        rows_affected=rows,
+                        batches_done=batches,
+                        error=None,
+                    )
+                    await db.commit()
+
+                logger.info(f"📦 Migration {migration['version']}: batch {batches}, {rows} rows")
+                if done:
+                    break
+        except Exception as e:
+            return await self._fail(migration, started, e, previous_ms)
+
+        logger.info(f"✅ Migration {migration['version']} applied: {rows} rows in {batches} batches")
+        return result
+
+    async def _fail(self, migration, started: float, error: Exception, previous_ms: float = 0.0):
+        # Транзакция миграции уже откачена; ошибка пишется отдельной транзакцией.
+        # Прогресс пакетов не трогаем: закоммиченные пакеты остаются применёнными,
+        # и после возврата в pending миграция продолжится со следующего пакета
+        logger.error(f"❌ Migration {migration['version']} failed: {error}")
+        async with DBManager(self.session_factory) as db:
+            result = await db.migrations.record_run(
+                migration["id"],
+                status="failed",
+                duration_ms=round(previous_ms + (time.perf_counter() - started) * 1000, 2),
+                error=str(error),
+            )
+            await db.commit()
+        return result
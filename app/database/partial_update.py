@@ -0,0 +1,49 @@
+# app/database/partial_update.py
+import re
+import sqlite3
+from typing import Any, Dict, Optional, Sequence
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def _check_identifiers(*names: str) -> None:
+    # Имена таблиц и колонок подставляются в SQL, значения — только параметрами
+    for name in names:
+        if not _IDENTIFIER.match(name):
+            raise ValueError(f"Недопустимый идентификатор SQL: {name!r}")
+
+
+def update_row(
+    conn: sqlite3.Connection,
+    table: str,
+    row_id: int,
+    fields: Dict[str, Any],
+    returning: Sequence[str],
+    touch: bool = False,
+) -> Optional[Dict[str, Any]]:
+    """Частичное обновление строки одним UPDATE ... RETURNING.
+
+    В SET попадают только переданные поля (значение не None) и updated_at.
+    Если обновлять нечего, строка просто читается; ``touch=True`` всё равно
+    обновляет updated_at (например, когда менялись только позиции заказа).
+    Возвращает строку с колонками ``returning`` или None, если id не найден.
+    """
+    values = {column: value for column, value in fields.items() if value is not None}
+    _check_identifiers(table, *values, *returning)
+    columns = ", ".join(returning)
+
+    if values or touch:
+        assignments = "".join(f"{column} = ?, " for column in values)
+        cursor = conn.execute(
+            f"UPDATE {table} SET {assignments}updated_at = CURRENT_TIMESTAMP "
+            f"WHERE id = ? RETURNING {columns}",
+            (*values.values(), row_id),
+        )
+    else:
+        cursor = conn.execute(f"SELECT {columns} FROM {table} WHERE id = ?", (row_id,))
+
+    row = cursor.fetchone()
+    if row is None:
+        # UPDATE не затронул ни одной строки (rowcount == 0) — id не найден
+        return None
+    return dict(zip(returning, row))
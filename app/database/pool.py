@@ -0,0 +1,197 @@
+# app/database/pool.py
+import asyncio
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, TypeVar
+
+from app.database.pragmas import apply_sqlite_pragmas, read_only_uri
+from app.exceptions.database import DatabaseUnavailableException
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SQLitePool:
+    """Ограниченный пул переиспользуемых подключений sqlite3.
+
+    Подключения создаются лениво (не больше ``size``) и возвращаются в пул
+    после использования, поэтому кэш подготовленных выражений sqlite3
+    переживает запрос. Если все подключения заняты, запрос ждёт свободное
+    не дольше ``timeout`` секунд.
+
+    Для async-обработчиков есть ``run()``: работа с БД выполняется в
+    собственном ограниченном пуле потоков, и event loop не блокируется.
+
+    ``read_only=True`` открывает файл как ``mode=ro`` с ``query_only``:
+    такой пул обслуживает GET-запросы и не конкурирует с пишущим пулом
+    за его подключения.
+    """
+
+    def __init__(
+        self,
+        database: str,
+        size: int = 5,
+        timeout: float = 5.0,
+        leak_threshold: float = 30.0,
+        read_only: bool = False,
+    ):
+        self.database = database
+        self.read_only = read_only
+        self.size = size
+        self.timeout = timeout
+        self.leak_threshold = leak_threshold
+
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._in_use = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._leaks = 0
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix=self._thread_prefix())
+
+    def _thread_prefix(self) -> str:
+        return "sqlite-ro" if self.read_only else "sqlite"
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.read_only:
+            conn = sqlite3.connect(read_only_uri(self.database), uri=True, check_same_thread=False)
+        else:
+            conn = sqlite3.connect(self.database, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        apply_sqlite_pragmas(conn, read_only=self.read_only)
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        if self._closed:
+            raise DatabaseUnavailableException()
+
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = None
+
+        if conn is None:
+            with self._lock:
+                can_create = self._created < self.size
+                if can_create:
+                    self._created += 1
+            if can_create:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            else:
+                with self._lock:
+                    self._waits += 1
+                try:
+                    conn = self._idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    with self._lock:
+                        self._timeouts += 1
+                    logger.error(f"⏱️  DB pool exhausted: no connection within {self.timeout}s")
+                    raise DatabaseUnavailableException()
+
+        with self._lock:
+            self._in_use += 1
+            self._checkouts += 1
+        return conn
+
+    def _release(self, conn: sqlite3.Connection, held_for: float) -> None:
+        leaked = conn.in_transaction
+        if leaked:
+            # Незакоммиченная транзакция не должна достаться следующему запросу
+            conn.rollback()
+        if held_for > self.leak_threshold:
+            leaked = True
+            logger.warning(f"⚠️  DB connection held for {held_for:.1f}s")
+
+        with self._lock:
+            self._in_use -= 1
+            if leaked:
+                self._leaks += 1
+
+        if self._closed:
+            conn.close()
+            with self._lock:
+                self._created -= 1
+        else:
+            self._idle.put(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Выдаёт подключение из пула и гарантированно возвращает его обратно"""
+        conn = self._acquire()
+        started = time.monotonic()
+        try:
+            yield conn
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._release(conn, time.monotonic() - started)
+
+    def _run_sync(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        with self.connection() as conn:
+            return fn(conn)
+
+    async def run(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        """Выполняет ``fn(conn)`` в пуле потоков БД, не блокируя event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._run_sync, fn)
+
+    def stats(self) -> Dict[str, float]:
+        """Статистика пула для диагностики"""
+        with self._lock:
+            return {
+                "read_only": self.read_only,
+                "size": self.size,
+                "timeout": self.timeout,
+                "created": self._created,
+                "in_use": self._in_use,
+                "idle": self._idle.qsize(),
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "timeouts": self._timeouts,
+                "leaks_detected": self._leaks,
+            }
+
+    def close(self) -> None:
+        """Закрывает все свободные подключения; занятые закроются при возврате"""
+        self._closed = True
+        self._executor.shutdown(wait=True)
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._created -= 1
+        logger.info("🔌 DB pool closed")
+
+    def reopen(self) -> None:
+        """Снова разрешает выдачу подключений после close()"""
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix=self._thread_prefix())
+
+
+def engine_pool_stats(engine) -> Dict[str, Any]:
+    """Статистика пула подключений движка SQLAlchemy (sync или async)"""
+    pool = getattr(engine, "sync_engine", engine).pool
+    stats: Dict[str, Any] = {"pool": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        if method is not None:
+            stats[name] = method()
+    return stats
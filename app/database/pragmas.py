@@ -0,0 +1,64 @@
+# app/database/pragmas.py
+from typing import Any, Dict
+from urllib.parse import quote
+
+from app.config import settings
+
+# Порядок важен: journal_mode нужно выставить до первой записи
+PRAGMA_NAMES = (
+    "journal_mode",
+    "synchronous",
+    "busy_timeout",
+    "cache_size",
+    "mmap_size",
+    "temp_store",
+)
+
+
+def sqlite_pragma_profile() -> Dict[str, Any]:
+    """Профиль PRAGMA из настроек приложения"""
+    return {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT,
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "temp_store": settings.SQLITE_TEMP_STORE,
+    }
+
+
+def read_only_uri(path: str) -> str:
+    """URI файла БД для подключения только на чтение (``uri=True`` у sqlite3)"""
+    return f"file:{quote(path)}?mode=ro"
+
+
+def apply_sqlite_pragmas(dbapi_connection, read_only: bool = False) -> None:
+    """Применяет профиль PRAGMA к DBAPI-подключению sqlite3.
+
+    На подключении ``mode=ro`` journal_mode не трогаем: режим WAL хранится
+    в файле и выставляется пишущим подключением, а смена режима из read-only
+    подключения падает. Вместо этого включается ``query_only``.
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in sqlite_pragma_profile().items():
+            if read_only and name == "journal_mode":
+                continue
+            cursor.execute(f"PRAGMA {name}={value}")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+    finally:
+        cursor.close()
+
+
+def read_sqlite_pragmas(dbapi_connection) -> Dict[str, Any]:
+    """Фактические значения PRAGMA на подключении"""
+    cursor = dbapi_connection.cursor()
+    try:
+        effective = {}
+        for name in PRAGMA_NAMES + ("foreign_keys",):
+            cursor.execute(f"PRAGMA {name}")
+            effective[name] = cursor.fetchone()[0]
+        return effective
+    finally:
+        cursor.close()
@@ -0,0 +1,142 @@
+# app/database/reference_cache.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.config import settings
+
+
+class ReferenceCache:
+    """Кэш справочных строк в памяти процесса: TTL, ограничение размера (LRU).
+
+    Хранятся снимки колонок (dict), а не ORM-объекты: снимок не привязан к
+    сессии и не меняется, когда запрос правит свой экземпляр. Отсутствующие
+    строки не кэшируются, поэтому вставка не требует сброса.
+    """
+
+    def __init__(self, name: str, ttl: float, max_size: int):
+        self.name = name
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._expired = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                del self._entries[key]
+                self._expired += 1
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, row: Dict[str, Any]) -> None:
+        if self.ttl <= 0 or self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, row)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+                "expired": self._expired,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+            }
+
+
+def _make_cache(name: str) -> ReferenceCache:
+    return ReferenceCache(name, settings.REFERENCE_CACHE_TTL, settings.REFERENCE_CACHE_SIZE)
+
+
+category_cache = _make_cache("categories")
+role_cache = _make_cache("roles")
+dish_cache = _make_cache("dishes")
+user_cache = _make_cache("users")
+cook_cache = _make_cache("cooks")
+
+REFERENCE_CACHES = (category_cache, role_cache, dish_cache, user_cache, cook_cache)
+
+
+def reference_cache_stats() -> Dict[str, Dict[str, Any]]:
+    return {cache.name: cache.stats() for cache in REFERENCE_CACHES}
+
+
+async def cached_lookup(session: AsyncSession, cache: ReferenceCache, key: Hashable, model, statement):
+    """Read-through: строка из кэша или из ``statement`` (select колонок ``model``).
+
+    Возвращает экземпляр ``model`` в сессии запроса или None. Если строка
+    с тем же ключом уже в identity map сессии, возвращается она: снимок
+    из кэша не должен затирать более новое (в том числе не сброшенное
+    flush'ем) состояние. Иначе снимок добавляется merge без SQL.
+    """
+    row = cache.get(key)
+    if row is None:
+        result = await session.execute(statement)
+        found = result.mappings().first()
+        if found is None:
+            return None
+        row = dict(found)
+        cache.set(key, row)
+
+    mapper = inspect(model)
+    identity = mapper.identity_key_from_primary_key([row[column.key] for column in mapper.primary_key])
+    existing = session.sync_session.identity_map.get(identity)
+    if existing is not None:
+        return existing
+
+    instance = model(**row)
+    make_transient_to_detached(instance)
+    return await session.merge(instance, load=False)
+
+
+def invalidate_on_commit(session: AsyncSession, cache: ReferenceCache) -> None:
+    """Сброс кэша из метода записи: сразу и ещё раз после commit.
+
+    Между записью и commit другой запрос может успеть закэшировать старую
+    версию строки. Повторный сброс после commit её убирает.
+    """
+    cache.clear()
+    session.sync_session.info.setdefault("reference_caches", set()).add(cache)
+
+
+@event.listens_for(Session, "after_commit")
+def _clear_after_commit(session):
+    for cache in session.info.pop("reference_caches", ()):
+        cache.clear()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_after_rollback(session):
+    session.info.pop("reference_caches", None)
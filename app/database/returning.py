@@ -0,0 +1,56 @@
+# app/database/returning.py
+from typing import Any, Dict, Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def update_returning(
+    session: AsyncSession,
+    model,
+    row_id: int,
+    values: Dict[str, Any],
+) -> Optional[Dict[str, Any]]:
+    """Изменение строки по id одним UPDATE ... RETURNING.
+
+    Возвращает строку как dict (его напрямую валидирует response_model),
+    ORM-объект не создаётся. Колонки с onupdate (updated_at) выставляет сам
+    UPDATE. Если менять нечего — один SELECT. None — id не найден.
+    """
+    return await update_where_returning(session, model, model.id == row_id, values)
+
+
+async def update_where_returning(
+    session: AsyncSession,
+    model,
+    criterion,
+    values: Dict[str, Any],
+) -> Optional[Dict[str, Any]]:
+    """То же, что ``update_returning``, но строка выбирается условием ``criterion``.
+
+    Значения могут быть SQL-выражениями от текущих колонок
+    (``model.total + 1``): SQLite вычисляет их под блокировкой записи,
+    поэтому параллельные приращения не теряются.
+    """
+    columns = model.__table__.columns
+    if values:
+        statement = update(model).where(criterion).values(**values).returning(*columns)
+    else:
+        statement = select(*columns).where(criterion)
+
+    result = await session.execute(statement)
+    row = result.mappings().first()
+    return dict(row) if row is not None else None
+
+
+async def delete_returning(session: AsyncSession, model, row_id: int) -> bool:
+    """Удаление по id одним DELETE ... RETURNING id; False — строки не было"""
+    result = await session.execute(delete(model).where(model.id == row_id).returning(model.id))
+    return result.scalar_one_or_none() is not None
+
+
+async def delete_returning_row(session: AsyncSession, model, row_id: int) -> Optional[Dict[str, Any]]:
+    """Удаление по id одним DELETE ... RETURNING со всеми колонками; None — строки не было"""
+    result = await session.execute(delete(model).where(model.id == row_id).returning(*model.__table__.columns))
+    row = result.mappings().first()
+    return dict(row) if row is not None else None
@@ -0,0 +1,301 @@
+# app/database/rollups.py
+import logging
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Сводки заказов по часам и дням: orders, completed_orders, revenue и quantity
+# (штук блюд) на официанта, повара, блюдо и стол. Корзина — час/день
+# orders.created_at (UTC, как CURRENT_TIMESTAMP).
+GRAINS = ('hour', 'day')
+ORDER_DIMENSIONS = {'waiter': 'waiter_id', 'cook': 'cook_id', 'table': 'table_id'}
+DIMENSIONS = (*ORDER_DIMENSIONS, 'dish')
+HOUR_FORMAT = '%Y-%m-%d %H:00:00'
+ROLLUP_BATCH_HOURS = 168
+WATERMARK = 'orders_updated_at'
+
+
+
+def add_orders_cook_id(conn: sqlite3.Connection) -> None:
+    """Повар заказа — как orders.cook_id у OrderModel.
+
+    ADD COLUMN в SQLite не знает IF NOT EXISTS: в базе, созданной по
+    метаданным ORM или после прерванного прогона, колонка уже есть.
+    """
+    columns = {row[1] for row in conn.execute('PRAGMA table_info(orders)')}
+    if 'cook_id' not in columns:
+        conn.execute('ALTER TABLE orders ADD COLUMN cook_id INTEGER REFERENCES users(id)')
+
+
+ROLLUPS_SCHEMA = [
+    add_orders_cook_id,
+    # Водяной знак идёт по updated_at, пересчёт часа — по диапазону created_at
+    'CREATE INDEX IF NOT EXISTS idx_orders_updated_at ON orders(updated_at)',
+    'CREATE INDEX IF NOT EXISTS idx_orders_created_at ON orders(created_at)',
+    '''
+    CREATE TABLE IF NOT EXISTS order_rollups (
+        dimension TEXT NOT NULL CHECK(dimension IN ('waiter', 'cook', 'dish', 'table')),
+        grain TEXT NOT NULL CHECK(grain IN ('hour', 'day')),
+        bucket TEXT NOT NULL,
+        key_id INTEGER NOT NULL,
+        orders INTEGER NOT NULL DEFAULT 0,
+        completed_orders INTEGER NOT NULL DEFAULT 0,
+        revenue REAL NOT NULL DEFAULT 0,
+        quantity INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (dimension, grain, bucket, key_id)
+    ) WITHOUT ROWID
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS rollup_state (
+        name TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    ) WITHOUT ROWID
+    ''',
+    # Часы, которые надо пересчитать: из водяного знака и из удалённых заказов
+    '''
+    CREATE TABLE IF NOT EXISTS rollup_dirty_hours (
+        bucket TEXT PRIMARY KEY
+    ) WITHOUT ROWID
+    ''',
+    # Удаление не оставляет updated_at — час удалённого заказа отмечает триггер
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_orders_rollups_delete AFTER DELETE ON orders
+    WHEN old.created_at IS NOT NULL BEGIN
+        INSERT OR IGNORE INTO rollup_dirty_hours (bucket) VALUES (strftime('{HOUR_FORMAT}', old.created_at));
+    END
+    ''',
+]
+
+# Заказы, изменённые после водяного знака (до отсечки включительно)
+CHANGED_HOURS_SQL = (
+    f"SELECT DISTINCT strftime('{HOUR_FORMAT}', created_at) FROM orders "
+    "WHERE updated_at > ? AND updated_at <= ? AND created_at IS NOT NULL"
+)
+RANGE_SQL = (
+    "SELECT bucket, key_id, orders, completed_orders, revenue, quantity FROM order_rollups "
+    "WHERE dimension = ? AND grain = ? AND bucket >= ? AND bucket < ?"
+)
+
+# Заказы часов из temp.rollup_hours; created_at сравнивается строкой по индексу
+_HOUR_ORDERS = (
+    "FROM temp.rollup_hours h "
+    "JOIN orders o ON o.created_at >= h.bucket AND o.created_at < datetime(h.bucket, '+1 hour')"
+)
+_INSERT = "INSERT INTO order_rollups (dimension, grain, bucket, key_id, orders, completed_orders, revenue, quantity) "
+
+
+def _order_dimension_sql(dimension: str, column: str) -> str:
+    return (
+        f"{_INSERT}SELECT '{dimension}', 'hour', h.bucket, o.{column}, COUNT(*), "
+        "SUM(o.status = 'completed'), SUM(COALESCE(o.total_amount, 0)), "
+        "SUM((SELECT COALESCE(SUM(quantity), 0) FROM order_items WHERE order_id = o.id)) "
+        f"{_HOUR_ORDERS} WHERE o.{column} IS NOT NULL GROUP BY h.bucket, o.{column}"
+    )
+
+
+_DISH_SQL = (
+    f"{_INSERT}SELECT 'dish', 'hour', h.bucket, oi.menu_id, COUNT(DISTINCT o.id), "
+    "COUNT(DISTINCT CASE WHEN o.status = 'completed' THEN o.id END), SUM(oi.subtotal), SUM(oi.quantity) "
+    f"{_HOUR_ORDERS} JOIN order_items oi ON oi.order_id = o.id GROUP BY h.bucket, oi.menu_id"
+)
+
+# Дни складываются из часовых строк, orders уже не читается
+_DAY_SQL = (
+    f"{_INSERT}SELECT r.dimension, 'day', d.bucket, r.key_id, SUM(r.orders), SUM(r.completed_orders), "
+    "SUM(r.revenue), SUM(r.quantity) "
+    "FROM temp.rollup_days d JOIN order_rollups r ON r.dimension = ? AND r.grain = 'hour' "
+    "AND r.bucket >= d.bucket AND r.bucket < date(d.bucket, '+1 day') "
+    "GROUP BY d.bucket, r.key_id"
+)
+
+
+def _state(conn: sqlite3.Connection, name: str, default: str = '') -> str:
+    row = conn.execute('SELECT value FROM rollup_state WHERE name = ?', (name,)).fetchone()
+    return row[0] if row else default
+
+
+def _mark_changed_hours(conn: sqlite3.Connection) -> str:
+    """Отмечает часы заказов, изменённых после водяного знака, и сдвигает его.
+
+    Отсечка — прошлая секунда: CURRENT_TIMESTAMP точен до секунды, и
+    заказ, изменённый в текущую секунду после этого прохода, получит
+    updated_at больше отсечки и попадёт в следующий проход.
+    """
+    watermark = _state(conn, WATERMARK)
+    cutoff = conn.execute("SELECT datetime('now', '-1 second')").fetchone()[0]
+    if cutoff <= watermark:
+        return watermark
+    conn.execute(
+        f"INSERT OR IGNORE INTO rollup_dirty_hours (bucket) {CHANGED_HOURS_SQL}",
+        (watermark, cutoff),
+    )
+    conn.execute(
+        'INSERT INTO rollup_state (name, value) VALUES (?, ?) '
+        'ON CONFLICT(name) DO UPDATE SET value = excluded.value',
+        (WATERMARK, cutoff),
+    )
+    return cutoff
+
+
+def _refresh_hours(conn: sqlite3.Connection, hours: List[str]) -> Set[str]:
+    """Пересчитывает часовые и дневные строки для часов ``hours``.
+
+    Час пересчитывается целиком по диапазону created_at, поэтому смена
+    статуса, суммы, официанта или позиций заказа учитываются без учёта
+    того, что было раньше. Транзакцией не управляет.
+    """
+    days = sorted({hour[:10] for hour in hours})
+    conn.execute('CREATE TEMP TABLE IF NOT EXISTS rollup_hours (bucket TEXT PRIMARY KEY)')
+    conn.execute('CREATE TEMP TABLE IF NOT EXISTS rollup_days (bucket TEXT PRIMARY KEY)')
+    conn.execute('DELETE FROM temp.rollup_hours')
+    conn.execute('DELETE FROM temp.rollup_days')
+    conn.executemany('INSERT INTO temp.rollup_hours (bucket) VALUES (?)', [(hour,) for hour in hours])
+    conn.executemany('INSERT INTO temp.rollup_days (bucket) VALUES (?)', [(day,) for day in days])
+
+    for dimension in DIMENSIONS:
+        conn.execute(
+            "DELETE FROM order_rollups WHERE dimension = ? AND grain = 'hour' "
+            "AND bucket IN (SELECT bucket FROM temp.rollup_hours)",
+            (dimension,),
+        )
+    for dimension, column in ORDER_DIMENSIONS.items():
+        conn.execute(_order_dimension_sql(dimension, column))
+    conn.execute(_DISH_SQL)
+
+    for dimension in DIMENSIONS:
+        conn.execute(
+            "DELETE FROM order_rollups WHERE dimension = ? AND grain = 'day' "
+            "AND bucket IN (SELECT bucket FROM temp.rollup_days)",
+            (dimension,),
+        )
+        conn.execute(_DAY_SQL, (dimension,))
+    return set(days)
+
+
+def aggregate_rollups(conn: sqlite3.Connection, batch_hours: int = ROLLUP_BATCH_HOURS) -> Dict[str, Any]:
+    """Инкрементально обновляет order_rollups.
+
+    Сначала по водяному знаку updated_at отмечаются часы изменённых
+    заказов, затем отмеченные часы пересчитываются пачками по
+    ``batch_hours`` — каждая пачка своей короткой транзакцией, так что
+    первый проход по длинной истории не держит блокировку записи и
+    продолжается с места остановки. Работа пропорциональна числу
+    изменённых часов, а не размеру истории.
+    """
+    started = time.perf_counter()
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        watermark = _mark_changed_hours(conn)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    hours = 0
+    batches = 0
+    days: Set[str] = set()
+    while True:
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            batch = [row[0] for row in conn.execute(
+                'SELECT bucket FROM rollup_dirty_hours ORDER BY bucket LIMIT ?', (batch_hours,)
+            )]
+            if batch:
+                days |= _refresh_hours(conn, batch)
+                conn.executemany('DELETE FROM rollup_dirty_hours WHERE bucket = ?', [(hour,) for hour in batch])
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        if not batch:
+            break
+        hours += len(batch)
+        batches += 1
+
+    report = {
+        "watermark": watermark,
+        "hours": hours,
+        "days": len(days),
+        "batches": batches,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+    if hours:
+        logger.info(f"📊 Order rollups: {hours} hour(s), {len(days)} day(s) refreshed in {report['elapsed_ms']} ms")
+    return report
+
+
+def _parse_moment(value: Optional[str], default: datetime) -> datetime:
+    if not value:
+        return default
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).replace(tzinfo=None)
+    except ValueError:
+        raise ValueError(f"Неверная дата: {value!r}, ожидается ISO 8601 (UTC)")
+
+
+def read_rollups(
+    conn: sqlite3.Connection,
+    dimension: str,
+    grain: str = 'hour',
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    key_id: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Строки сводки за [start, end) и итоги по key_id — чтение по первичному ключу.
+
+    По умолчанию — последние сутки для часов и последние 30 дней для дней.
+    ``as_of`` — водяной знак: заказы, изменённые позже, ещё не учтены.
+    """
+    if dimension not in DIMENSIONS:
+        raise ValueError(f"Неизвестное измерение: {dimension!r}, доступны {', '.join(DIMENSIONS)}")
+    if grain not in GRAINS:
+        raise ValueError(f"Неизвестная детализация: {grain!r}, доступны {', '.join(GRAINS)}")
+
+    now = datetime.utcnow()
+    end_at = _parse_moment(end, now)
+    start_at = _parse_moment(start, end_at - (timedelta(days=1) if grain == 'hour' else timedelta(days=30)))
+    if grain == 'hour':
+        # Час, в который попадает start, входит в диапазон целиком
+        low, high = start_at.strftime('%Y-%m-%d %H:00:00'), end_at.strftime('%Y-%m-%d %H:%M:%S')
+    else:
+        # День, в который попадает end (кроме полуночи), тоже входит целиком
+        if end_at.time() != datetime.min.time():
+            end_at = end_at + timedelta(days=1)
+        low, high = start_at.strftime('%Y-%m-%d'), end_at.strftime('%Y-%m-%d')
+
+    sql, params = RANGE_SQL, [dimension, grain, low, high]
+    if key_id is not None:
+        sql += " AND key_id = ?"
+        params.append(key_id)
+    rows = [
+        {
+            "bucket": bucket,
+            "key_id": key,
+            "orders": orders,
+            "completed_orders": completed,
+            "revenue": revenue,
+            "quantity": quantity,
+        }
+        for bucket, key, orders, completed, revenue, quantity in conn.execute(sql + " ORDER BY bucket, key_id", params)
+    ]
+
+    totals: Dict[int, Dict[str, Any]] = {}
+    for row in rows:
+        total = totals.setdefault(row["key_id"], {
+            "key_id": row["key_id"], "orders": 0, "completed_orders": 0, "revenue": 0.0, "quantity": 0,
+        })
+        for field in ("orders", "completed_orders", "revenue", "quantity"):
+            total[field] += row[field]
+
+    return {
+        "dimension": dimension,
+        "grain": grain,
+        "start": low,
+        "end": high,
+        "as_of": _state(conn, WATERMARK) or None,
+        "rows": rows,
+        "totals": sorted(totals.values(), key=lambda total: -total["revenue"]),
+    }
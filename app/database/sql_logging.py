@@ -0,0 +1,193 @@
+# app/database/sql_logging.py
+import json
+import logging
+import queue
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime
+from logging.handlers import QueueListener
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+
+logger = logging.getLogger("app.sql")
+
+# Параметры запросов не пишутся никуда: в них пароли и их хэши
+MAX_STATEMENT_LENGTH = 2000
+
+
+def _find_repository_caller() -> Optional[str]:
+    """Метод репозитория, из которого пришёл запрос: "OrderRepository.get_by_waiter".
+
+    Для AsyncSession запрос выполняется в дочернем greenlet, поэтому, если в
+    своём стеке репозиторий не найден, смотрим стек родительского greenlet.
+    """
+    frames = [sys._getframe(1)]
+    try:
+        import greenlet
+        parent = greenlet.getcurrent().parent
+        if parent is not None and parent.gr_frame is not None:
+            frames.append(parent.gr_frame)
+    except ImportError:
+        pass
+
+    for frame in frames:
+        while frame is not None:
+            module = frame.f_globals.get("__name__", "")
+            if module.startswith("app.repositories."):
+                owner = frame.f_locals.get("self")
+                name = frame.f_code.co_name
+                return f"{type(owner).__name__}.{name}" if owner is not None else f"{module}.{name}"
+            frame = frame.f_back
+    return None
+
+
+class SlowQueryLog:
+    """Медленные запросы: ограниченное кольцо в памяти и, опционально, файл JSON Lines.
+
+    ``record()`` вызывается из after_cursor_execute — для aiosqlite это поток
+    event loop, поэтому в файл пишет фоновый QueueListener, а сюда только
+    кладётся запись в очередь.
+    """
+
+    def __init__(self, threshold_ms: float, size: int = 200, path: str = ""):
+        self.threshold_ms = threshold_ms
+        self.path = path
+        self._ring: deque = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self._recorded = 0
+        self._queue: Optional[queue.SimpleQueue] = None
+        self._writer: Optional[QueueListener] = None
+
+    def _file_queue(self) -> queue.SimpleQueue:
+        # Поток записи стартует при первом медленном запросе
+        if self._writer is None:
+            handler = logging.FileHandler(self.path, encoding="utf-8", delay=True)
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self._queue = queue.SimpleQueue()
+            self._writer = QueueListener(self._queue, handler)
+            self._writer.start()
+        return self._queue
+
+    def record(self, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._ring.append(entry)
+            self._recorded += 1
+            file_queue = self._file_queue() if self.path else None
+        if file_queue is not None:
+            file_queue.put_nowait(logging.makeLogRecord({"msg": json.dumps(entry, ensure_ascii=False)}))
+
+    def close(self) -> None:
+        """Дописывает очередь в файл и останавливает поток записи"""
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.stop()
+            for handler in writer.handlers:
+                handler.close()
+
+    def entries(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Последние медленные запросы, самые свежие первыми"""
+        with self._lock:
+            return list(self._ring)[::-1][:limit]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ring.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "threshold_ms": self.threshold_ms,
+                "size": self._ring.maxlen,
+                "buffered": len(self._ring),
+                "recorded": self._recorded,
+                "file": self.path or None,
+            }
+
+
+class StatementCacheStats:
+    """Попадания в кэш скомпилированных выражений SQLAlchemy по движкам"""
+
+    def __init__(self):
+        self._counters: Dict[str, Counter] = {}
+        self._lock = threading.Lock()
+
+    def record(self, engine_name: str, outcome: str) -> None:
+        with self._lock:
+            self._counters.setdefault(engine_name, Counter())[outcome] += 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            result = {}
+            for engine_name, counter in self._counters.items():
+                lookups = counter["cache_hit"] + counter["cache_miss"]
+                result[engine_name] = {
+                    **counter,
+                    "hit_ratio": round(counter["cache_hit"] / lookups, 4) if lookups else 0.0,
+                }
+            return result
+
+
+statement_cache_stats = StatementCacheStats()
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.SQL_SLOW_QUERY_MS,
+    size=settings.SQL_SLOW_QUERY_LOG_SIZE,
+    path=settings.SQL_SLOW_QUERY_FILE,
+)
+
+
+def install_sql_logging(engine: Engine, name: str, sample_rate: Optional[float] = None) -> None:
+    """Выборочное логирование SQL и журнал медленных запросов вместо echo=True.
+
+    ``name`` — имя движка в статистике кэша выражений и в журнале медленных
+    запросов: у пишущего и read-only движков один драйвер и один файл.
+    ``sample_rate`` — доля запросов, попадающих в лог "app.sql" (0 — выключено,
+    1 — все). Для async-движка передаётся ``async_engine.sync_engine``.
+    """
+    rate = settings.SQL_LOG_SAMPLE_RATE if sample_rate is None else sample_rate
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "handle_error")
+    def _drop_timer(context):
+        # Упавший запрос не доходит до after_cursor_execute: иначе его отметка
+        # осталась бы в conn.info на всё время жизни подключения из пула
+        conn = context.connection
+        if conn is not None and context.execution_context is not None and conn.info.get("query_started"):
+            conn.info["query_started"].pop()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _log_query(conn, cursor, statement, parameters, context, executemany):
+        duration_ms = (time.perf_counter() - conn.info["query_started"].pop()) * 1000
+
+        if context is not None and context.compiled is not None:
+            # cache_hit / cache_miss / no_cache_key / caching_disabled
+            statement_cache_stats.record(name, context.cache_hit.name.lower())
+
+        if rate > 0 and random.random() < rate:
+            logger.info(f"{statement} ({duration_ms:.2f} ms)")
+
+        if duration_ms >= slow_query_log.threshold_ms:
+            rowcount = cursor.rowcount
+            entry = {
+                "timestamp": datetime.utcnow().isoformat(),
+                "duration_ms": round(duration_ms, 2),
+                # Для SELECT sqlite3 не знает число строк до выборки (-1)
+                "rowcount": rowcount if rowcount >= 0 else None,
+                "caller": _find_repository_caller(),
+                "statement": statement[:MAX_STATEMENT_LENGTH],
+                "engine": name,
+                "database": engine.url.database,
+            }
+            slow_query_log.record(entry)
+            logger.warning(f"🐢 Slow query {entry['duration_ms']} ms from {entry['caller']}: {entry['statement'][:200]}")
@@ -1,11 +1,12 @@
 # categories.py
 from typing import Optional
-from sqlalchemy import String
+from sqlalchemy import String, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from app.database.database import Base
 
 class CategoriesModel(Base):
     __tablename__ = "categories"
+    __table_args__ = (Index("ix_categories_name", "name"),)
     
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -1,12 +1,15 @@
 # cook_statistics.py
 from datetime import datetime
-from sqlalchemy import DateTime, Integer, Float
+from sqlalchemy import DateTime, Integer, Float, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 from app.database.database import Base
 
 class CookStatisticsModel(Base):
     __tablename__ = "cook_statistics"
+    __table_args__ = (Index("ix_cook_statistics_cook_id", "cook_id"),)
+    # Серверный last_updated забираем RETURNING'ом при вставке
+    __mapper_args__ = {"eager_defaults": True}
     
     id: Mapped[int] = mapped_column(primary_key=True)
     cook_id: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -1,5 +1,5 @@
 # migration.py (остается без изменений)
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, String, DateTime, Text, Float
 from app.database.database import Base
 
 class MigrationHistory(Base):
@@ -11,4 +11,12 @@ class MigrationHistory(Base):
     sql_content = Column(Text, nullable=True)
     applied_at = Column(DateTime)
     status = Column(String)
-    applied_by = Column(String, nullable=True)
\ No newline at end of file
+    applied_by = Column(String, nullable=True)
+    # Результат последнего запуска MigrationRunner
+    duration_ms = Column(Float, nullable=True)
+    rows_affected = Column(Integer, default=0)
+    error = Column(Text, nullable=True)
+    # Пакетная миграция данных: sql_content повторяется с :batch_size,
+    # каждый пакет — своя транзакция, batches_done — прогресс
+    batch_size = Column(Integer, nullable=True)
+    batches_done = Column(Integer, default=0)
\ No newline at end of file
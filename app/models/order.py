@@ -1,13 +1,41 @@
 # order.py
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import String, DateTime, Float, Integer
+from sqlalchemy import String, DateTime, Float, Integer, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 from app.database.database import Base
 
+# Жизненный цикл заказа: created -> cooking -> ready -> completed.
+# Роутеры app/api и main.py исторически пишут статусы по-разному
+STATUS_ALIASES = {
+    "created": "created",
+    "pending": "created",
+    "Создан": "created",
+    "cooking": "cooking",
+    "Готовится": "cooking",
+    "ready": "ready",
+    "Готов": "ready",
+    "completed": "completed",
+    "Выдан": "completed",
+}
+COOKING_STATUSES = tuple(alias for alias, status in STATUS_ALIASES.items() if status == "cooking")
+
+
+def normalize_status(status: Optional[str]) -> Optional[str]:
+    return STATUS_ALIASES.get(status, status)
+
+
 class OrderModel(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        # OrderRepository.get_by_waiter / get_by_table / get_by_status
+        Index("ix_orders_waiters_id_status", "waiters_id", "status"),
+        Index("ix_orders_table_id_status", "table_id", "status"),
+        Index("ix_orders_status_created_at", "status", "created_at"),
+    )
+    # created_at/updated_at возвращаются через RETURNING прямо при flush
+    __mapper_args__ = {"eager_defaults": True}
     
     id: Mapped[int] = mapped_column(primary_key=True)
     table_id: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -16,4 +44,9 @@ class OrderModel(Base):
     status: Mapped[str] = mapped_column(String(50), default="created")
     total_amount: Mapped[float] = mapped_column(Float, default=0.0)
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
-    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
\ No newline at end of file
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
+    # Статус до последней смены: UPDATE пишет сюда старое значение и отдаёт его
+    # через RETURNING, из пары previous_status -> status строится событие заказа
+    previous_status: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    # Когда заказ ушёл в готовку: время приготовления считается при переходе в ready
+    cooking_started_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
\ No newline at end of file
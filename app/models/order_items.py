@@ -1,10 +1,15 @@
 # order_items.py
-from sqlalchemy import Float, Integer
+from sqlalchemy import Float, Integer, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from app.database.database import Base
 
 class OrderItemsModel(Base):
     __tablename__ = "order_items"
+    __table_args__ = (
+        # OrderItemRepository.get_by_order / get_by_menu
+        Index("ix_order_items_order_id", "order_id"),
+        Index("ix_order_items_menu_id", "menu_id"),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True)
     order_id: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -0,0 +1,17 @@
+# prep_time_sketch.py
+from datetime import datetime
+from sqlalchemy import DateTime, Integer, LargeBinary, String
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+from app.database.database import Base
+
+class PrepTimeSketchModel(Base):
+    """Скетч времени готовки (LatencySketch.to_bytes) на повара или блюдо"""
+    __tablename__ = "prep_time_sketches"
+
+    # kind: 'cook' или 'dish'; key_id — cook_id или menu_id
+    kind: Mapped[str] = mapped_column(String(10), primary_key=True)
+    key_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    sketch: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    samples: Mapped[int] = mapped_column(Integer, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
@@ -1,13 +1,24 @@
 # tables.py
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import String, Integer, Boolean, DateTime
+from sqlalchemy import String, Integer, Boolean, DateTime, Index, text
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 from app.database.database import Base
 
 class TablesModel(Base):
     __tablename__ = "tables"
+    __table_args__ = (
+        Index("ix_tables_status", "status"),
+        # TableRepository.get_available_tables: частичный индекс только по свободным столам
+        Index(
+            "ix_tables_available",
+            "table_number",
+            sqlite_where=text("is_available = 1 AND status = 'available'"),
+        ),
+    )
+    # updated_at (onupdate=now) приходит через RETURNING, без refresh после flush
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[int] = mapped_column(primary_key=True)
     table_number: Mapped[int] = mapped_column(Integer, unique=True, nullable=False)
@@ -1,12 +1,15 @@
 # waiter_statistics.py
 from datetime import datetime
-from sqlalchemy import DateTime, Integer, Float
+from sqlalchemy import DateTime, Integer, Float, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 from app.database.database import Base
 
 class WaiterStatisticsModel(Base):
     __tablename__ = "waiter_statistics"
+    __table_args__ = (Index("ix_waiter_statistics_waiter_id", "waiter_id"),)
+    # last_updated = func.now() из репозитория читается через RETURNING
+    __mapper_args__ = {"eager_defaults": True}
     
     id: Mapped[int] = mapped_column(primary_key=True)
     waiter_id: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -1,60 +1,43 @@
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.keyset import paginate
+from app.database.returning import delete_returning, update_returning
 from app.models.admin import AdminModel
 from app.schemes.admin import AdminCreate, AdminUpdate
 
 class AdminRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
     
-    def get_all(self, skip: int = 0, limit: int = 100):
-        return self.db.query(AdminModel).offset(skip).limit(limit).all()
+    async def get_all(self, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+        result = await self.db.execute(paginate(select(AdminModel), AdminModel.id, skip, limit, after))
+        return result.scalars().all()
     
-    def get_by_id(self, admin_id: int):
-        return self.db.query(AdminModel).filter(AdminModel.id == admin_id).first()
+    async def get_by_id(self, admin_id: int):
+        return await self.db.get(AdminModel, admin_id)
     
-    def get_by_login(self, login: str):
-        return self.db.query(AdminModel).filter(AdminModel.login == login).first()
+    async def get_by_login(self, login: str):
+        result = await self.db.execute(select(AdminModel).where(AdminModel.login == login))
+        return result.scalars().first()
     
-    def create(self, admin: AdminCreate):
+    async def create(self, admin: AdminCreate):
         db_admin = AdminModel(
             login=admin.login,
             password=admin.password,
             role=admin.role
         )
         self.db.add(db_admin)
-        self.db.commit()
-        self.db.refresh(db_admin)
+        await self.db.flush()
         return db_admin
     
-    def update(self, admin_id: int, admin_update: AdminUpdate):
-        db_admin = self.get_by_id(admin_id)
-        if not db_admin:
-            return None
-        
+    async def update(self, admin_id: int, admin_update: AdminUpdate):
         update_data = admin_update.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_admin, field, value)
-        
-        self.db.commit()
-        self.db.refresh(db_admin)
-        return db_admin
+        return await update_returning(self.db, AdminModel, admin_id, update_data)
     
-    def delete(self, admin_id: int):
-        db_admin = self.get_by_id(admin_id)
-        if not db_admin:
-            return False
-        
-        self.db.delete(db_admin)
-        self.db.commit()
-        return True
+    async def delete(self, admin_id: int):
+        return await delete_returning(self.db, AdminModel, admin_id)
     
-    def update_last_login(self, admin_id: int):
-        db_admin = self.get_by_id(admin_id)
-        if not db_admin:
-            return None
-        
-        from datetime import datetime
-        db_admin.last_login = datetime.utcnow()
-        self.db.commit()
-        self.db.refresh(db_admin)
-        return db_admin
\ No newline at end of file
+    async def update_last_login(self, admin_id: int):
+        return await update_returning(self.db, AdminModel, admin_id, {"last_login": datetime.utcnow()})
@@ -1,48 +1,44 @@
-from sqlalchemy.orm import Session
+from typing import Optional
+from sqlalchemy import lambda_stmt, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.keyset import paginate
+from app.database.reference_cache import category_cache, cached_lookup, invalidate_on_commit
+from app.database.returning import delete_returning, update_returning
 from app.models.categories import CategoriesModel
 from app.schemes.categories import CategoryCreate, CategoryUpdate
 
 class CategoryRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
     
-    def get_all(self, skip: int = 0, limit: int = 100):
-        return self.db.query(CategoriesModel).offset(skip).limit(limit).all()
+    async def get_all(self, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+        result = await self.db.execute(paginate(select(CategoriesModel), CategoriesModel.id, skip, limit, after))
+        return result.scalars().all()
     
-    def get_by_id(self, category_id: int):
-        return self.db.query(CategoriesModel).filter(CategoriesModel.id == category_id).first()
+    async def get_by_id(self, category_id: int):
+        statement = lambda_stmt(lambda: select(*CategoriesModel.__table__.columns))
+        statement += lambda s: s.where(CategoriesModel.id == category_id).limit(1)
+        return await cached_lookup(self.db, category_cache, ("id", category_id), CategoriesModel, statement)
     
-    def get_by_name(self, name: str):
-        return self.db.query(CategoriesModel).filter(CategoriesModel.name == name).first()
+    async def get_by_name(self, name: str):
+        statement = lambda_stmt(lambda: select(*CategoriesModel.__table__.columns))
+        statement += lambda s: s.where(CategoriesModel.name == name).limit(1)
+        return await cached_lookup(self.db, category_cache, ("name", name), CategoriesModel, statement)
     
-    def create(self, category: CategoryCreate):
+    async def create(self, category: CategoryCreate):
         db_category = CategoriesModel(
             name=category.name,
             description=category.description
         )
         self.db.add(db_category)
-        self.db.commit()
-        self.db.refresh(db_category)
+        await self.db.flush()
         return db_category
     
-    def update(self, category_id: int, category_update: CategoryUpdate):
-        db_category = self.get_by_id(category_id)
-        if not db_category:
-            return None
-        
+    async def update(self, category_id: int, category_update: CategoryUpdate):
         update_data = category_update.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_category, field, value)
-        
-        self.db.commit()
-        self.db.refresh(db_category)
-        return db_category
+        invalidate_on_commit(self.db, category_cache)
+        return await update_returning(self.db, CategoriesModel, category_id, update_data)
     
-    def delete(self, category_id: int):
-        db_category = self.get_by_id(category_id)
-        if not db_category:
-            return False
-        
-        self.db.delete(db_category)
-        self.db.commit()
-        return True
\ No newline at end of file
+    async def delete(self, category_id: int):
+        invalidate_on_commit(self.db, category_cache)
+        return await delete_returning(self.db, CategoriesModel, category_id)
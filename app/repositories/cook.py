@@ -1,60 +1,50 @@
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import lambda_stmt, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.keyset import paginate
+from app.database.reference_cache import cook_cache, cached_lookup, invalidate_on_commit
+from app.database.returning import delete_returning, update_returning
 from app.models.cook import CookModel
 from app.schemes.cook import CookCreate, CookUpdate
 
 class CookRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
     
-    def get_all(self, skip: int = 0, limit: int = 100):
-        return self.db.query(CookModel).offset(skip).limit(limit).all()
+    async def get_all(self, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+        result = await self.db.execute(paginate(select(CookModel), CookModel.id, skip, limit, after))
+        return result.scalars().all()
     
-    def get_by_id(self, cook_id: int):
-        return self.db.query(CookModel).filter(CookModel.id == cook_id).first()
+    async def get_by_id(self, cook_id: int):
+        statement = lambda_stmt(lambda: select(*CookModel.__table__.columns))
+        statement += lambda s: s.where(CookModel.id == cook_id).limit(1)
+        return await cached_lookup(self.db, cook_cache, ("id", cook_id), CookModel, statement)
     
-    def get_by_login(self, login: str):
-        return self.db.query(CookModel).filter(CookModel.login == login).first()
+    async def get_by_login(self, login: str):
+        statement = lambda_stmt(lambda: select(*CookModel.__table__.columns))
+        statement += lambda s: s.where(CookModel.login == login).limit(1)
+        return await cached_lookup(self.db, cook_cache, ("login", login), CookModel, statement)
     
-    def create(self, cook: CookCreate):
+    async def create(self, cook: CookCreate):
         db_cook = CookModel(
             login=cook.login,
             password=cook.password,
             role=cook.role
         )
         self.db.add(db_cook)
-        self.db.commit()
-        self.db.refresh(db_cook)
+        await self.db.flush()
         return db_cook
     
-    def update(self, cook_id: int, cook_update: CookUpdate):
-        db_cook = self.get_by_id(cook_id)
-        if not db_cook:
-            return None
-        
+    async def update(self, cook_id: int, cook_update: CookUpdate):
         update_data = cook_update.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_cook, field, value)
-        
-        self.db.commit()
-        self.db.refresh(db_cook)
-        return db_cook
+        invalidate_on_commit(self.db, cook_cache)
+        return await update_returning(self.db, CookModel, cook_id, update_data)
     
-    def delete(self, cook_id: int):
-        db_cook = self.get_by_id(cook_id)
-        if not db_cook:
-            return False
-        
-        self.db.delete(db_cook)
-        self.db.commit()
-        return True
+    async def delete(self, cook_id: int):
+        invalidate_on_commit(self.db, cook_cache)
+        return await delete_returning(self.db, CookModel, cook_id)
     
-    def update_last_login(self, cook_id: int):
-        db_cook = self.get_by_id(cook_id)
-        if not db_cook:
-            return None
-        
-        from datetime import datetime
-        db_cook.last_login = datetime.utcnow()
-        self.db.commit()
-        self.db.refresh(db_cook)
-        return db_cook
\ No newline at end of file
+    async def update_last_login(self, cook_id: int):
+        invalidate_on_commit(self.db, cook_cache)
+        return await update_returning(self.db, CookModel, cook_id, {"last_login": datetime.utcnow()})
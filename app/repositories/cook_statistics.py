@@ -1,58 +1,91 @@
-from sqlalchemy.orm import Session
+from typing import Optional
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.keyset import paginate
+from app.database.returning import delete_returning, update_returning, update_where_returning
 from app.models.cook_statistics import CookStatisticsModel
 from app.schemes.cook_statistics import CookStatisticsCreate, CookStatisticsUpdate
 
 class CookStatisticsRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
     
-    def get_all(self, skip: int = 0, limit: int = 100):
-        return self.db.query(CookStatisticsModel).offset(skip).limit(limit).all()
+    async def get_all(self, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+        result = await self.db.execute(paginate(select(CookStatisticsModel), CookStatisticsModel.id, skip, limit, after))
+        return result.scalars().all()
     
-    def get_by_id(self, stat_id: int):
-        return self.db.query(CookStatisticsModel).filter(CookStatisticsModel.id == stat_id).first()
+    async def get_by_id(self, stat_id: int):
+        return await self.db.get(CookStatisticsModel, stat_id)
     
-    def get_by_cook(self, cook_id: int):
-        return self.db.query(CookStatisticsModel).filter(CookStatisticsModel.cook_id == cook_id).first()
+    async def get_by_cook(self, cook_id: int):
+        result = await self.db.execute(
+            select(CookStatisticsModel).where(CookStatisticsModel.cook_id == cook_id).limit(1)
+        )
+        return result.scalars().first()
     
-    def create(self, stat: CookStatisticsCreate):
+    async def create(self, stat: CookStatisticsCreate):
         db_stat = CookStatisticsModel(
             cook_id=stat.cook_id,
             active_orders=stat.active_orders
         )
         self.db.add(db_stat)
-        self.db.commit()
-        self.db.refresh(db_stat)
+        await self.db.flush()
         return db_stat
     
-    def update(self, stat_id: int, stat_update: CookStatisticsUpdate):
-        db_stat = self.get_by_id(stat_id)
-        if not db_stat:
-            return None
-        
+    async def update(self, stat_id: int, stat_update: CookStatisticsUpdate):
         update_data = stat_update.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_stat, field, value)
-        
-        self.db.commit()
-        self.db.refresh(db_stat)
-        return db_stat
+        return await update_returning(self.db, CookStatisticsModel, stat_id, update_data)
     
-    def delete(self, stat_id: int):
-        db_stat = self.get_by_id(stat_id)
-        if not db_stat:
-            return False
-        
-        self.db.delete(db_stat)
-        self.db.commit()
-        return True
-    
-    def update_active_orders(self, cook_id: int, change: int):
-        db_stat = self.get_by_cook(cook_id)
-        if not db_stat:
-            return None
-        
-        db_stat.active_orders = max(0, db_stat.active_orders + change)
-        self.db.commit()
-        self.db.refresh(db_stat)
-        return db_stat
\ No newline at end of file
+    async def delete(self, stat_id: int):
+        return await delete_returning(self.db, CookStatisticsModel, stat_id)
+    
+    def _cook_row(self, cook_id: int):
+        # Та же строка, что вернёт get_by_cook, но условием внутри UPDATE
+        return CookStatisticsModel.id == (
+            select(CookStatisticsModel.id)
+            .where(CookStatisticsModel.cook_id == cook_id)
+            .order_by(CookStatisticsModel.id)
+            .limit(1)
+            .scalar_subquery()
+        )
+    
+    async def update_active_orders(self, cook_id: int, change: int):
+        return await self.apply_delta(cook_id, active=change)
+    
+    async def apply_delta(
+        self,
+        cook_id: int,
+        active: int = 0,
+        completed: int = 0,
+        cooking_minutes: float = 0.0,
+        create_missing: bool = False,
+    ):
+        """Приращения счётчиков повара одним атомарным UPDATE ... RETURNING.
+
+        max(0, ...) — скалярный max SQLite: active_orders не уходит в минус.
+        Среднее время готовки пересчитывается инкрементально: правая часть
+        SET видит старые completed_orders, поэтому
+        avg' = (avg * n + сумма минут) / (n + completed).
+        """
+        values = {
+            "active_orders": func.max(0, CookStatisticsModel.active_orders + active),
+            "last_updated": func.now(),
+        }
+        if completed > 0:
+            done = func.coalesce(CookStatisticsModel.completed_orders, 0)
+            average = func.coalesce(CookStatisticsModel.average_cooking_time, 0.0)
+            values["completed_orders"] = done + completed
+            values["average_cooking_time"] = (average * done + cooking_minutes) / (done + completed)
+        row = await update_where_returning(self.db, CookStatisticsModel, self._cook_row(cook_id), values)
+        if row is None and create_missing:
+            # Первое событие по повару без строки статистики
+            db_stat = CookStatisticsModel(
+                cook_id=cook_id,
+                active_orders=max(0, active),
+                completed_orders=max(0, completed),
+                average_cooking_time=cooking_minutes / completed if completed > 0 else 0.0,
+            )
+            self.db.add(db_stat)
+            await self.db.flush()
+            return db_stat
+        return row
@@ -1,42 +1,42 @@
-from sqlalchemy.orm import Session
+from typing import Optional
+from sqlalchemy import lambda_stmt, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.dto import fetch_response_rows, select_response
+from app.database.keyset import paginate
+from app.database.reference_cache import dish_cache, cached_lookup, invalidate_on_commit
+from app.database.returning import delete_returning, update_returning
 from app.models.dishes import DishesModel
-from app.schemes.dishes import DishCreate, DishUpdate
+from app.schemes.dishes import DishCreate, DishUpdate, DishResponse
 
 class DishRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
     
-    def get_all(self, skip: int = 0, limit: int = 100):
-        return self.db.query(DishesModel).offset(skip).limit(limit).all()
+    async def get_all(self, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+        result = await self.db.execute(paginate(select(DishesModel), DishesModel.id, skip, limit, after))
+        return result.scalars().all()
     
-    def get_by_id(self, dish_id: int):
-        return self.db.query(DishesModel).filter(DishesModel.id == dish_id).first()
+    async def get_page(self, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+        """Страница для списка API: только колонки DishResponse, без ORM-объектов"""
+        statement = paginate(select_response(DishesModel, DishResponse), DishesModel.id, skip, limit, after)
+        return await fetch_response_rows(self.db, DishResponse, statement)
     
-    def create(self, dish: DishCreate):
+    async def get_by_id(self, dish_id: int):
+        statement = lambda_stmt(lambda: select(*DishesModel.__table__.columns))
+        statement += lambda s: s.where(DishesModel.id == dish_id).limit(1)
+        return await cached_lookup(self.db, dish_cache, ("id", dish_id), DishesModel, statement)
+    
+    async def create(self, dish: DishCreate):
         db_dish = DishesModel(**dish.model_dump())
         self.db.add(db_dish)
-        self.db.commit()
-        self.db.refresh(db_dish)
+        await self.db.flush()
         return db_dish
     
-    def update(self, dish_id: int, dish_update: DishUpdate):
-        db_dish = self.get_by_id(dish_id)
-        if not db_dish:
-            return None
-        
+    async def update(self, dish_id: int, dish_update: DishUpdate):
         update_data = dish_update.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_dish, field, value)
-        
-        self.db.commit()
-        self.db.refresh(db_dish)
-        return db_dish
+        invalidate_on_commit(self.db, dish_cache)
+        return await update_returning(self.db, DishesModel, dish_id, update_data)
     
-    def delete(self, dish_id: int):
-        db_dish = self.get_by_id(dish_id)
-        if not db_dish:
-            return False
-        
-        self.db.delete(db_dish)
-        self.db.commit()
-        return True
\ No newline at end of file
+    async def delete(self, dish_id: int):
+        invalidate_on_commit(self.db, dish_cache)
+        return await delete_returning(self.db, DishesModel, dish_id)
@@ -1,68 +1,64 @@
-from sqlalchemy.orm import Session
+from typing import Optional
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.keyset import paginate
+from app.database.returning import delete_returning, update_returning
 from datetime import datetime
 from app.models.migration import MigrationHistory
 from app.schemes.migration import MigrationCreate, MigrationUpdate
 
 class MigrationRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
     
-    def get_all(self, skip: int = 0, limit: int = 100):
-        return self.db.query(MigrationHistory).offset(skip).limit(limit).all()
+    async def get_all(self, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+        result = await self.db.execute(paginate(select(MigrationHistory), MigrationHistory.id, skip, limit, after))
+        return result.scalars().all()
     
-    def get_by_id(self, migration_id: int):
-        return self.db.query(MigrationHistory).filter(MigrationHistory.id == migration_id).first()
+    async def get_by_id(self, migration_id: int):
+        return await self.db.get(MigrationHistory, migration_id)
     
-    def get_by_version(self, version: str):
-        return self.db.query(MigrationHistory).filter(MigrationHistory.version == version).first()
+    async def get_by_version(self, version: str):
+        # Поиск по уникальному индексу ix_migration_history_version
+        result = await self.db.execute(select(MigrationHistory).where(MigrationHistory.version == version))
+        return result.scalars().first()
     
-    def create(self, migration: MigrationCreate):
+    async def get_by_statuses(self, statuses):
+        result = await self.db.execute(select(MigrationHistory).where(MigrationHistory.status.in_(statuses)))
+        return result.scalars().all()
+    
+    async def create(self, migration: MigrationCreate):
         db_migration = MigrationHistory(
             version=migration.version,
             description=migration.description,
             sql_content=migration.sql_content,
             status=migration.status,
             applied_by=migration.applied_by,
+            batch_size=migration.batch_size,
             applied_at=datetime.utcnow() if migration.status == "success" else None
         )
         self.db.add(db_migration)
-        self.db.commit()
-        self.db.refresh(db_migration)
+        await self.db.flush()
         return db_migration
     
-    def update(self, migration_id: int, migration_update: MigrationUpdate):
-        db_migration = self.get_by_id(migration_id)
-        if not db_migration:
-            return None
-        
+    async def update(self, migration_id: int, migration_update: MigrationUpdate):
         update_data = migration_update.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            if field == "status" and value == "success" and not db_migration.applied_at:
-                db_migration.applied_at = datetime.utcnow()
-            setattr(db_migration, field, value)
-        
-        self.db.commit()
-        self.db.refresh(db_migration)
-        return db_migration
+        if update_data.get("status") == "success":
+            # applied_at ставится только при первом успешном применении
+            update_data["applied_at"] = func.coalesce(MigrationHistory.applied_at, datetime.utcnow())
+        return await update_returning(self.db, MigrationHistory, migration_id, update_data)
+    
+    async def delete(self, migration_id: int):
+        return await delete_returning(self.db, MigrationHistory, migration_id)
     
-    def delete(self, migration_id: int):
-        db_migration = self.get_by_id(migration_id)
-        if not db_migration:
-            return False
-        
-        self.db.delete(db_migration)
-        self.db.commit()
-        return True
+    async def record_run(self, migration_id: int, **values):
+        """Результат запуска: статус, длительность, число строк, прогресс пакетов"""
+        if values.get("status") == "success":
+            values["applied_at"] = func.coalesce(MigrationHistory.applied_at, datetime.utcnow())
+        return await update_returning(self.db, MigrationHistory, migration_id, values)
     
-    def update_status(self, migration_id: int, status: str):
-        db_migration = self.get_by_id(migration_id)
-        if not db_migration:
-            return None
-        
-        db_migration.status = status
-        if status == "success" and not db_migration.applied_at:
-            db_migration.applied_at = datetime.utcnow()
-        
-        self.db.commit()
-        self.db.refresh(db_migration)
-        return db_migration
\ No newline at end of file
+    async def update_status(self, migration_id: int, status: str):
+        update_data = {"status": status}
+        if status == "success":
+            update_data["applied_at"] = func.coalesce(MigrationHistory.applied_at, datetime.utcnow())
+        return await update_returning(self.db, MigrationHistory, migration_id, update_data)
@@ -1,53 +1,94 @@
-from sqlalchemy.orm import Session
+from typing import Optional
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.dto import fetch_response_rows, select_response
+from app.database.keyset import paginate
+from app.database.returning import delete_returning, update_returning
 from app.models.order_items import OrderItemsModel
-from app.schemes.order_items import OrderItemCreate, OrderItemUpdate
+from app.schemes.order_items import OrderItemCreate, OrderItemUpdate, OrderItemResponse
 
 class OrderItemRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
     
-    def get_all(self, skip: int = 0, limit: int = 100):
-        return self.db.query(OrderItemsModel).offset(skip).limit(limit).all()
+    async def get_all(self, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+        result = await self.db.execute(paginate(select(OrderItemsModel), OrderItemsModel.id, skip, limit, after))
+        return result.scalars().all()
     
-    def get_by_id(self, item_id: int):
-        return self.db.query(OrderItemsModel).filter(OrderItemsModel.id == item_id).first()
+    async def get_page(self, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+        """Страница для списка API: только колонки OrderItemResponse, без ORM-объектов"""
+        statement = paginate(select_response(OrderItemsModel, OrderItemResponse), OrderItemsModel.id, skip, limit, after)
+        return await fetch_response_rows(self.db, OrderItemResponse, statement)
     
-    def get_by_order(self, order_id: int):
-        return self.db.query(OrderItemsModel).filter(OrderItemsModel.order_id == order_id).all()
+    async def get_by_id(self, item_id: int):
+        return await self.db.get(OrderItemsModel, item_id)
     
-    def create(self, order_item: OrderItemCreate):
+    async def get_by_order(self, order_id: int):
+        result = await self.db.execute(select(OrderItemsModel).where(OrderItemsModel.order_id == order_id))
+        return result.scalars().all()
+    
+    async def create(self, order_item: OrderItemCreate):
         db_item = OrderItemsModel(
             order_id=order_item.order_id,
             menu_id=order_item.menu_id,
             quantity=order_item.quantity,
-            price=order_item.price
+            price=order_item.price,
+            subtotal=order_item.quantity * order_item.price
         )
         self.db.add(db_item)
-        self.db.commit()
-        self.db.refresh(db_item)
+        await self.db.flush()
         return db_item
     
-    def update(self, item_id: int, item_update: OrderItemUpdate):
-        db_item = self.get_by_id(item_id)
-        if not db_item:
-            return None
-        
+    async def update(self, item_id: int, item_update: OrderItemUpdate):
         update_data = item_update.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_item, field, value)
-        
-        self.db.commit()
-        self.db.refresh(db_item)
-        return db_item
+        return await update_returning(self.db, OrderItemsModel, item_id, _with_subtotal(update_data))
+    
+    async def delete(self, item_id: int):
+        return await delete_returning(self.db, OrderItemsModel, item_id)
+    
+    async def get_by_menu(self, menu_id: int):
+        result = await self.db.execute(select(OrderItemsModel).where(OrderItemsModel.menu_id == menu_id))
+        return result.scalars().all()
+    
+    async def create_many(self, items: list[OrderItemCreate]):
+        """Все позиции одним многострочным INSERT ... RETURNING, строки в порядке items"""
+        rows = [
+            {
+                "order_id": item.order_id,
+                "menu_id": item.menu_id,
+                "quantity": item.quantity,
+                "price": item.price,
+                "subtotal": item.quantity * item.price,
+            }
+            for item in items
+        ]
+        result = await self.db.execute(
+            insert(OrderItemsModel).values(rows).returning(*OrderItemsModel.__table__.columns)
+        )
+        # Порядок строк RETURNING не гарантирован, а rowid внутри одного INSERT
+        # выдаются по порядку VALUES — сортировка по id возвращает порядок items
+        return sorted((dict(row) for row in result.mappings()), key=lambda row: row["id"])
+    
+    async def update_many(self, updates: list[tuple[int, OrderItemUpdate]]):
+        """UPDATE ... RETURNING на каждую позицию; None там, где id не найден"""
+        return [await self.update(item_id, item_update) for item_id, item_update in updates]
     
-    def delete(self, item_id: int):
-        db_item = self.get_by_id(item_id)
-        if not db_item:
-            return False
-        
-        self.db.delete(db_item)
-        self.db.commit()
-        return True
-    
-    def get_by_menu(self, menu_id: int):
-        return self.db.query(OrderItemsModel).filter(OrderItemsModel.menu_id == menu_id).all()
\ No newline at end of file
+    async def delete_many(self, item_ids: list[int]):
+        """Один DELETE ... WHERE id IN (...) RETURNING id; возвращает удалённые id"""
+        result = await self.db.execute(
+            delete(OrderItemsModel).where(OrderItemsModel.id.in_(item_ids)).returning(OrderItemsModel.id)
+        )
+        return list(result.scalars())
+
+
+def _with_subtotal(update_data: dict) -> dict:
+    # subtotal всегда считается на сервере: новое значение поля или текущее из строки
+    if "quantity" in update_data or "price" in update_data:
+        quantity = update_data.get("quantity")
+        price = update_data.get("price")
+        if quantity is None:
+            quantity = OrderItemsModel.quantity
+        if price is None:
+            price = OrderItemsModel.price
+        update_data["subtotal"] = quantity * price
+    return update_data
@@ -1,56 +1,77 @@
-from sqlalchemy.orm import Session
-from app.models.order import OrderModel
-from app.schemes.order import OrderCreate, OrderUpdate
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import case, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.dto import fetch_response_rows, select_response
+from app.database.keyset import paginate
+from app.database.returning import delete_returning, delete_returning_row, update_returning
+from app.models.order import COOKING_STATUSES, OrderModel
+from app.models.order_items import OrderItemsModel
+from app.schemes.order import OrderCreate, OrderUpdate, OrderResponse
 
 class OrderRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
     
-    def get_all(self, skip: int = 0, limit: int = 100):
-        return self.db.query(OrderModel).offset(skip).limit(limit).all()
+    async def get_all(self, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+        result = await self.db.execute(paginate(select(OrderModel), OrderModel.id, skip, limit, after))
+        return result.scalars().all()
     
-    def get_by_id(self, order_id: int):
-        return self.db.query(OrderModel).filter(OrderModel.id == order_id).first()
+    async def get_page(self, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+        """Страница для списка API: только колонки OrderResponse, без ORM-объектов"""
+        statement = paginate(select_response(OrderModel, OrderResponse), OrderModel.id, skip, limit, after)
+        return await fetch_response_rows(self.db, OrderResponse, statement)
     
-    def create(self, order: OrderCreate):
+    async def get_by_id(self, order_id: int):
+        return await self.db.get(OrderModel, order_id)
+    
+    async def create(self, order: OrderCreate):
         db_order = OrderModel(
             table_id=order.table_id,
             cook_id=order.cook_id,
             waiters_id=order.waiters_id,
-            status=order.status
+            status=order.status,
+            cooking_started_at=datetime.utcnow() if order.status in COOKING_STATUSES else None
         )
         self.db.add(db_order)
-        self.db.commit()
-        self.db.refresh(db_order)
+        await self.db.flush()
         return db_order
     
-    def update(self, order_id: int, order_update: OrderUpdate):
-        db_order = self.get_by_id(order_id)
-        if not db_order:
-            return None
-        
+    async def update(self, order_id: int, order_update: OrderUpdate):
         update_data = order_update.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_order, field, value)
-        
-        self.db.commit()
-        self.db.refresh(db_order)
-        return db_order
+        if update_data.get("status") is not None:
+            # Правая часть SET видит строку до UPDATE: старый статус уходит в
+            # previous_status и возвращается RETURNING'ом вместе с новым
+            update_data["previous_status"] = OrderModel.status
+            if update_data["status"] in COOKING_STATUSES:
+                update_data["cooking_started_at"] = case(
+                    (OrderModel.status.in_(COOKING_STATUSES), OrderModel.cooking_started_at),
+                    else_=datetime.utcnow(),
+                )
+        return await update_returning(self.db, OrderModel, order_id, update_data)
+    
+    async def delete(self, order_id: int):
+        return await delete_returning(self.db, OrderModel, order_id)
+    
+    async def get_menu_ids(self, order_id: int) -> list[int]:
+        """Блюда заказа (menu_id без повторов) — для времени готовки по блюдам"""
+        result = await self.db.execute(
+            select(OrderItemsModel.menu_id).where(OrderItemsModel.order_id == order_id).distinct()
+        )
+        return list(result.scalars().all())
     
-    def delete(self, order_id: int):
-        db_order = self.get_by_id(order_id)
-        if not db_order:
-            return False
-        
-        self.db.delete(db_order)
-        self.db.commit()
-        return True
+    async def delete_row(self, order_id: int):
+        """Удаление с возвратом удалённой строки (для события заказа)"""
+        return await delete_returning_row(self.db, OrderModel, order_id)
     
-    def get_by_status(self, status: str):
-        return self.db.query(OrderModel).filter(OrderModel.status == status).all()
+    async def get_by_status(self, status: str):
+        result = await self.db.execute(select(OrderModel).where(OrderModel.status == status))
+        return result.scalars().all()
     
-    def get_by_table(self, table_id: int):
-        return self.db.query(OrderModel).filter(OrderModel.table_id == table_id).all()
+    async def get_by_table(self, table_id: int):
+        result = await self.db.execute(select(OrderModel).where(OrderModel.table_id == table_id))
+        return result.scalars().all()
     
-    def get_by_waiter(self, waiter_id: int):
-        return self.db.query(OrderModel).filter(OrderModel.waiters_id == waiter_id).all()
\ No newline at end of file
+    async def get_by_waiter(self, waiter_id: int):
+        result = await self.db.execute(select(OrderModel).where(OrderModel.waiters_id == waiter_id))
+        return result.scalars().all()
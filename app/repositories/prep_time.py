@@ -0,0 +1,36 @@
+from typing import Optional
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.prep_time_sketch import PrepTimeSketchModel
+from app.utils.latency_sketch import LatencySketch
+
+class PrepTimeRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_sketch(self, kind: str, key_id: int) -> Optional[LatencySketch]:
+        result = await self.db.execute(
+            select(PrepTimeSketchModel.sketch).where(
+                PrepTimeSketchModel.kind == kind, PrepTimeSketchModel.key_id == key_id
+            )
+        )
+        data = result.scalar_one_or_none()
+        return LatencySketch.from_bytes(data) if data is not None else None
+    
+    async def merge_sketch(self, kind: str, key_id: int, sketch: LatencySketch) -> LatencySketch:
+        """Сливает приращение с сохранённым скетчем и пишет результат одним upsert.
+
+        Чтение и запись идут в одной транзакции: если другой писатель успел
+        поменять строку, SQLite не даст её перезаписать (SQLITE_BUSY), и
+        вызывающий повторит транзакцию, а не потеряет наблюдения.
+        """
+        stored = await self.get_sketch(kind, key_id) or LatencySketch()
+        merged = stored.merge(sketch)
+        values = {"sketch": merged.to_bytes(), "samples": merged.count, "updated_at": func.now()}
+        statement = insert(PrepTimeSketchModel).values(kind=kind, key_id=key_id, **values)
+        await self.db.execute(statement.on_conflict_do_update(
+            index_elements=[PrepTimeSketchModel.kind, PrepTimeSketchModel.key_id],
+            set_=values,
+        ))
+        return merged
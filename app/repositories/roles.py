@@ -1,48 +1,44 @@
-from sqlalchemy.orm import Session
+from typing import Optional
+from sqlalchemy import lambda_stmt, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.keyset import paginate
+from app.database.reference_cache import role_cache, cached_lookup, invalidate_on_commit
+from app.database.returning import delete_returning, update_returning
 from app.models.roles import Role
 from app.schemes.roles import RoleCreate, RoleUpdate
 
 class RoleRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
     
-    def get_all(self, skip: int = 0, limit: int = 100):
-        return self.db.query(Role).offset(skip).limit(limit).all()
+    async def get_all(self, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+        result = await self.db.execute(paginate(select(Role), Role.id, skip, limit, after))
+        return result.scalars().all()
     
-    def get_by_id(self, role_id: int):
-        return self.db.query(Role).filter(Role.id == role_id).first()
+    async def get_by_id(self, role_id: int):
+        statement = lambda_stmt(lambda: select(*Role.__table__.columns))
+        statement += lambda s: s.where(Role.id == role_id).limit(1)
+        return await cached_lookup(self.db, role_cache, ("id", role_id), Role, statement)
     
-    def get_by_name(self, name: str):
-        return self.db.query(Role).filter(Role.name == name).first()
+    async def get_by_name(self, name: str):
+        statement = lambda_stmt(lambda: select(*Role.__table__.columns))
+        statement += lambda s: s.where(Role.name == name).limit(1)
+        return await cached_lookup(self.db, role_cache, ("name", name), Role, statement)
     
-    def create(self, role: RoleCreate):
+    async def create(self, role: RoleCreate):
         db_role = Role(
             name=role.name,
             description=role.description
         )
         self.db.add(db_role)
-        self.db.commit()
-        self.db.refresh(db_role)
+        await self.db.flush()
         return db_role
     
-    def update(self, role_id: int, role_update: RoleUpdate):
-        db_role = self.get_by_id(role_id)
-        if not db_role:
-            return None
-        
+    async def update(self, role_id: int, role_update: RoleUpdate):
         update_data = role_update.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_role, field, value)
-        
-        self.db.commit()
-        self.db.refresh(db_role)
-        return db_role
+        invalidate_on_commit(self.db, role_cache)
+        return await update_returning(self.db, Role, role_id, update_data)
     
-    def delete(self, role_id: int):
-        db_role = self.get_by_id(role_id)
-        if not db_role:
-            return False
-        
-        self.db.delete(db_role)
-        self.db.commit()
-        return True
\ No newline at end of file
+    async def delete(self, role_id: int):
+        invalidate_on_commit(self.db, role_cache)
+        return await delete_returning(self.db, Role, role_id)
@@ -1,21 +1,33 @@
-from sqlalchemy.orm import Session
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.dto import fetch_response_rows, select_response
+from app.database.keyset import paginate
+from app.database.returning import delete_returning, update_returning
 from app.models.tables import TablesModel
-from app.schemes.tables import TableCreate, TableUpdate
+from app.schemes.tables import TableCreate, TableUpdate, TableResponse
 
 class TableRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
     
-    def get_all(self, skip: int = 0, limit: int = 100):
-        return self.db.query(TablesModel).offset(skip).limit(limit).all()
+    async def get_all(self, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+        result = await self.db.execute(paginate(select(TablesModel), TablesModel.id, skip, limit, after))
+        return result.scalars().all()
     
-    def get_by_id(self, table_id: int):
-        return self.db.query(TablesModel).filter(TablesModel.id == table_id).first()
+    async def get_page(self, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+        """Страница для списка API: только колонки TableResponse, без ORM-объектов"""
+        statement = paginate(select_response(TablesModel, TableResponse), TablesModel.id, skip, limit, after)
+        return await fetch_response_rows(self.db, TableResponse, statement)
     
-    def get_by_number(self, table_number: int):
-        return self.db.query(TablesModel).filter(TablesModel.table_number == table_number).first()
+    async def get_by_id(self, table_id: int):
+        return await self.db.get(TablesModel, table_id)
     
-    def create(self, table: TableCreate):
+    async def get_by_number(self, table_number: int):
+        result = await self.db.execute(select(TablesModel).where(TablesModel.table_number == table_number))
+        return result.scalars().first()
+    
+    async def create(self, table: TableCreate):
         db_table = TablesModel(
             table_number=table.table_number,
             capacity=table.capacity,
@@ -25,45 +37,24 @@ class TableRepository:
             is_available=True
         )
         self.db.add(db_table)
-        self.db.commit()
-        self.db.refresh(db_table)
+        await self.db.flush()
         return db_table
     
-    def update(self, table_id: int, table_update: TableUpdate):
-        db_table = self.get_by_id(table_id)
-        if not db_table:
-            return None
-        
+    async def update(self, table_id: int, table_update: TableUpdate):
         update_data = table_update.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_table, field, value)
-        
-        self.db.commit()
-        self.db.refresh(db_table)
-        return db_table
+        return await update_returning(self.db, TablesModel, table_id, update_data)
     
-    def delete(self, table_id: int):
-        db_table = self.get_by_id(table_id)
-        if not db_table:
-            return False
-        
-        self.db.delete(db_table)
-        self.db.commit()
-        return True
+    async def delete(self, table_id: int):
+        return await delete_returning(self.db, TablesModel, table_id)
     
-    def get_available_tables(self):
-        return self.db.query(TablesModel).filter(
+    async def get_available_tables(self):
+        result = await self.db.execute(select(TablesModel).where(
             TablesModel.is_available == True,
             TablesModel.status == "available"
-        ).all()
+        ))
+        return result.scalars().all()
     
-    def update_status(self, table_id: int, status: str):
-        db_table = self.get_by_id(table_id)
-        if not db_table:
-            return None
-        
-        db_table.status = status
-        db_table.is_available = (status == "available")
-        self.db.commit()
-        self.db.refresh(db_table)
-        return db_table
\ No newline at end of file
+    async def update_status(self, table_id: int, status: str):
+        return await update_returning(
+            self.db, TablesModel, table_id, {"status": status, "is_available": status == "available"}
+        )
@@ -1,24 +1,36 @@
-from sqlalchemy.orm import Session
+from typing import Optional
+from sqlalchemy import lambda_stmt, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.keyset import paginate
+from app.database.reference_cache import user_cache, cached_lookup, invalidate_on_commit
+from app.database.returning import delete_returning, update_returning
 from app.models.users import User
 from app.schemes.users import UserCreate, UserUpdate
 
 class UserRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
     
-    def get_all(self, skip: int = 0, limit: int = 100):
-        return self.db.query(User).offset(skip).limit(limit).all()
+    async def get_all(self, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+        result = await self.db.execute(paginate(select(User), User.id, skip, limit, after))
+        return result.scalars().all()
     
-    def get_by_id(self, user_id: int):
-        return self.db.query(User).filter(User.id == user_id).first()
+    async def get_by_id(self, user_id: int):
+        statement = lambda_stmt(lambda: select(*User.__table__.columns))
+        statement += lambda s: s.where(User.id == user_id).limit(1)
+        return await cached_lookup(self.db, user_cache, ("id", user_id), User, statement)
     
-    def get_by_username(self, username: str):
-        return self.db.query(User).filter(User.username == username).first()
+    async def get_by_username(self, username: str):
+        statement = lambda_stmt(lambda: select(*User.__table__.columns))
+        statement += lambda s: s.where(User.username == username).limit(1)
+        return await cached_lookup(self.db, user_cache, ("username", username), User, statement)
     
-    def get_by_email(self, email: str):
-        return self.db.query(User).filter(User.email == email).first()
+    async def get_by_email(self, email: str):
+        statement = lambda_stmt(lambda: select(*User.__table__.columns))
+        statement += lambda s: s.where(User.email == email).limit(1)
+        return await cached_lookup(self.db, user_cache, ("email", email), User, statement)
     
-    def create(self, user: UserCreate):
+    async def create(self, user: UserCreate):
         # В реальном приложении здесь нужно хэшировать пароль
         db_user = User(
             username=user.username,
@@ -27,42 +39,28 @@ class UserRepository:
             full_name=user.full_name
         )
         self.db.add(db_user)
-        self.db.commit()
-        self.db.refresh(db_user)
+        await self.db.flush()
         return db_user
     
-    def update(self, user_id: int, user_update: UserUpdate):
-        db_user = self.get_by_id(user_id)
-        if not db_user:
-            return None
-        
+    async def update(self, user_id: int, user_update: UserUpdate):
         update_data = user_update.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            if field == "password" and value:
-                # Хэшировать пароль при обновлении
-                db_user.hashed_password = value  # Внимание: нужно хэшировать!
-            else:
-                setattr(db_user, field, value)
-        
-        self.db.commit()
-        self.db.refresh(db_user)
-        return db_user
+        password = update_data.pop("password", None)
+        if password:
+            # Хэшировать пароль при обновлении
+            update_data["hashed_password"] = password  # Внимание: нужно хэшировать!
+        invalidate_on_commit(self.db, user_cache)
+        return await update_returning(self.db, User, user_id, update_data)
     
-    def delete(self, user_id: int):
-        db_user = self.get_by_id(user_id)
-        if not db_user:
-            return False
-        
-        self.db.delete(db_user)
-        self.db.commit()
-        return True
+    async def delete(self, user_id: int):
+        invalidate_on_commit(self.db, user_cache)
+        return await delete_returning(self.db, User, user_id)
     
-    def authenticate(self, username: str, password: str):
-        user = self.get_by_username(username)
+    async def authenticate(self, username: str, password: str):
+        user = await self.get_by_username(username)
         if not user:
             return None
         
         # В реальном приложении проверять хэшированный пароль
         if user.hashed_password == password:  # Внимание: использовать хэширование!
             return user
-        return None
\ No newline at end of file
+        return None
@@ -1,60 +1,43 @@
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.keyset import paginate
+from app.database.returning import delete_returning, update_returning
 from app.models.waiter import WaiterModel
 from app.schemes.waiter import WaiterCreate, WaiterUpdate
 
 class WaiterRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
     
-    def get_all(self, skip: int = 0, limit: int = 100):
-        return self.db.query(WaiterModel).offset(skip).limit(limit).all()
+    async def get_all(self, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+        result = await self.db.execute(paginate(select(WaiterModel), WaiterModel.id, skip, limit, after))
+        return result.scalars().all()
     
-    def get_by_id(self, waiter_id: int):
-        return self.db.query(WaiterModel).filter(WaiterModel.id == waiter_id).first()
+    async def get_by_id(self, waiter_id: int):
+        return await self.db.get(WaiterModel, waiter_id)
     
-    def get_by_login(self, login: str):
-        return self.db.query(WaiterModel).filter(WaiterModel.login == login).first()
+    async def get_by_login(self, login: str):
+        result = await self.db.execute(select(WaiterModel).where(WaiterModel.login == login))
+        return result.scalars().first()
     
-    def create(self, waiter: WaiterCreate):
+    async def create(self, waiter: WaiterCreate):
         db_waiter = WaiterModel(
             login=waiter.login,
             password=waiter.password,
             role=waiter.role
         )
         self.db.add(db_waiter)
-        self.db.commit()
-        self.db.refresh(db_waiter)
+        await self.db.flush()
         return db_waiter
     
-    def update(self, waiter_id: int, waiter_update: WaiterUpdate):
-        db_waiter = self.get_by_id(waiter_id)
-        if not db_waiter:
-            return None
-        
+    async def update(self, waiter_id: int, waiter_update: WaiterUpdate):
         update_data = waiter_update.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_waiter, field, value)
-        
-        self.db.commit()
-        self.db.refresh(db_waiter)
-        return db_waiter
+        return await update_returning(self.db, WaiterModel, waiter_id, update_data)
     
-    def delete(self, waiter_id: int):
-        db_waiter = self.get_by_id(waiter_id)
-        if not db_waiter:
-            return False
-        
-        self.db.delete(db_waiter)
-        self.db.commit()
-        return True
+    async def delete(self, waiter_id: int):
+        return await delete_returning(self.db, WaiterModel, waiter_id)
     
-    def update_last_login(self, waiter_id: int):
-        db_waiter = self.get_by_id(waiter_id)
-        if not db_waiter:
-            return None
-        
-        from datetime import datetime
-        db_waiter.last_login = datetime.utcnow()
-        self.db.commit()
-        self.db.refresh(db_waiter)
-        return db_waiter
\ No newline at end of file
+    async def update_last_login(self, waiter_id: int):
+        return await update_returning(self.db, WaiterModel, waiter_id, {"last_login": datetime.utcnow()})
@@ -1,22 +1,29 @@
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from typing import Optional
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.keyset import paginate
+from app.database.returning import delete_returning, update_returning, update_where_returning
 from app.models.waiter_statistics import WaiterStatisticsModel
 from app.schemes.waiter_statistics import WaiterStatisticsCreate, WaiterStatisticsUpdate
 
 class WaiterStatisticsRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
     
-    def get_all(self, skip: int = 0, limit: int = 100):
-        return self.db.query(WaiterStatisticsModel).offset(skip).limit(limit).all()
+    async def get_all(self, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+        result = await self.db.execute(paginate(select(WaiterStatisticsModel), WaiterStatisticsModel.id, skip, limit, after))
+        return result.scalars().all()
     
-    def get_by_id(self, stat_id: int):
-        return self.db.query(WaiterStatisticsModel).filter(WaiterStatisticsModel.id == stat_id).first()
+    async def get_by_id(self, stat_id: int):
+        return await self.db.get(WaiterStatisticsModel, stat_id)
     
-    def get_by_waiter(self, waiter_id: int):
-        return self.db.query(WaiterStatisticsModel).filter(WaiterStatisticsModel.waiter_id == waiter_id).first()
+    async def get_by_waiter(self, waiter_id: int):
+        result = await self.db.execute(
+            select(WaiterStatisticsModel).where(WaiterStatisticsModel.waiter_id == waiter_id).limit(1)
+        )
+        return result.scalars().first()
     
-    def create(self, stat: WaiterStatisticsCreate):
+    async def create(self, stat: WaiterStatisticsCreate):
         db_stat = WaiterStatisticsModel(
             waiter_id=stat.waiter_id,
             total_orders=stat.total_orders,
@@ -26,54 +33,57 @@ class WaiterStatisticsRepository:
             hours_worked=stat.hours_worked
         )
         self.db.add(db_stat)
-        self.db.commit()
-        self.db.refresh(db_stat)
+        await self.db.flush()
         return db_stat
     
-    def update(self, stat_id: int, stat_update: WaiterStatisticsUpdate):
-        db_stat = self.get_by_id(stat_id)
-        if not db_stat:
-            return None
-        
+    async def update(self, stat_id: int, stat_update: WaiterStatisticsUpdate):
         update_data = stat_update.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_stat, field, value)
-        
-        self.db.commit()
-        self.db.refresh(db_stat)
-        return db_stat
+        return await update_returning(self.db, WaiterStatisticsModel, stat_id, update_data)
     
-    def delete(self, stat_id: int):
-        db_stat = self.get_by_id(stat_id)
-        if not db_stat:
-            return False
-        
-        self.db.delete(db_stat)
-        self.db.commit()
-        return True
+    async def delete(self, stat_id: int):
+        return await delete_returning(self.db, WaiterStatisticsModel, stat_id)
     
-    def increment_orders(self, waiter_id: int, revenue: float = 0.0, tips: float = 0.0):
-        db_stat = self.get_by_waiter(waiter_id)
-        if not db_stat:
-            return None
-        
-        db_stat.total_orders += 1
-        db_stat.total_revenue += revenue
-        db_stat.tips_amount += tips
-        db_stat.last_updated = func.now()
-        
-        self.db.commit()
-        self.db.refresh(db_stat)
-        return db_stat
+    def _waiter_row(self, waiter_id: int):
+        # Та же строка, что вернёт get_by_waiter, но условием внутри UPDATE
+        return WaiterStatisticsModel.id == (
+            select(WaiterStatisticsModel.id)
+            .where(WaiterStatisticsModel.waiter_id == waiter_id)
+            .order_by(WaiterStatisticsModel.id)
+            .limit(1)
+            .scalar_subquery()
+        )
+    
+    async def increment_orders(self, waiter_id: int, revenue: float = 0.0, tips: float = 0.0):
+        return await self.apply_delta(waiter_id, orders=1, revenue=revenue, tips=tips)
+    
+    async def apply_delta(
+        self,
+        waiter_id: int,
+        orders: int = 0,
+        revenue: float = 0.0,
+        tips: float = 0.0,
+        create_missing: bool = False,
+    ):
+        # Приращение считает SQLite в одном UPDATE ... RETURNING: без чтения
+        # в Python параллельные заказы не затирают друг друга
+        row = await update_where_returning(self.db, WaiterStatisticsModel, self._waiter_row(waiter_id), {
+            "total_orders": WaiterStatisticsModel.total_orders + orders,
+            "total_revenue": WaiterStatisticsModel.total_revenue + revenue,
+            "tips_amount": WaiterStatisticsModel.tips_amount + tips,
+            "last_updated": func.now(),
+        })
+        if row is None and create_missing:
+            # Первое событие по официанту без строки статистики
+            return await self.create(WaiterStatisticsCreate(
+                waiter_id=waiter_id,
+                total_orders=max(0, orders),
+                total_revenue=max(0.0, revenue),
+                tips_amount=max(0.0, tips),
+            ))
+        return row
     
-    def update_hours_worked(self, waiter_id: int, hours: float):
-        db_stat = self.get_by_waiter(waiter_id)
-        if not db_stat:
-            return None
-        
-        db_stat.hours_worked += hours
-        db_stat.last_updated = func.now()
-        
-        self.db.commit()
-        self.db.refresh(db_stat)
-        return db_stat
\ No newline at end of file
+    async def update_hours_worked(self, waiter_id: int, hours: float):
+        return await update_where_returning(self.db, WaiterStatisticsModel, self._waiter_row(waiter_id), {
+            "hours_worked": WaiterStatisticsModel.hours_worked + hours,
+            "last_updated": func.now(),
+        })
@@ -14,6 +14,9 @@ class CookStatisticsUpdate(BaseModel):
 
 class CookStatisticsResponse(CookStatisticsBase):
     id: int
+    completed_orders: int = 0
+    average_cooking_time: float = 0.0
+    last_updated: Optional[datetime] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     
@@ -1,6 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 class MigrationBase(BaseModel):
     version: str
@@ -8,6 +8,8 @@ class MigrationBase(BaseModel):
     sql_content: Optional[str] = None
     status: str = "pending"
     applied_by: Optional[str] = None
+    # Для пакетных миграций данных: sql_content с параметром :batch_size
+    batch_size: Optional[int] = Field(default=None, gt=0)
 
 class MigrationCreate(MigrationBase):
     pass
@@ -18,10 +20,20 @@ class MigrationUpdate(BaseModel):
     sql_content: Optional[str] = None
     status: Optional[str] = None
     applied_by: Optional[str] = None
+    batch_size: Optional[int] = Field(default=None, gt=0)
 
 class MigrationResponse(MigrationBase):
     id: int
     applied_at: Optional[datetime] = None
+    duration_ms: Optional[float] = None
+    rows_affected: Optional[int] = None
+    error: Optional[str] = None
+    batches_done: Optional[int] = None
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class MigrationRunResponse(BaseModel):
+    applied: List[MigrationResponse]
+    failed: Optional[MigrationResponse] = None
+    pending: int
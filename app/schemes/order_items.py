@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 
 class OrderItemBase(BaseModel):
@@ -17,6 +17,32 @@ class OrderItemUpdate(BaseModel):
 
 class OrderItemResponse(OrderItemBase):
     id: int
+    subtotal: Optional[float] = None
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# Пакетные операции: 12 позиций заказа — один запрос и одна транзакция
+MAX_BATCH_SIZE = 500
+
+class OrderItemBatchEntry(OrderItemCreate):
+    quantity: int = Field(gt=0)
+    price: float = Field(ge=0)
+
+class OrderItemBatchCreate(BaseModel):
+    items: list[OrderItemBatchEntry] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+class OrderItemBatchUpdateEntry(OrderItemUpdate):
+    id: int
+    quantity: Optional[int] = Field(default=None, gt=0)
+    price: Optional[float] = Field(default=None, ge=0)
+
+class OrderItemBatchUpdate(BaseModel):
+    items: list[OrderItemBatchUpdateEntry] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+class OrderItemBatchDelete(BaseModel):
+    ids: list[int] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+class OrderItemBatchResponse(BaseModel):
+    ids: list[int]
+    items: list[OrderItemResponse]
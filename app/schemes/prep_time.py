@@ -0,0 +1,14 @@
+from typing import Literal, Optional
+from pydantic import BaseModel
+
+class PrepTimeResponse(BaseModel):
+    """Время готовки в минутах по скетчу; квантили с относительной погрешностью ~2%"""
+    kind: Literal["cook", "dish"]
+    key_id: int
+    samples: int
+    mean: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+    p50: Optional[float] = None
+    p90: Optional[float] = None
+    p99: Optional[float] = None
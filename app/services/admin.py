@@ -1,3 +1,4 @@
+from typing import Optional
 from app.repositories.admin import AdminRepository
 from app.schemes.admin import AdminCreate, AdminUpdate
 
@@ -5,24 +6,24 @@ class AdminService:
     def __init__(self, repository: AdminRepository):
         self.repository = repository
     
-    def get_all_admins(self, skip: int = 0, limit: int = 100):
-        return self.repository.get_all(skip, limit)
+    async def get_all_admins(self, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+        return await self.repository.get_all(skip, limit, after)
     
-    def get_admin_by_id(self, admin_id: int):
-        return self.repository.get_by_id(admin_id)
+    async def get_admin_by_id(self, admin_id: int):
+        return await self.repository.get_by_id(admin_id)
     
-    def create_admin(self, admin_data: AdminCreate):
-        return self.repository.create(admin_data)
+    async def create_admin(self, admin_data: AdminCreate):
+        return await self.repository.create(admin_data)
     
-    def update_admin(self, admin_id: int, admin_data: AdminUpdate):
-        return self.repository.update(admin_id, admin_data)
+    async def update_admin(self, admin_id: int, admin_data: AdminUpdate):
+        return await self.repository.update(admin_id, admin_data)
     
-    def delete_admin(self, admin_id: int):
-        return self.repository.delete(admin_id)
+    async def delete_admin(self, admin_id: int):
+        return await self.repository.delete(admin_id)
     
-    def authenticate(self, login: str, password: str):
-        admin = self.repository.get_by_login(login)
+    async def authenticate(self, login: str, password: str):
+        admin = await self.repository.get_by_login(login)
         if admin and admin.password == password:  # Внимание: использовать хэширование!
-            self.repository.update_last_login(admin.id)
+            await self.repository.update_last_login(admin.id)
             return admin
         return None
\ No newline at end of file
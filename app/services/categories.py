@@ -1,3 +1,4 @@
+from typing import Optional
 from app.repositories.categories import CategoryRepository
 from app.schemes.categories import CategoryCreate, CategoryUpdate
 
@@ -5,17 +6,17 @@ class CategoryService:
     def __init__(self, repository: CategoryRepository):
         self.repository = repository
     
-    def get_all_categories(self, skip: int = 0, limit: int = 100):
-        return self.repository.get_all(skip, limit)
+    async def get_all_categories(self, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+        return await self.repository.get_all(skip, limit, after)
     
-    def get_category_by_id(self, category_id: int):
-        return self.repository.get_by_id(category_id)
+    async def get_category_by_id(self, category_id: int):
+        return await self.repository.get_by_id(category_id)
     
-    def create_category(self, category_data: CategoryCreate):
-        return self.repository.create(category_data)
+    async def create_category(self, category_data: CategoryCreate):
+        return await self.repository.create(category_data)
     
-    def update_category(self, category_id: int, category_data: CategoryUpdate):
-        return self.repository.update(category_id, category_data)
+    async def update_category(self, category_id: int, category_data: CategoryUpdate):
+        return await self.repository.update(category_id, category_data)
     
-    def delete_category(self, category_id: int):
-        return self.repository.delete(category_id)
\ No newline at end of file
+    async def delete_category(self, category_id: int):
+        return await self.repository.delete(category_id)
\ No newline at end of file
@@ -1,27 +1,44 @@
+from typing import Optional
 from app.repositories.cook_statistics import CookStatisticsRepository
+from app.services.order_events import CookDelta
+from app.services.statistics_buffer import StatisticsBuffer
 from app.schemes.cook_statistics import CookStatisticsCreate, CookStatisticsUpdate
 
 class CookStatisticsService:
-    def __init__(self, repository: CookStatisticsRepository):
+    def __init__(self, repository: CookStatisticsRepository, buffer: Optional[StatisticsBuffer] = None):
         self.repository = repository
+        # Незаписанные приращения write-behind буфера накладываются на каждое чтение
+        self.buffer = buffer
     
-    def get_all_statistics(self, skip: int = 0, limit: int = 100):
-        return self.repository.get_all(skip, limit)
+    def _merge(self, row):
+        return self.buffer.merge_cook(row) if self.buffer is not None else row
     
-    def get_statistic_by_id(self, stat_id: int):
-        return self.repository.get_by_id(stat_id)
+    async def get_all_statistics(self, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+        rows = await self.repository.get_all(skip, limit, after)
+        return self.buffer.merge_cooks(rows) if self.buffer is not None else rows
     
-    def get_statistic_by_cook(self, cook_id: int):
-        return self.repository.get_by_cook(cook_id)
+    async def get_statistic_by_id(self, stat_id: int):
+        return self._merge(await self.repository.get_by_id(stat_id))
     
-    def create_statistic(self, stat_data: CookStatisticsCreate):
-        return self.repository.create(stat_data)
+    async def get_statistic_by_cook(self, cook_id: int):
+        return self._merge(await self.repository.get_by_cook(cook_id))
     
-    def update_statistic(self, stat_id: int, stat_data: CookStatisticsUpdate):
-        return self.repository.update(stat_id, stat_data)
+    async def create_statistic(self, stat_data: CookStatisticsCreate):
+        return await self.repository.create(stat_data)
     
-    def delete_statistic(self, stat_id: int):
-        return self.repository.delete(stat_id)
+    async def update_statistic(self, stat_id: int, stat_data: CookStatisticsUpdate):
+        return self._merge(await self.repository.update(stat_id, stat_data))
     
-    def update_cook_active_orders(self, cook_id: int, change: int):
-        return self.repository.update_active_orders(cook_id, change)
\ No newline at end of file
+    async def delete_statistic(self, stat_id: int):
+        return await self.repository.delete(stat_id)
+    
+    async def update_cook_active_orders(self, cook_id: int, change: int):
+        if self.buffer is None:
+            return await self.repository.update_active_orders(cook_id, change)
+        # Счётчики заказов пишет только буфер — ручное приращение идёт туда же,
+        # что и приращения от событий заказов, а не мимо него
+        row = await self.repository.get_by_cook(cook_id)
+        if row is None:
+            return None
+        self.buffer.add_cook(cook_id, CookDelta(active_orders=change))
+        return self._merge(row)
\ No newline at end of file
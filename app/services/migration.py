@@ -1,3 +1,4 @@
+from typing import Optional
 from app.repositories.migration import MigrationRepository
 from app.schemes.migration import MigrationCreate, MigrationUpdate
 
@@ -5,23 +6,26 @@ class MigrationService:
     def __init__(self, repository: MigrationRepository):
         self.repository = repository
     
-    def get_all_migrations(self, skip: int = 0, limit: int = 100):
-        return self.repository.get_all(skip, limit)
+    async def get_all_migrations(self, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+        return await self.repository.get_all(skip, limit, after)
     
-    def get_migration_by_id(self, migration_id: int):
-        return self.repository.get_by_id(migration_id)
+    async def get_migration_by_id(self, migration_id: int):
+        return await self.repository.get_by_id(migration_id)
     
-    def create_migration(self, migration_data: MigrationCreate):
-        return self.repository.create(migration_data)
+    async def get_migration_by_version(self, version: str):
+        return await self.repository.get_by_version(version)
     
-    def update_migration(self, migration_id: int, migration_data: MigrationUpdate):
-        return self.repository.update(migration_id, migration_data)
+    async def create_migration(self, migration_data: MigrationCreate):
+        return await self.repository.create(migration_data)
     
-    def delete_migration(self, migration_id: int):
-        return self.repository.delete(migration_id)
+    async def update_migration(self, migration_id: int, migration_data: MigrationUpdate):
+        return await self.repository.update(migration_id, migration_data)
     
-    def mark_as_success(self, migration_id: int):
-        return self.repository.update_status(migration_id, "success")
+    async def delete_migration(self, migration_id: int):
+        return await self.repository.delete(migration_id)
     
-    def mark_as_failed(self, migration_id: int):
-        return self.repository.update_status(migration_id, "failed")
\ No newline at end of file
+    async def mark_as_success(self, migration_id: int):
+        return await self.repository.update_status(migration_id, "success")
+    
+    async def mark_as_failed(self, migration_id: int):
+        return await self.repository.update_status(migration_id, "failed")
\ No newline at end of file
@@ -1,27 +1,62 @@
+from datetime import datetime
+from typing import Optional
+from app.models.order import normalize_status
 from app.repositories.orders import OrderRepository
 from app.schemes.order import OrderCreate, OrderUpdate
+from app.services.order_events import OrderStatusChanged, order_events
 
 
 class OrderService:
     def __init__(self, repository: OrderRepository):
         self.repository = repository
     
-    def get_all_orders(self, skip: int = 0, limit: int = 100):
+    async def get_all_orders(self, skip: int = 0, limit: int = 100, after: Optional[int] = None):
         """Get all orders with pagination"""
-        return self.repository.get_all(skip=skip, limit=limit)
+        return await self.repository.get_page(skip=skip, limit=limit, after=after)
     
-    def get_order_by_id(self, order_id: int):
+    async def get_order_by_id(self, order_id: int):
         """Get single order by ID"""
-        return self.repository.get_by_id(order_id)
+        return await self.repository.get_by_id(order_id)
     
-    def create_order(self, order_data: OrderCreate):
+    async def create_order(self, order_data: OrderCreate):
         """Create new order"""
-        return self.repository.create(order_data)
+        order = await self.repository.create(order_data)
+        self._emit(order.id, order.waiters_id, order.cook_id, None, order.status, order.total_amount)
+        return order
     
-    def update_order(self, order_id: int, order_data: OrderUpdate):
-        """Update existing order"""
-        return self.repository.update(order_id, order_data)
+    async def update_order(self, order_id: int, order_data: OrderUpdate):
+        """Update existing order; a status transition emits an order event"""
+        order = await self.repository.update(order_id, order_data)
+        if order is not None and order_data.status is not None:
+            old, new = order["previous_status"], order["status"]
+            if normalize_status(old) != normalize_status(new):
+                cooking_minutes = None
+                dish_ids = ()
+                if normalize_status(new) == "ready" and order["cooking_started_at"] is not None:
+                    cooking_minutes = (datetime.utcnow() - order["cooking_started_at"]).total_seconds() / 60
+                    if normalize_status(old) == "cooking":
+                        dish_ids = tuple(await self.repository.get_menu_ids(order_id))
+                self._emit(order["id"], order["waiters_id"], order["cook_id"], old, new,
+                           order["total_amount"], cooking_minutes, dish_ids)
+        return order
     
-    def delete_order(self, order_id: int):
+    async def delete_order(self, order_id: int):
         """Delete order"""
-        return self.repository.delete(order_id)
+        order = await self.repository.delete_row(order_id)
+        if order is None:
+            return False
+        self._emit(order["id"], order["waiters_id"], order["cook_id"], order["status"], None, order["total_amount"])
+        return True
+    
+    def _emit(self, order_id, waiter_id, cook_id, old_status, new_status, total_amount, cooking_minutes=None, dish_ids=()):
+        # Подписчики получат событие только после commit unit of work запроса
+        order_events.publish_on_commit(self.repository.db, OrderStatusChanged(
+            order_id=order_id,
+            waiter_id=waiter_id,
+            cook_id=cook_id,
+            old_status=old_status,
+            new_status=new_status,
+            total_amount=total_amount or 0.0,
+            cooking_minutes=cooking_minutes,
+            dish_ids=dish_ids,
+        ))
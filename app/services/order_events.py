@@ -0,0 +1,173 @@
+# app/services/order_events.py
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.order import normalize_status
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class OrderStatusChanged:
+    """Смена статуса заказа. old_status=None — заказ создан, new_status=None — удалён."""
+
+    order_id: int
+    waiter_id: Optional[int]
+    cook_id: Optional[int]
+    old_status: Optional[str]
+    new_status: Optional[str]
+    total_amount: float = 0.0
+    # Только для перехода cooking -> ready: время готовки и блюда заказа
+    cooking_minutes: Optional[float] = None
+    dish_ids: Tuple[int, ...] = ()
+    occurred_at: datetime = field(default_factory=datetime.utcnow)
+
+
+@dataclass
+class WaiterDelta:
+    total_orders: int = 0
+    total_revenue: float = 0.0
+    tips_amount: float = 0.0
+
+    def __iadd__(self, other: "WaiterDelta") -> "WaiterDelta":
+        self.total_orders += other.total_orders
+        self.total_revenue += other.total_revenue
+        self.tips_amount += other.tips_amount
+        return self
+
+    def __bool__(self) -> bool:
+        return bool(self.total_orders or self.total_revenue or self.tips_amount)
+
+    def apply_to(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Строка статистики с этой дельтой — как её запишет apply_delta()"""
+        return {
+            **row,
+            "total_orders": (row["total_orders"] or 0) + self.total_orders,
+            "total_revenue": (row["total_revenue"] or 0.0) + self.total_revenue,
+            "tips_amount": (row["tips_amount"] or 0.0) + self.tips_amount,
+        }
+
+
+@dataclass
+class CookDelta:
+    active_orders: int = 0
+    completed_orders: int = 0
+    # Сумма минут готовки по completed_orders этой дельты — для среднего
+    cooking_minutes: float = 0.0
+
+    def __iadd__(self, other: "CookDelta") -> "CookDelta":
+        self.active_orders += other.active_orders
+        self.completed_orders += other.completed_orders
+        self.cooking_minutes += other.cooking_minutes
+        return self
+
+    def __bool__(self) -> bool:
+        return bool(self.active_orders or self.completed_orders)
+
+    def apply_to(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Строка статистики с этой дельтой — как её запишет apply_delta()"""
+        merged = {**row, "active_orders": max(0, (row["active_orders"] or 0) + self.active_orders)}
+        if self.completed_orders > 0:
+            done = row["completed_orders"] or 0
+            average = row["average_cooking_time"] or 0.0
+            merged["completed_orders"] = done + self.completed_orders
+            merged["average_cooking_time"] = (average * done + self.cooking_minutes) / (done + self.completed_orders)
+        return merged
+
+
+def _is(status: Optional[str], expected: str) -> int:
+    return 1 if normalize_status(status) == expected else 0
+
+
+def _cooked(e: OrderStatusChanged) -> bool:
+    return bool(_is(e.old_status, "cooking") and _is(e.new_status, "ready") and e.cooking_minutes is not None)
+
+
+def prep_time_samples(events: Iterable[OrderStatusChanged]) -> List[Tuple[str, int, float]]:
+    """Наблюдения времени готовки (kind, key_id, минуты) на повара и на каждое блюдо заказа"""
+    samples = []
+    for e in events:
+        if _cooked(e):
+            if e.cook_id is not None:
+                samples.append(("cook", e.cook_id, e.cooking_minutes))
+            samples.extend(("dish", dish_id, e.cooking_minutes) for dish_id in e.dish_ids)
+    return samples
+
+
+def statistics_deltas(events: Iterable[OrderStatusChanged]) -> Tuple[Dict[int, WaiterDelta], Dict[int, CookDelta]]:
+    """Сворачивает события в приращения статистики по официантам и поварам.
+
+    Счётчики — функции от статуса: active_orders считает заказы в cooking,
+    total_orders/total_revenue — выданные (completed). Поэтому каждое
+    событие даёт разность «стало минус было», и откат статуса назад
+    вычитает ровно то, что было добавлено. Завершённая готовка повара
+    (cooking -> ready) добавляет completed_orders и минуты для среднего.
+    """
+    waiters: Dict[int, WaiterDelta] = {}
+    cooks: Dict[int, CookDelta] = {}
+    for e in events:
+        completed = _is(e.new_status, "completed") - _is(e.old_status, "completed")
+        if e.waiter_id is not None and completed:
+            delta = waiters.setdefault(e.waiter_id, WaiterDelta())
+            delta += WaiterDelta(total_orders=completed, total_revenue=completed * (e.total_amount or 0.0))
+
+        if e.cook_id is not None:
+            active = _is(e.new_status, "cooking") - _is(e.old_status, "cooking")
+            cooked = _cooked(e)
+            if active or cooked:
+                delta = cooks.setdefault(e.cook_id, CookDelta())
+                delta += CookDelta(
+                    active_orders=active,
+                    completed_orders=1 if cooked else 0,
+                    cooking_minutes=e.cooking_minutes if cooked else 0.0,
+                )
+    return waiters, cooks
+
+
+class OrderEventBus:
+    """Внутрипроцессная шина событий заказов.
+
+    Событие уходит подписчикам только после commit транзакции, в которой
+    поменялся заказ: откаченная смена статуса в статистику не попадает.
+    Подписчик вызывается синхронно в потоке event loop и не должен
+    блокировать (StatisticsBuffer только складывает приращения в память).
+    """
+
+    def __init__(self):
+        self._handlers: List[Callable[[OrderStatusChanged], None]] = []
+
+    def subscribe(self, handler: Callable[[OrderStatusChanged], None]) -> None:
+        self._handlers.append(handler)
+
+    def unsubscribe(self, handler: Callable[[OrderStatusChanged], None]) -> None:
+        if handler in self._handlers:
+            self._handlers.remove(handler)
+
+    def publish(self, event: OrderStatusChanged) -> None:
+        for handler in list(self._handlers):
+            try:
+                handler(event)
+            except Exception as e:
+                logger.error(f"❌ Order event handler error: {e}")
+
+    def publish_on_commit(self, session: AsyncSession, event: OrderStatusChanged) -> None:
+        session.sync_session.info.setdefault("order_events", []).append(event)
+
+
+order_events = OrderEventBus()
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_after_commit(session):
+    for pending in session.info.pop("order_events", ()):
+        order_events.publish(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_after_rollback(session):
+    session.info.pop("order_events", None)
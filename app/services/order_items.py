@@ -1,27 +1,47 @@
+from typing import Optional
 from app.repositories.order_items import OrderItemRepository
-from app.schemes.order_items import OrderItemCreate, OrderItemUpdate
+from app.schemes.order_items import (
+    OrderItemBatchCreate,
+    OrderItemBatchDelete,
+    OrderItemBatchUpdate,
+    OrderItemCreate,
+    OrderItemUpdate,
+)
 
 class OrderItemService:
     def __init__(self, repository: OrderItemRepository):
         self.repository = repository
     
-    def get_all_order_items(self, skip: int = 0, limit: int = 100):
-        return self.repository.get_all(skip, limit)
+    async def get_all_order_items(self, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+        return await self.repository.get_page(skip, limit, after)
     
-    def get_order_item_by_id(self, item_id: int):
-        return self.repository.get_by_id(item_id)
+    async def get_order_item_by_id(self, item_id: int):
+        return await self.repository.get_by_id(item_id)
     
-    def create_order_item(self, item_data: OrderItemCreate):
-        return self.repository.create(item_data)
+    async def create_order_item(self, item_data: OrderItemCreate):
+        return await self.repository.create(item_data)
     
-    def update_order_item(self, item_id: int, item_data: OrderItemUpdate):
-        return self.repository.update(item_id, item_data)
+    async def update_order_item(self, item_id: int, item_data: OrderItemUpdate):
+        return await self.repository.update(item_id, item_data)
     
-    def delete_order_item(self, item_id: int):
-        return self.repository.delete(item_id)
+    async def delete_order_item(self, item_id: int):
+        return await self.repository.delete(item_id)
     
-    def get_items_by_order(self, order_id: int):
-        return self.repository.get_by_order(order_id)
+    async def get_items_by_order(self, order_id: int):
+        return await self.repository.get_by_order(order_id)
     
-    def get_items_by_menu(self, menu_id: int):
-        return self.repository.get_by_menu(menu_id)
\ No newline at end of file
+    async def get_items_by_menu(self, menu_id: int):
+        return await self.repository.get_by_menu(menu_id)
+    
+    async def create_order_items(self, batch: OrderItemBatchCreate):
+        return await self.repository.create_many(batch.items)
+    
+    async def update_order_items(self, batch: OrderItemBatchUpdate):
+        updates = [
+            (entry.id, OrderItemUpdate(**entry.model_dump(exclude={"id"}, exclude_unset=True)))
+            for entry in batch.items
+        ]
+        return await self.repository.update_many(updates)
+    
+    async def delete_order_items(self, batch: OrderItemBatchDelete):
+        return await self.repository.delete_many(batch.ids)
@@ -0,0 +1,20 @@
+from typing import Optional
+from app.repositories.prep_time import PrepTimeRepository
+from app.services.statistics_buffer import StatisticsBuffer
+from app.utils.latency_sketch import LatencySketch
+
+class PrepTimeService:
+    def __init__(self, repository: PrepTimeRepository, buffer: Optional[StatisticsBuffer] = None):
+        self.repository = repository
+        # Наблюдения, ещё не записанные write-behind буфером, тоже учитываются
+        self.buffer = buffer
+    
+    async def get_prep_time(self, kind: str, key_id: int):
+        """p50/p90/p99 времени готовки повара или блюда; None — наблюдений нет"""
+        sketch = await self.repository.get_sketch(kind, key_id)
+        pending = self.buffer.pending_prep_time(kind, key_id) if self.buffer is not None else None
+        if pending is not None:
+            sketch = (sketch or LatencySketch()).merge(pending)
+        if sketch is None or not sketch.count:
+            return None
+        return {"kind": kind, "key_id": key_id, **sketch.summary()}
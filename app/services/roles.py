@@ -1,3 +1,4 @@
+from typing import Optional
 from app.repositories.roles import RoleRepository
 from app.schemes.roles import RoleCreate, RoleUpdate
 
@@ -5,17 +6,17 @@ class RoleService:
     def __init__(self, repository: RoleRepository):
         self.repository = repository
     
-    def get_all_roles(self, skip: int = 0, limit: int = 100):
-        return self.repository.get_all(skip, limit)
+    async def get_all_roles(self, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+        return await self.repository.get_all(skip, limit, after)
     
-    def get_role_by_id(self, role_id: int):
-        return self.repository.get_by_id(role_id)
+    async def get_role_by_id(self, role_id: int):
+        return await self.repository.get_by_id(role_id)
     
-    def create_role(self, role_data: RoleCreate):
-        return self.repository.create(role_data)
+    async def create_role(self, role_data: RoleCreate):
+        return await self.repository.create(role_data)
     
-    def update_role(self, role_id: int, role_data: RoleUpdate):
-        return self.repository.update(role_id, role_data)
+    async def update_role(self, role_id: int, role_data: RoleUpdate):
+        return await self.repository.update(role_id, role_data)
     
-    def delete_role(self, role_id: int):
-        return self.repository.delete(role_id)
\ No newline at end of file
+    async def delete_role(self, role_id: int):
+        return await self.repository.delete(role_id)
\ No newline at end of file
@@ -0,0 +1,306 @@
+# app/services/statistics_buffer.py
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.config import settings
+from app.database.db_manager import DBManager
+from app.services.order_events import CookDelta, OrderStatusChanged, WaiterDelta, prep_time_samples, statistics_deltas
+from app.utils.latency_sketch import LatencySketch
+
+logger = logging.getLogger(__name__)
+
+
+def _field(row, key: str):
+    # Строка — ORM-объект (get_*) или dict из UPDATE ... RETURNING (update_*)
+    return row[key] if isinstance(row, Mapping) else getattr(row, key)
+
+
+def _with_delta(row, delta):
+    # Результат того же типа, что и строка без дельты (курсор пагинации,
+    # response_model): dict остаётся dict, ORM-объект — несвязанная с
+    # сессией копия, сам объект сессии не меняется
+    if isinstance(row, Mapping):
+        return delta.apply_to(dict(row))
+    values = {column.key: getattr(row, column.key) for column in row.__table__.columns}
+    return type(row)(**delta.apply_to(values))
+
+
+class StatisticsBuffer:
+    """Write-behind буфер перед WaiterStatisticsRepository и CookStatisticsRepository.
+
+    ``publish()`` (подписчик шины заказов) и ``add_waiter()/add_cook()``
+    только складывают приращения в словари по waiter_id/cook_id — сотня
+    событий по одному официанту остаётся одной дельтой. Фоновая задача
+    пишет накопленное одной транзакцией, по одному атомарному UPDATE на
+    строку (и по одному upsert на скетч времени готовки повара/блюда): через ``flush_interval_ms`` после первой дельты или сразу,
+    как только набралось ``flush_events`` событий. ``stop()`` дописывает
+    остаток при остановке приложения.
+
+    Пока дельта не записана, чтения статистики накладывают её на строку из
+    БД (``merge_waiter``/``merge_cook`` — копия строки той же модели),
+    поэтому читатель не видит отставших цифр. Записанная пачка перестаёт
+    накладываться в момент commit. Неудачная запись возвращает дельты в буфер до
+    следующей попытки.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        flush_interval_ms: int = settings.STATISTICS_FLUSH_INTERVAL_MS,
+        flush_events: int = settings.STATISTICS_FLUSH_EVENTS,
+    ):
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval_ms / 1000
+        self.flush_events = flush_events
+        self._waiters: Dict[int, WaiterDelta] = {}
+        self._cooks: Dict[int, CookDelta] = {}
+        self._sketches: Dict[Tuple[str, int], LatencySketch] = {}
+        self._pending_events = 0
+        self._first_pending_at = 0.0
+        # Дельты, которые пишет текущий flush: до commit читатели видят их здесь
+        self._flushing: Optional[tuple] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self._events = 0
+        self._flushes = 0
+        self._failed_flushes = 0
+        self._last_batch_events = 0
+        self._last_batch_rows = 0
+        self._last_flush_ms = 0.0
+        self._max_flush_ms = 0.0
+        self._last_wait_ms = 0.0
+
+    # ---- приём дельт ----
+
+    def publish(self, event: OrderStatusChanged) -> None:
+        waiters, cooks = statistics_deltas([event])
+        sketches = {}
+        for kind, key_id, minutes in prep_time_samples([event]):
+            sketches.setdefault((kind, key_id), LatencySketch()).add(minutes)
+        self._add(waiters, cooks, sketches)
+
+    def add_waiter(self, waiter_id: int, delta: WaiterDelta) -> None:
+        self._add({waiter_id: delta}, {})
+
+    def add_cook(self, cook_id: int, delta: CookDelta) -> None:
+        self._add({}, {cook_id: delta})
+
+    def add_prep_time(self, kind: str, key_id: int, minutes: float) -> None:
+        sketch = LatencySketch()
+        sketch.add(minutes)
+        self._add({}, {}, {(kind, key_id): sketch})
+
+    def _add(self, waiters: Dict[int, WaiterDelta], cooks: Dict[int, CookDelta], sketches: Optional[Dict] = None) -> None:
+        self._events += 1
+        self._merge_pending(waiters, cooks, sketches or {}, events=1)
+        self._ensure_started().set()
+
+    def _merge_pending(
+        self,
+        waiters: Dict[int, WaiterDelta],
+        cooks: Dict[int, CookDelta],
+        sketches: Dict[Tuple[str, int], LatencySketch],
+        events: int,
+    ) -> None:
+        for waiter_id, delta in waiters.items():
+            self._waiters.setdefault(waiter_id, WaiterDelta()).__iadd__(delta)
+        for cook_id, delta in cooks.items():
+            self._cooks.setdefault(cook_id, CookDelta()).__iadd__(delta)
+        for key, sketch in sketches.items():
+            self._sketches.setdefault(key, LatencySketch()).merge(sketch)
+        if not self._pending_events:
+            self._first_pending_at = time.perf_counter()
+        self._pending_events += events
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Event и Lock привязаны к event loop — в тестах их несколько
+            self._wake = asyncio.Event()
+            self._lock = asyncio.Lock()
+            self._loop = loop
+            self._task = None
+
+    def _ensure_started(self) -> asyncio.Event:
+        self._bind_loop()
+        if self._task is None or self._task.done():
+            self._task = self._loop.create_task(self._run())
+        return self._wake
+
+    # ---- запись ----
+
+    async def _run(self) -> None:
+        while True:
+            if not self._pending_events:
+                await self._wake.wait()
+            self._wake.clear()
+            # Ждём остаток интервала от первой дельты или набора flush_events
+            while self._pending_events < self.flush_events:
+                remaining = self._first_pending_at + self.flush_interval - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    await asyncio.wait_for(self._wake.wait(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                self._wake.clear()
+            if not await self.flush() and self._pending_events:
+                # Запись не удалась: повтор не раньше, чем через интервал
+                await asyncio.sleep(self.flush_interval)
+
+    async def flush(self) -> int:
+        """Пишет всё накопленное одной транзакцией; возвращает число записанных событий"""
+        self._bind_loop()
+        async with self._lock:
+            if not self._pending_events:
+                return 0
+            waiters, cooks, sketches, events = self._waiters, self._cooks, self._sketches, self._pending_events
+            self._last_wait_ms = round((time.perf_counter() - self._first_pending_at) * 1000, 2)
+            self._waiters, self._cooks, self._sketches, self._pending_events = {}, {}, {}, 0
+            self._flushing = (waiters, cooks, sketches)
+
+            started = time.perf_counter()
+            try:
+                await self._write(waiters, cooks, sketches)
+            except Exception as e:
+                self._failed_flushes += 1
+                logger.error(f"❌ Statistics flush of {events} events failed, will retry: {e}")
+                self._merge_pending(waiters, cooks, sketches, events)
+                return 0
+            finally:
+                self._flushing = None
+
+            elapsed = round((time.perf_counter() - started) * 1000, 2)
+            self._flushes += 1
+            self._last_batch_events = events
+            self._last_batch_rows = len(waiters) + len(cooks) + len(sketches)
+            self._last_flush_ms = elapsed
+            self._max_flush_ms = max(self._max_flush_ms, elapsed)
+            return events
+
+    async def _write(
+        self,
+        waiters: Dict[int, WaiterDelta],
+        cooks: Dict[int, CookDelta],
+        sketches: Dict[Tuple[str, int], LatencySketch],
+    ) -> None:
+        async with DBManager(self.session_factory) as db:
+            # Строки в одном порядке: параллельные писатели не ждут друг друга по кругу
+            for waiter_id, delta in sorted(waiters.items()):
+                if delta:
+                    await db.waiter_statistics.apply_delta(
+                        waiter_id,
+                        orders=delta.total_orders,
+                        revenue=delta.total_revenue,
+                        tips=delta.tips_amount,
+                        create_missing=True,
+                    )
+            for cook_id, delta in sorted(cooks.items()):
+                if delta:
+                    await db.cook_statistics.apply_delta(
+                        cook_id,
+                        active=delta.active_orders,
+                        completed=delta.completed_orders,
+                        cooking_minutes=delta.cooking_minutes,
+                        create_missing=True,
+                    )
+            for (kind, key_id), sketch in sorted(sketches.items()):
+                await db.prep_time.merge_sketch(kind, key_id, sketch)
+            await db.commit()
+            # Пачка уже видна в БД: без await после commit, иначе читатель
+            # успеет сложить её и с БД, и с _flushing (закрытие сессии ждёт)
+            self._flushing = None
+
+    async def stop(self) -> None:
+        """Останавливает фоновую задачу и дописывает остаток буфера"""
+        self._bind_loop()
+        if self._task is not None:
+            # Под блокировкой задача не посреди flush: отмена не оборвёт commit
+            async with self._lock:
+                self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        if self._pending_events:
+            logger.error(f"❌ {self._pending_events} statistics events were not written on shutdown")
+
+    # ---- чтение ----
+
+    def _pending(self, key: int, pending: Dict, flushing_index: int, total):
+        parts = [pending.get(key)]
+        if self._flushing is not None:
+            parts.append(self._flushing[flushing_index].get(key))
+        for part in parts:
+            if part is not None:
+                total += part
+        return total if total else None
+
+    def pending_prep_time(self, kind: str, key_id: int) -> Optional[LatencySketch]:
+        """Ещё не записанные наблюдения времени готовки повара/блюда (копия)"""
+        parts = [self._sketches.get((kind, key_id))]
+        if self._flushing is not None:
+            parts.append(self._flushing[2].get((kind, key_id)))
+        parts = [part for part in parts if part is not None]
+        if not parts:
+            return None
+        pending = LatencySketch()
+        for part in parts:
+            pending.merge(part)
+        return pending
+
+    def merge_waiter(self, row):
+        """Строка статистики официанта с ещё не записанными приращениями"""
+        if row is None:
+            return None
+        delta = self._pending(_field(row, "waiter_id"), self._waiters, 0, WaiterDelta())
+        return _with_delta(row, delta) if delta else row
+
+    def merge_cook(self, row):
+        """Строка статистики повара с ещё не записанными приращениями"""
+        if row is None:
+            return None
+        delta = self._pending(_field(row, "cook_id"), self._cooks, 1, CookDelta())
+        return _with_delta(row, delta) if delta else row
+
+    def merge_waiters(self, rows: List) -> List:
+        return self._merge_rows(rows, "waiter_id", self.merge_waiter)
+
+    def merge_cooks(self, rows: List) -> List:
+        return self._merge_rows(rows, "cook_id", self.merge_cook)
+
+    @staticmethod
+    def _merge_rows(rows: List, key: str, merge) -> List:
+        # Дельта одна на человека — накладываем её на первую его строку
+        seen = set()
+        merged = []
+        for row in rows:
+            owner = _field(row, key)
+            merged.append(row if owner in seen else merge(row))
+            seen.add(owner)
+        return merged
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "events": self._events,
+            "flushes": self._flushes,
+            "failed_flushes": self._failed_flushes,
+            "pending_events": self._pending_events,
+            "pending_rows": len(self._waiters) + len(self._cooks) + len(self._sketches),
+            "last_batch_events": self._last_batch_events,
+            "last_batch_rows": self._last_batch_rows,
+            "last_wait_ms": self._last_wait_ms,
+            "last_flush_ms": self._last_flush_ms,
+            "max_flush_ms": self._max_flush_ms,
+            "flush_interval_ms": round(self.flush_interval * 1000),
+            "flush_events": self.flush_events,
+        }
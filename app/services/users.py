@@ -1,50 +1,36 @@
-from sqlalchemy.orm import Session
-from app.models.users import User
+from typing import Optional
+from app.repositories.users import UserRepository
+from app.schemes.users import UserCreate, UserUpdate
 
 class UserService:
-    def __init__(self, db: Session):
-        self.db = db
-    
-    def get_user_by_username(self, username: str):
-        return self.db.query(User).filter(User.username == username).first()
-    
-    def get_user_by_id(self, user_id: int):
-        return self.db.query(User).filter(User.id == user_id).first()
-    
-    def get_user_by_email(self, email: str):
-        return self.db.query(User).filter(User.email == email).first()
-    
-    def create_user(self, user_data):
-        db_user = User(
-            username=getattr(user_data, 'username', 'user'),
-            email=getattr(user_data, 'email', 'user@example.com'),
-            hashed_password=getattr(user_data, 'hashed_password', 'password'),
-            full_name=getattr(user_data, 'full_name', ''),
-            is_active=True,
-            is_superuser=False
-        )
-        self.db.add(db_user)
-        self.db.commit()
-        self.db.refresh(db_user)
-        return db_user
-    
-    def update_user(self, user_id: int, user_data):
-        user = self.get_user_by_id(user_id)
-        if not user:
+    def __init__(self, repository: UserRepository):
+        self.repository = repository
+    
+    async def get_all_users(self, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+        return await self.repository.get_all(skip, limit, after)
+    
+    async def get_user_by_username(self, username: str):
+        return await self.repository.get_by_username(username)
+    
+    async def get_user_by_id(self, user_id: int):
+        return await self.repository.get_by_id(user_id)
+    
+    async def get_user_by_email(self, email: str):
+        return await self.repository.get_by_email(email)
+    
+    async def create_user(self, user_data: UserCreate):
+        # Логин и email уникальны: при совпадении роутер отвечает 400
+        if await self.repository.get_by_username(user_data.username):
             return None
-        
-        for key, value in vars(user_data).items():
-            if not key.startswith('_') and hasattr(user, key):
-                setattr(user, key, value)
-        
-        self.db.commit()
-        self.db.refresh(user)
-        return user
-    
-    def delete_user(self, user_id: int):
-        user = self.get_user_by_id(user_id)
-        if user:
-            self.db.delete(user)
-            self.db.commit()
-            return True
-        return False
+        if await self.repository.get_by_email(user_data.email):
+            return None
+        return await self.repository.create(user_data)
+    
+    async def update_user(self, user_id: int, user_data: UserUpdate):
+        return await self.repository.update(user_id, user_data)
+    
+    async def delete_user(self, user_id: int):
+        return await self.repository.delete(user_id)
+    
+    async def authenticate(self, username: str, password: str):
+        return await self.repository.authenticate(username, password)
@@ -1,30 +1,48 @@
+from typing import Optional
 from app.repositories.waiter_statistics import WaiterStatisticsRepository
+from app.services.order_events import WaiterDelta
+from app.services.statistics_buffer import StatisticsBuffer
 from app.schemes.waiter_statistics import WaiterStatisticsCreate, WaiterStatisticsUpdate
 
 class WaiterStatisticsService:
-    def __init__(self, repository: WaiterStatisticsRepository):
+    def __init__(self, repository: WaiterStatisticsRepository, buffer: Optional[StatisticsBuffer] = None):
         self.repository = repository
+        # Незаписанные приращения write-behind буфера накладываются на каждое чтение
+        self.buffer = buffer
     
-    def get_all_statistics(self, skip: int = 0, limit: int = 100):
-        return self.repository.get_all(skip, limit)
+    def _merge(self, row):
+        return self.buffer.merge_waiter(row) if self.buffer is not None else row
     
-    def get_statistic_by_id(self, stat_id: int):
-        return self.repository.get_by_id(stat_id)
+    async def get_all_statistics(self, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+        rows = await self.repository.get_all(skip, limit, after)
+        return self.buffer.merge_waiters(rows) if self.buffer is not None else rows
     
-    def get_statistic_by_waiter(self, waiter_id: int):
-        return self.repository.get_by_waiter(waiter_id)
+    async def get_statistic_by_id(self, stat_id: int):
+        return self._merge(await self.repository.get_by_id(stat_id))
     
-    def create_statistic(self, stat_data: WaiterStatisticsCreate):
-        return self.repository.create(stat_data)
+    async def get_statistic_by_waiter(self, waiter_id: int):
+        return self._merge(await self.repository.get_by_waiter(waiter_id))
     
-    def update_statistic(self, stat_id: int, stat_data: WaiterStatisticsUpdate):
-        return self.repository.update(stat_id, stat_data)
+    async def create_statistic(self, stat_data: WaiterStatisticsCreate):
+        return await self.repository.create(stat_data)
     
-    def delete_statistic(self, stat_id: int):
-        return self.repository.delete(stat_id)
+    async def update_statistic(self, stat_id: int, stat_data: WaiterStatisticsUpdate):
+        return self._merge(await self.repository.update(stat_id, stat_data))
     
-    def add_order_to_statistic(self, waiter_id: int, revenue: float = 0.0, tips: float = 0.0):
-        return self.repository.increment_orders(waiter_id, revenue, tips)
+    async def delete_statistic(self, stat_id: int):
+        return await self.repository.delete(stat_id)
     
-    def update_waiter_hours(self, waiter_id: int, hours: float):
-        return self.repository.update_hours_worked(waiter_id, hours)
\ No newline at end of file
+    async def add_order_to_statistic(self, waiter_id: int, revenue: float = 0.0, tips: float = 0.0):
+        if self.buffer is None:
+            return await self.repository.increment_orders(waiter_id, revenue, tips)
+        # Счётчики заказов пишет только буфер — ручное приращение идёт туда же,
+        # что и приращения от событий заказов, а не мимо него
+        row = await self.repository.get_by_waiter(waiter_id)
+        if row is None:
+            return None
+        self.buffer.add_waiter(waiter_id, WaiterDelta(total_orders=1, total_revenue=revenue, tips_amount=tips))
+        return self._merge(row)
+    
+    async def update_waiter_hours(self, waiter_id: int, hours: float):
+        # hours_worked буфер не ведёт: пишем сразу
+        return self._merge(await self.repository.update_hours_worked(waiter_id, hours))
\ No newline at end of file
@@ -0,0 +1,144 @@
+# app/utils/latency_sketch.py
+import math
+import struct
+from typing import Dict, Iterator, Optional, Tuple
+
+# Относительная погрешность квантилей: p90 = 20 мин значит 20 ± 0.4 мин
+RELATIVE_ACCURACY = 0.02
+# Меньше — в нулевую корзину (минуты: ~0.06 с)
+MIN_VALUE = 1e-3
+
+_FORMAT_VERSION = 1
+_HEADER = struct.Struct("<BQQddd")
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class LatencySketch:
+    """Потоковая оценка квантилей с логарифмическими корзинами (как DDSketch).
+
+    Значение v попадает в корзину ceil(log_gamma(v)); у всех значений
+    корзины одна и та же относительная погрешность RELATIVE_ACCURACY,
+    поэтому хвост (p99) оценивается так же точно, как медиана. Память —
+    число непустых корзин (сотня с небольшим на диапазон от секунд до
+    часов), а не число наблюдений. Скетчи складываются без потери
+    точности (``merge``), поэтому приращения можно копить отдельно и
+    сливать с сохранённым. ``to_bytes`` — заголовок и пары
+    (шаг индекса, счётчик) в varint: обычно несколько сотен байт.
+    """
+
+    __slots__ = ("bins", "count", "zero_count", "total", "min", "max")
+
+    gamma = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+    _log_gamma = math.log(gamma)
+
+    def __init__(self):
+        self.bins: Dict[int, int] = {}
+        self.count = 0
+        self.zero_count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float, count: int = 1) -> None:
+        value = max(0.0, float(value))
+        if value < MIN_VALUE:
+            self.zero_count += count
+        else:
+            index = math.ceil(math.log(value) / self._log_gamma)
+            self.bins[index] = self.bins.get(index, 0) + count
+        self.count += count
+        self.total += value * count
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "LatencySketch") -> "LatencySketch":
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+        self.count += other.count
+        self.zero_count += other.zero_count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def _bin_value(self, index: int) -> float:
+        # Середина корзины (gamma^(i-1), gamma^i] в смысле относительной погрешности
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return self.min
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if rank < seen:
+                return min(max(self._bin_value(index), self.min), self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        if not self.count:
+            return {"samples": 0, "mean": None, "min": None, "max": None, "p50": None, "p90": None, "p99": None}
+        return {
+            "samples": self.count,
+            "mean": self.total / self.count,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+        }
+
+    def _deltas(self) -> Iterator[Tuple[int, int]]:
+        previous = 0
+        for index in sorted(self.bins):
+            # zigzag: индексы корзин меньше 1 минуты отрицательные
+            step = index - previous
+            yield (step << 1) ^ (step >> 63), self.bins[index]
+            previous = index
+
+    def to_bytes(self) -> bytes:
+        out = bytearray(_HEADER.pack(
+            _FORMAT_VERSION, self.count, self.zero_count, self.total,
+            self.min if self.count else 0.0, self.max if self.count else 0.0,
+        ))
+        for step, count in self._deltas():
+            _write_varint(out, step)
+            _write_varint(out, count)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "LatencySketch":
+        version, count, zero_count, total, low, high = _HEADER.unpack_from(data)
+        if version != _FORMAT_VERSION:
+            raise ValueError(f"Неизвестная версия скетча: {version}")
+        sketch = cls()
+        sketch.count, sketch.zero_count, sketch.total = count, zero_count, total
+        if count:
+            sketch.min, sketch.max = low, high
+        pos, index = _HEADER.size, 0
+        while pos < len(data):
+            step, pos = _read_varint(data, pos)
+            bin_count, pos = _read_varint(data, pos)
+            index += (step >> 1) ^ -(step & 1)
+            sketch.bins[index] = bin_count
+        return sketch
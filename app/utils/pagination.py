@@ -0,0 +1,50 @@
+# app/utils/pagination.py
+import base64
+import binascii
+import json
+from typing import Sequence
+
+from fastapi import Response
+
+from app.utils.responses import FastJSONResponse
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(last_id: int) -> str:
+    """Непрозрачный курсор ?after= для строки, на которой закончилась страница"""
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    """id из курсора; ValueError, если курсор испорчен"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        last_id = json.loads(raw)["id"]
+    except (binascii.Error, ValueError, TypeError, KeyError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    if not isinstance(last_id, int) or isinstance(last_id, bool):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return last_id
+
+
+def set_next_cursor(response: Response, items: Sequence, limit: int) -> None:
+    """Курсор следующей страницы в заголовке, если текущая заполнена целиком.
+
+    Тело ответа остаётся списком, как и до появления курсоров.
+    """
+    if limit > 0 and len(items) >= limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(items[-1].id)
+
+
+def page_response(items: Sequence, limit: int) -> FastJSONResponse:
+    """Страница списка готовым ответом вместе с курсором.
+
+    Ответ-Response FastAPI отдаёт как есть: строки из ``get_page`` уже в
+    форме response_model, и повторная валидация не нужна. response_model
+    у маршрута остаётся для OpenAPI.
+    """
+    response = FastJSONResponse(items)
+    set_next_cursor(response, items, limit)
+    return response
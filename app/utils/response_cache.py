@@ -0,0 +1,95 @@
+# app/utils/response_cache.py
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, NamedTuple, Optional
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: str
+
+
+class ResponseCache:
+    """Кэш готовых JSON-ответов в памяти процесса.
+
+    Ключ — путь маршрута и объявленные параметры, от которых зависит ответ
+    (не сырая строка запроса: ``?x=1..N`` не плодит записи). Записей не
+    больше ``max_entries``, лишние вытесняются по LRU. Записи маршрута
+    сбрасываются через ``invalidate(path)`` после записи в БД. У каждого
+    маршрута есть поколение: ответ, собранный до сброса, в кэш уже не
+    попадёт.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+        self._not_modified = 0
+        self._evictions = 0
+
+    @staticmethod
+    def make_key(path: str, params: Iterable = ()) -> str:
+        return f"{path}?{'&'.join(f'{k}={v}' for k, v in sorted(params))}"
+
+    @staticmethod
+    def make_etag(body: bytes) -> str:
+        # Сильный ETag: зависит только от байтов ответа
+        return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._entries.move_to_end(key)
+            return entry
+
+    def generation(self, path: str) -> int:
+        with self._lock:
+            return self._generations.get(path, 0)
+
+    def set(self, key: str, path: str, body: bytes, generation: int) -> CachedResponse:
+        """Сохраняет ответ, если маршрут не сбрасывался с момента ``generation``"""
+        entry = CachedResponse(body, self.make_etag(body))
+        with self._lock:
+            if self._generations.get(path, 0) == generation:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._evictions += 1
+        return entry
+
+    def record_not_modified(self) -> None:
+        with self._lock:
+            self._not_modified += 1
+
+    def invalidate(self, *paths: str) -> None:
+        with self._lock:
+            for path in paths:
+                self._generations[path] = self._generations.get(path, 0) + 1
+                prefix = f"{path}?"
+                for key in [key for key in self._entries if key.startswith(prefix)]:
+                    del self._entries[key]
+            self._invalidations += 1
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "evictions": self._evictions,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+                "not_modified": self._not_modified,
+                "invalidations": self._invalidations,
+            }
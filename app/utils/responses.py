@@ -0,0 +1,39 @@
+# app/utils/responses.py
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+# Ключи-не-строки (например, int) допустимы, как и у стандартного json
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    # Pydantic-модель сериализуется своим rust-сериализатором сразу в JSON,
+    # без промежуточного dict; orjson вставляет готовые байты как есть
+    if isinstance(obj, BaseModel):
+        return orjson.Fragment(obj.__pydantic_serializer__.to_json(obj))
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def json_dumps(content: Any) -> bytes:
+    """JSON в байтах через orjson: datetime, date, UUID, dataclass и pydantic-модели"""
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """Ответ по умолчанию для main.py и роутеров app/api на базе orjson.
+
+    FastAPI прогоняет через jsonable_encoder всё, что обработчик вернул без
+    response_model. Большие списки лучше возвращать как
+    ``FastJSONResponse(data)``: тогда данные сериализуются один раз, сразу в
+    байты.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return json_dumps(content)
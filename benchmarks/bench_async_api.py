@@ -0,0 +1,170 @@
+# benchmarks/bench_async_api.py
+"""Пропускная способность роутеров app/api: AsyncSession против sync def в threadpool.
+
+Запуск: python benchmarks/bench_async_api.py [--concurrency 16,64,256] [--seconds 5]
+
+Для каждого режима поднимается отдельный процесс uvicorn (один воркер) на
+временной БД с тестовыми заказами:
+- async — роутер app/api/order.py как есть (AsyncSession + aiosqlite);
+- sync  — те же маршруты в старом виде: ``def``-обработчики на синхронной
+  Session из app/database/database.py, каждый занимает слот threadpool
+  Starlette (по умолчанию 40) на всё время запроса.
+Нагрузка — смесь GET /orders/, GET /orders/{id} и POST /orders/ с заданным
+числом одновременных клиентов.
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SEED_ORDERS = 500
+
+
+def async_app():
+    from fastapi import FastAPI
+    from app.api import order
+
+    app = FastAPI()
+    app.include_router(order.router)
+    return app
+
+
+def sync_app():
+    from fastapi import Depends, FastAPI, HTTPException
+    from sqlalchemy import select
+    from sqlalchemy.orm import Session
+    from app.database.database import get_db
+    from app.models.order import OrderModel
+    from app.schemes.order import OrderCreate, OrderResponse
+
+    app = FastAPI()
+
+    @app.get("/orders/", response_model=list[OrderResponse])
+    def get_orders(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+        return db.execute(select(OrderModel).offset(skip).limit(limit)).scalars().all()
+
+    @app.get("/orders/{order_id}", response_model=OrderResponse)
+    def get_order(order_id: int, db: Session = Depends(get_db)):
+        db_order = db.get(OrderModel, order_id)
+        if not db_order:
+            raise HTTPException(status_code=404, detail="Order not found")
+        return db_order
+
+    @app.post("/orders/", response_model=OrderResponse, status_code=201)
+    def create_order(order: OrderCreate, db: Session = Depends(get_db)):
+        db_order = OrderModel(**order.model_dump())
+        db.add(db_order)
+        db.commit()
+        db.refresh(db_order)
+        return db_order
+
+    return app
+
+
+def seed_database(path):
+    env = dict(os.environ, SQLITE_PATH=path)
+    script = (
+        "from app.database.database import init_db, SessionLocal\n"
+        "from app.models.order import OrderModel\n"
+        "init_db()\n"
+        "db = SessionLocal()\n"
+        f"db.add_all([OrderModel(table_id=i % 20 + 1, waiters_id=i % 5 + 1) for i in range({SEED_ORDERS})])\n"
+        "db.commit()\n"
+    )
+    subprocess.run([sys.executable, "-c", script], cwd=ROOT, env=env, check=True, stdout=subprocess.DEVNULL)
+
+
+def start_server(factory, path, port):
+    env = dict(os.environ, SQLITE_PATH=path, SQL_SLOW_QUERY_MS="100000")
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", f"bench_async_api:{factory}", "--factory",
+            "--app-dir", os.path.join(ROOT, "benchmarks"), "--port", str(port), "--log-level", "warning",
+        ],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    for _ in range(100):
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/orders/1")
+            return server
+        except httpx.TransportError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError("server did not start")
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _client_loop(client, stop_at, latencies, errors):
+    rng = random.Random()
+    while time.perf_counter() < stop_at:
+        roll = rng.random()
+        started = time.perf_counter()
+        try:
+            if roll < 0.5:
+                response = await client.get(f"/orders/{rng.randint(1, SEED_ORDERS)}")
+            elif roll < 0.8:
+                response = await client.get("/orders/", params={"skip": rng.randint(0, SEED_ORDERS - 20), "limit": 20})
+            else:
+                response = await client.post("/orders/", json={"table_id": rng.randint(1, 20), "waiters_id": 1})
+            if response.status_code >= 400:
+                errors.append(response.status_code)
+        except httpx.HTTPError as e:
+            errors.append(type(e).__name__)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+
+async def run_load(base_url, concurrency, seconds):
+    latencies, errors = [], []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        stop_at = time.perf_counter() + seconds
+        await asyncio.gather(*[_client_loop(client, stop_at, latencies, errors) for _ in range(concurrency)])
+    return latencies, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", default="16,64,256")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+    levels = [int(level) for level in args.concurrency.split(",")]
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    print(f"{'mode':<6} {'clients':>7} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for factory in ("sync_app", "async_app"):
+        path = os.path.join(tempfile.mkdtemp(), "bench.db")
+        seed_database(path)
+        server = start_server(factory, path, args.port)
+        try:
+            for concurrency in levels:
+                latencies, errors = asyncio.run(run_load(base_url, concurrency, args.seconds))
+                print(
+                    f"{factory[:-4]:<6} {concurrency:>7} {len(latencies) / args.seconds:>9.0f} "
+                    f"{statistics.median(latencies):>9.2f} {percentile(latencies, 99):>9.2f} {len(errors):>7}"
+                )
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
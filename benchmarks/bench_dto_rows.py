@@ -0,0 +1,171 @@
+# benchmarks/bench_dto_rows.py
+"""Списки app/api: ORM + response_model против get_page() (строки-кортежи в __slots__).
+
+Запуск: python benchmarks/bench_dto_rows.py [--rows 10000] [--repeat 5]
+
+Временная БД создаётся по ORM-схеме app/models. Для каждой таблицы списка
+(orders, dishes, tables, order_items) страница читается двумя путями:
+- orm: repository.get_all() -> валидация по response_model (from_attributes)
+  -> dict -> JSON, как FastAPI делает для обработчика с response_model;
+- dto: repository.get_page() -> JSON готовым ответом (page_response).
+
+Печатается CPU на строку (time.process_time, включая поток aiosqlite),
+память, которую удерживает страница, и пик памяти на строку (tracemalloc).
+"""
+import argparse
+import asyncio
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+
+from app.database.database import Base  # noqa: E402
+from app.models.dishes import DishesModel  # noqa: E402
+from app.models.order import OrderModel  # noqa: E402
+from app.models.order_items import OrderItemsModel  # noqa: E402
+from app.models.tables import TablesModel  # noqa: E402
+from app.repositories.dishes import DishRepository  # noqa: E402
+from app.repositories.order_items import OrderItemRepository  # noqa: E402
+from app.repositories.orders import OrderRepository  # noqa: E402
+from app.repositories.tables import TableRepository  # noqa: E402
+from app.schemes.dishes import DishResponse  # noqa: E402
+from app.schemes.order import OrderResponse  # noqa: E402
+from app.schemes.order_items import OrderItemResponse  # noqa: E402
+from app.schemes.tables import TableResponse  # noqa: E402
+from app.utils.responses import json_dumps  # noqa: E402
+
+CASES = [
+    ("orders", OrderRepository, OrderResponse),
+    ("dishes", DishRepository, DishResponse),
+    ("tables", TableRepository, TableResponse),
+    ("order_items", OrderItemRepository, OrderItemResponse),
+]
+
+SEED = {
+    "orders": (
+        "INSERT INTO orders (table_id, waiters_id, cook_id, status, total_amount) VALUES (?, ?, ?, ?, ?)",
+        lambda i: (i % 20 + 1, i % 5 + 1, i % 3 or None, "created", float(i % 5000)),
+    ),
+    "dishes": (
+        "INSERT INTO dishes (name, description, price, category_id, admin_id, is_available, cooking_time) VALUES (?, ?, ?, ?, ?, 1, 15)",
+        lambda i: (f"Блюдо {i}", "Описание блюда" if i % 2 else None, 100.0 + i % 900, i % 10 + 1, 1),
+    ),
+    "tables": (
+        "INSERT INTO tables (table_number, status, capacity, location, is_available, created_at) VALUES (?, ?, ?, ?, 1, CURRENT_TIMESTAMP)",
+        lambda i: (i, "available", i % 6 + 2, "зал" if i % 2 else "терраса"),
+    ),
+    "order_items": (
+        "INSERT INTO order_items (order_id, menu_id, quantity, price, subtotal) VALUES (?, ?, ?, ?, ?)",
+        lambda i: (i // 3 + 1, i % 50 + 1, i % 3 + 1, 150.0, 150.0 * (i % 3 + 1)),
+    ),
+}
+
+
+def build_database(path, count):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(
+        engine,
+        tables=[OrderModel.__table__, DishesModel.__table__, TablesModel.__table__, OrderItemsModel.__table__],
+    )
+    engine.dispose()
+
+    conn = sqlite3.connect(path)
+    for sql, make_row in SEED.values():
+        conn.executemany(sql, [make_row(i) for i in range(1, count + 1)])
+    conn.commit()
+    conn.close()
+
+
+def orm_path(schema):
+    adapter = TypeAdapter(list[schema])
+
+    async def load(repository, limit):
+        items = await repository.get_all(limit=limit)
+        return items, lambda: json_dumps(adapter.dump_python(adapter.validate_python(items, from_attributes=True), mode="json"))
+    return load
+
+
+async def dto_load(repository, limit):
+    items = await repository.get_page(limit=limit)
+    return items, lambda: json_dumps(items)
+
+
+async def measure_cpu(engine, repository_type, load, limit, repeat):
+    timings = []
+    for _ in range(repeat):
+        async with AsyncSession(engine) as session:
+            started = time.process_time()
+            items, render = await load(repository_type(session), limit)
+            body = render()
+            timings.append(time.process_time() - started)
+    assert len(items) == limit, len(items)
+    return statistics.median(timings), body
+
+
+async def measure_memory(engine, repository_type, load, limit):
+    async with AsyncSession(engine) as session:
+        repository = repository_type(session)
+        await load(repository, 1)
+        session.expunge_all()
+
+        tracemalloc.start()
+        items, render = await load(repository, limit)
+        # Что удерживает страница до сериализации: объекты строк + identity map
+        retained, _ = tracemalloc.get_traced_memory()
+        render()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return retained, peak
+
+
+async def run(path, limit, repeat):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    results = []
+    try:
+        for name, repository_type, schema in CASES:
+            row = {"name": name}
+            bodies = {}
+            for label, load in (("orm", orm_path(schema)), ("dto", dto_load)):
+                cpu, bodies[label] = await measure_cpu(engine, repository_type, load, limit, repeat)
+                retained, peak = await measure_memory(engine, repository_type, load, limit)
+                row[label] = (cpu / limit, retained / limit, peak / limit)
+            assert bodies["orm"] == bodies["dto"], f"{name}: ответы различаются"
+            results.append(row)
+    finally:
+        await engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "dto.db")
+    build_database(path, args.rows)
+    print(f"{args.rows} rows per table, page of {args.rows} rows, median of {args.repeat}")
+
+    results = asyncio.run(run(path, args.rows, args.repeat))
+
+    print(f"\n{'table':<12} {'path':<4} {'CPU us/row':>11} {'kept B/row':>11} {'peak B/row':>11}")
+    for row in results:
+        for label in ("orm", "dto"):
+            cpu, retained, peak = row[label]
+            print(f"{row['name']:<12} {label:<4} {cpu * 1e6:>11.2f} {retained:>11.0f} {peak:>11.0f}")
+        orm, dto = row["orm"], row["dto"]
+        print(f"{'':<12} {'x':<4} {orm[0] / dto[0]:>10.1f}x {orm[1] / dto[1]:>10.1f}x {orm[2] / dto[2]:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# benchmarks/bench_event_loop.py
+"""p99 латентность /api/health при интенсивной записи в /api/orders/.
+
+Запуск: python benchmarks/bench_event_loop.py [--writers 16] [--seconds 5]
+
+Сервер поднимается отдельным процессом uvicorn (один воркер) на временной БД.
+Нагрузка на запись идёт из отдельного процесса, health-check опрашивается из
+текущего. Если обработчики блокируют event loop синхронными запросами к
+SQLite, p99 health-check растёт вместе с нагрузкой на запись.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def probe_health(base_url, seconds):
+    latencies = []
+    stop_at = time.perf_counter() + seconds
+    with httpx.Client(base_url=base_url) as client:
+        while time.perf_counter() < stop_at:
+            started = time.perf_counter()
+            client.get("/api/health")
+            latencies.append((time.perf_counter() - started) * 1000)
+            time.sleep(0.01)
+    return latencies
+
+
+async def _write_orders(client, stop_at):
+    written = 0
+    while time.perf_counter() < stop_at:
+        await client.post("/api/orders/", json={"table_id": 1, "dishes": ["Борщ"], "total_amount": 350})
+        written += 1
+    return written
+
+
+def write_load(base_url, writers, seconds, result):
+    async def run():
+        limits = httpx.Limits(max_connections=writers)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+            stop_at = time.perf_counter() + seconds
+            counts = await asyncio.gather(*[_write_orders(client, stop_at) for _ in range(writers)])
+        result.value = sum(counts)
+
+    asyncio.run(run())
+
+
+def report(label, latencies, written):
+    print(
+        f"{label:<12} health p50={statistics.median(latencies):7.2f}ms "
+        f"p99={percentile(latencies, 99):7.2f}ms samples={len(latencies):5d} orders={written}"
+    )
+
+
+def start_server(port):
+    env = dict(os.environ, APP_ENV="dev", SQLITE_PATH=os.path.join(tempfile.mkdtemp(), "bench.db"))
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    for _ in range(100):
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/api/health")
+            return server
+        except httpx.TransportError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError("server did not start")
+
+
+def main(args):
+    base_url = f"http://127.0.0.1:{args.port}"
+    report("idle", probe_health(base_url, args.seconds), 0)
+
+    written = multiprocessing.Value("i", 0)
+    load = multiprocessing.Process(target=write_load, args=(base_url, args.writers, args.seconds + 1, written))
+    load.start()
+    time.sleep(0.5)
+    latencies = probe_health(base_url, args.seconds)
+    load.join()
+    report(f"{args.writers} writers", latencies, written.value)
+    print("pool:", httpx.get(f"{base_url}/api/diagnostics/pool").json())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--writers", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    server = start_server(args.port)
+    try:
+        main(args)
+    finally:
+        server.terminate()
+        server.wait()
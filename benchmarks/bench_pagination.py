@@ -0,0 +1,100 @@
+# benchmarks/bench_pagination.py
+"""Глубокие страницы GET /orders/: OFFSET против keyset (?after=) на 1M заказов.
+
+Запуск: python benchmarks/bench_pagination.py [--orders 1000000] [--limit 100] [--repeat 5]
+
+Временная БД создаётся по ORM-схеме app/models, заказы вставляются пачками.
+Страницы читает OrderRepository.get_all через AsyncSession/aiosqlite на
+разной глубине: через skip (OFFSET) и через after (WHERE id > ? ORDER BY id).
+"""
+import argparse
+import asyncio
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+
+from app.database.database import Base  # noqa: E402
+from app.models.order import OrderModel  # noqa: E402,F401
+from app.repositories.orders import OrderRepository  # noqa: E402
+
+STATUSES = ("Создан", "Готовится", "Готов", "Выдан")
+
+
+def build_database(path, count):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine, tables=[OrderModel.__table__])
+    engine.dispose()
+
+    conn = sqlite3.connect(path)
+    batch = 50000
+    for start in range(1, count + 1, batch):
+        rows = [
+            (i % 20 + 1, i % 5 + 1, i % 3 + 1, STATUSES[i % len(STATUSES)], float(i % 5000))
+            for i in range(start, min(start + batch, count + 1))
+        ]
+        conn.executemany(
+            "INSERT INTO orders (table_id, waiters_id, cook_id, status, total_amount) VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
+    conn.commit()
+    conn.close()
+
+
+async def measure(path, depths, limit, repeat):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    results = []
+    try:
+        async with AsyncSession(engine) as session:
+            repository = OrderRepository(session)
+            for depth in depths:
+                timings = {"offset": [], "keyset": []}
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    by_offset = await repository.get_all(skip=depth, limit=limit)
+                    timings["offset"].append(time.perf_counter() - started)
+
+                    started = time.perf_counter()
+                    # ids идут подряд с 1: страница после строки depth начинается с id depth + 1
+                    by_keyset = await repository.get_all(limit=limit, after=depth)
+                    timings["keyset"].append(time.perf_counter() - started)
+
+                    session.expunge_all()
+                assert [o.id for o in by_offset] == [o.id for o in by_keyset]
+                results.append((depth, statistics.median(timings["offset"]), statistics.median(timings["keyset"])))
+    finally:
+        await engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "pagination.db")
+    started = time.perf_counter()
+    build_database(path, args.orders)
+    print(f"{args.orders} orders inserted in {time.perf_counter() - started:.1f} s, page size {args.limit}")
+
+    depths = [0, 10_000, 100_000, args.orders // 2, args.orders - args.limit]
+    depths = sorted({d for d in depths if 0 <= d <= args.orders - args.limit})
+    results = asyncio.run(measure(path, depths, args.limit, args.repeat))
+
+    print(f"\n{'depth':>9} {'OFFSET ms':>11} {'keyset ms':>11} {'speedup':>9}")
+    for depth, offset, keyset in results:
+        print(f"{depth:>9} {offset * 1000:>11.2f} {keyset * 1000:>11.2f} {offset / keyset:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# benchmarks/bench_serialization.py
+"""Пропускная способность сериализации ответа на 10k заказов.
+
+Запуск: python benchmarks/bench_serialization.py [--orders 10000] [--repeat 20]
+
+Сравниваются путь FastAPI по умолчанию (jsonable_encoder + JSONResponse на
+stdlib json) и FastJSONResponse (orjson) на двух видах данных:
+- dict-заказы в формате GET /api/orders/ из main.py;
+- pydantic-модели OrderResponse (то, что отдают роутеры app/api).
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.schemes.order import OrderResponse  # noqa: E402
+from app.utils.responses import FastJSONResponse  # noqa: E402
+
+DISHES = [('Борщ', 350.0), ('Стейк', 1200.0), ('Салат', 450.0), ('Кофе', 150.0), ('Чай', 100.0)]
+
+
+def make_dict_orders(count):
+    started = datetime(2025, 1, 1, 12, 0)
+    orders = []
+    for order_id in range(1, count + 1):
+        items = []
+        for offset in range(3):
+            name, price = DISHES[(order_id + offset) % len(DISHES)]
+            quantity = 1 + (order_id + offset) % 3
+            items.append({
+                'menu_id': (order_id + offset) % len(DISHES) + 1,
+                'name': name,
+                'quantity': quantity,
+                'price': price,
+                'subtotal': price * quantity,
+            })
+        orders.append({
+            'id': order_id,
+            'table_id': order_id % 20 + 1,
+            'waiter_id': order_id % 5 + 1,
+            'status': 'pending',
+            'total_amount': sum(item['subtotal'] for item in items),
+            'dishes': [item['name'] for item in items for _ in range(item['quantity'])],
+            'items': items,
+            'created_at': started + timedelta(minutes=order_id),
+        })
+    return orders
+
+
+def make_model_orders(count):
+    started = datetime(2025, 1, 1, 12, 0)
+    return [
+        OrderResponse(
+            id=order_id,
+            table_id=order_id % 20 + 1,
+            cook_id=order_id % 3 + 1,
+            waiters_id=order_id % 5 + 1,
+            status="Создан",
+            created_at=started + timedelta(minutes=order_id),
+        )
+        for order_id in range(1, count + 1)
+    ]
+
+
+def default_path(payload):
+    # Что делает FastAPI для обработчика без response_model
+    return JSONResponse(jsonable_encoder(payload)).body
+
+
+def fast_path(payload):
+    return FastJSONResponse(payload).body
+
+
+def measure(fn, payload, repeat):
+    timings = []
+    size = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        size = len(fn(payload))
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    payloads = {
+        "dict orders": make_dict_orders(args.orders),
+        "OrderResponse models": make_model_orders(args.orders),
+    }
+
+    print(f"{args.orders} orders, median of {args.repeat} runs")
+    for label, payload in payloads.items():
+        baseline, size = measure(default_path, payload, args.repeat)
+        fast, fast_size = measure(fast_path, payload, args.repeat)
+        print(f"\n{label}")
+        print(f"  jsonable_encoder + json : {baseline * 1000:8.2f} ms  {size / baseline / 2**20:7.1f} MiB/s")
+        print(f"  FastJSONResponse (orjson): {fast * 1000:8.2f} ms  {fast_size / fast / 2**20:7.1f} MiB/s")
+        print(f"  speedup                 : {baseline / fast:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
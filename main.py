@@ -1,16 +1,31 @@
 # main.py - Restaurant Management System API
+import asyncio
 import logging
 from datetime import datetime
 from fastapi import FastAPI, Request, Depends, HTTPException, status, Body
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
 import uvicorn
 from typing import Optional, List
-import json
-import os
-import sqlite3
+import time
+from collections import Counter
+
+from app.config import settings
+from app.database.pool import SQLitePool
+from app.database.database import engine as orm_engine
+from app.database.bootstrap import bootstrap_database, legacy_dish_names
+from app.database.counters import check_counters, read_user_counters
+from app.database.partial_update import update_row
+from app.database.pragmas import read_sqlite_pragmas, sqlite_pragma_profile
+from app.database.reference_cache import reference_cache_stats
+from app.database.rollups import aggregate_rollups, read_rollups
+from app.dependencies import get_engine_pool_stats, statistics_buffer
+from app.database.sql_logging import slow_query_log, statement_cache_stats
+from app.utils.response_cache import ResponseCache
+from app.utils.responses import FastJSONResponse, json_dumps
 
 # Настройка логирования
 logging.basicConfig(
@@ -27,7 +42,8 @@ app = FastAPI(
     docs_url="/api/docs",
     redoc_url="/api/redoc",
     openapi_url="/api/openapi.json",
-    redirect_slashes=False
+    redirect_slashes=False,
+    default_response_class=FastJSONResponse
 )
 
 # Настройка CORS
@@ -47,186 +63,202 @@ templates = Jinja2Templates(directory="app/templates")
 
 # ==================== DATABASE HELPERS ====================
 
-def get_db():
-    """Получение подключения к БД"""
-    db_path = "restaurant.db"
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    return conn
+# Пул подключений к БД: используется через `with db_pool.connection() as conn`
+db_pool = SQLitePool(
+    settings.SQLITE_PATH,
+    size=settings.DB_POOL_SIZE,
+    timeout=settings.DB_POOL_TIMEOUT,
+)
 
-def init_database():
-    """Инициализация БД с полной переиспись"""
-    db_path = "restaurant.db"
-    
-    # Удаляем старую БД
-    if os.path.exists(db_path):
-        try:
-            os.remove(db_path)
-            logger.info("🗑️  Old database removed")
-        except:
-            pass
-    
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
-    # Таблица пользователей (Users/Employees)
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT UNIQUE NOT NULL,
-            password TEXT NOT NULL,
-            name TEXT NOT NULL,
-            role TEXT NOT NULL CHECK(role IN ('waiter', 'chef', 'admin')),
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # Таблица блюд
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS dishes (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            price REAL NOT NULL,
-            category TEXT NOT NULL,
-            cooking_time INTEGER DEFAULT 15,
-            description TEXT,
-            available INTEGER DEFAULT 1,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # Таблица столов
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS tables (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            table_number INTEGER UNIQUE NOT NULL,
-            capacity INTEGER NOT NULL,
-            location TEXT NOT NULL,
-            status TEXT NOT NULL CHECK(status IN ('free', 'occupied', 'reserved')) DEFAULT 'free',
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # Таблица заказов
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS orders (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            table_id INTEGER NOT NULL,
-            waiter_id INTEGER NOT NULL,
-            status TEXT NOT NULL CHECK(status IN ('pending', 'cooking', 'ready', 'completed')) DEFAULT 'pending',
-            total_amount REAL DEFAULT 0,
-            dishes TEXT DEFAULT '[]',
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY(table_id) REFERENCES tables(id),
-            FOREIGN KEY(waiter_id) REFERENCES users(id)
-        )
-    ''')
-    
-    logger.info("✅ Database tables created")
-    
-    # Вставляем тестовых пользователей
-    test_users = [
-        ('ofikNum1', '123321', 'Официант 1', 'waiter'),
-        ('adminNum1', '123321', 'Администратор', 'admin'),
-        ('povarNum1', '123321', 'Повар 1', 'chef'),
-    ]
-    
-    for user in test_users:
-        try:
-            cursor.execute(
-                'INSERT INTO users (username, password, name, role) VALUES (?, ?, ?, ?)',
-                user
-            )
-        except:
-            pass
-    
-    logger.info("✅ Test users inserted")
-    
-    # Вставляем тестовые блюда
-    test_dishes = [
-        ('Борщ', 350, 'Основное', 20, 'Классический украинский борщ', 1),
-        ('Стейк', 1200, 'Основное', 25, 'Мраморная говядина на гриле', 1),
-        ('Салат', 450, 'Основное', 15, 'Свежий овощной салат', 1),
-        ('Кофе', 150, 'Напитки', 5, 'Крепкий эспрессо', 1),
-        ('Чизкейк', 300, 'Десерт', 10, 'Нью-йоркский чизкейк', 1),
-        ('Пицца', 650, 'Основное', 30, 'Пицца Маргарита', 1),
-        ('Чай', 100, 'Напитки', 5, 'Черный чай', 1),
-        ('Тирамису', 350, 'Десерт', 10, 'Итальянский десерт', 1),
-    ]
-    
-    for dish in test_dishes:
-        try:
-            cursor.execute(
-                'INSERT INTO dishes (name, price, category, cooking_time, description, available) VALUES (?, ?, ?, ?, ?, ?)',
-                dish
-            )
-        except:
-            pass
-    
-    logger.info("✅ Test dishes inserted")
-    
-    # Вставляем тестовые столы
-    test_tables = [
-        (1, 4, 'У окна', 'free'),
-        (2, 6, 'Центр', 'occupied'),
-        (3, 2, 'Бар', 'free'),
-        (4, 8, 'VIP', 'reserved'),
-        (5, 4, 'Терраса', 'free'),
-        (6, 4, 'У окна', 'occupied'),
-        (7, 2, 'Бар', 'free'),
-        (8, 6, 'Центр', 'free'),
-    ]
-    
-    for table in test_tables:
-        try:
-            cursor.execute(
-                'INSERT INTO tables (table_number, capacity, location, status) VALUES (?, ?, ?, ?)',
-                table
-            )
-        except:
-            pass
-    
-    logger.info("✅ Test tables inserted")
-    
-    # Вставляем тестовые заказы
-    test_orders = [
-        (2, 1, 'pending', 1200, json.dumps(['Борщ', 'Чай'])),
-        (4, 1, 'cooking', 800, json.dumps(['Стейк'])),
-        (1, 1, 'ready', 450, json.dumps(['Салат'])),
+# Read-only пул (mode=ro, query_only) для GET-обработчиков: читатели не ждут
+# подключений писателей и не могут ничего записать
+read_pool = SQLitePool(
+    settings.SQLITE_PATH,
+    size=settings.DB_READ_POOL_SIZE,
+    timeout=settings.DB_POOL_TIMEOUT,
+    read_only=True,
+)
+
+# Колонки, которые PUT-обработчики возвращают после обновления (без пароля)
+DISH_COLUMNS = ('id', 'name', 'price', 'category', 'cooking_time', 'description', 'available', 'updated_at')
+ORDER_COLUMNS = ('id', 'table_id', 'waiter_id', 'cook_id', 'status', 'total_amount', 'updated_at')
+EMPLOYEE_COLUMNS = ('id', 'username', 'name', 'role', 'updated_at')
+
+def positive_int(value, field):
+    """Целое > 0 из тела запроса; иначе 400, а не 500 из int()"""
+    if isinstance(value, bool):
+        raise HTTPException(status_code=400, detail=f"{field} должно быть целым числом")
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail=f"{field} должно быть целым числом")
+    if number <= 0:
+        raise HTTPException(status_code=400, detail=f"{field} должно быть больше нуля")
+    return number
+
+def resolve_order_lines(conn, dishes):
+    """Превращает список блюд заказа в строки order_items.
+
+    Элемент списка — название блюда (так присылает фронтенд) или
+    {"menu_id": ..., "quantity": ...}. Одинаковые блюда схлопываются в одну
+    строку с количеством. Возвращает [(menu_id, quantity, price, subtotal)].
+    Неверный элемент — HTTPException 400.
+    """
+    if not isinstance(dishes, list):
+        raise HTTPException(status_code=400, detail="dishes должно быть списком блюд")
+    quantities = Counter()
+    names = Counter()
+    for entry in dishes:
+        if isinstance(entry, dict):
+            if 'menu_id' not in entry:
+                raise HTTPException(status_code=400, detail="В позиции заказа нет menu_id")
+            menu_id = positive_int(entry['menu_id'], 'menu_id')
+            quantities[menu_id] += positive_int(entry.get('quantity', 1), 'quantity')
+        elif isinstance(entry, str):
+            names[entry] += 1
+        else:
+            raise HTTPException(status_code=400, detail="Блюдо заказа — название или {menu_id, quantity}")
+
+    prices = {}
+    if names:
+        placeholders = ', '.join('?' * len(names))
+        rows = conn.execute(
+            f'SELECT id, name, price FROM dishes WHERE name IN ({placeholders}) ORDER BY available, id DESC',
+            list(names)
+        ).fetchall()
+        by_name = {row[1]: (row[0], row[2]) for row in rows}
+        missing = [name for name in names if name not in by_name]
+        if missing:
+            raise HTTPException(status_code=400, detail=f"Блюда не найдены в меню: {', '.join(missing)}")
+        for name, quantity in names.items():
+            dish_id, price = by_name[name]
+            quantities[dish_id] += quantity
+            prices[dish_id] = price
+
+    unpriced = [dish_id for dish_id in quantities if dish_id not in prices]
+    if unpriced:
+        placeholders = ', '.join('?' * len(unpriced))
+        rows = conn.execute(f'SELECT id, price FROM dishes WHERE id IN ({placeholders})', unpriced).fetchall()
+        prices.update((row[0], row[1]) for row in rows)
+        missing = [str(dish_id) for dish_id in unpriced if dish_id not in prices]
+        if missing:
+            raise HTTPException(status_code=400, detail=f"Блюда не найдены в меню: {', '.join(missing)}")
+
+    return [
+        (dish_id, quantity, prices[dish_id], prices[dish_id] * quantity)
+        for dish_id, quantity in quantities.items()
     ]
-    
-    for order in test_orders:
-        try:
-            cursor.execute(
-                'INSERT INTO orders (table_id, waiter_id, status, total_amount, dishes) VALUES (?, ?, ?, ?, ?)',
-                order
-            )
-        except:
-            pass
-    
-    logger.info("✅ Test orders inserted")
-    
-    conn.commit()
-    conn.close()
-    logger.info('✅ Database fully initialized')
+
+def insert_order_lines(conn, order_id, lines):
+    """Записывает строки заказа в order_items одним executemany"""
+    conn.executemany(
+        'INSERT INTO order_items (order_id, menu_id, quantity, price, subtotal) VALUES (?, ?, ?, ?, ?)',
+        [(order_id, *line) for line in lines]
+    )
+
+# Кэш ответов для редко меняющихся списков (меню, столы)
+response_cache = ResponseCache()
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]
+
+async def cached_json_response(request: Request, load, params: Optional[dict] = None):
+    """Отдаёт JSON из кэша ответов с ETag; 304, если клиент прислал тот же ETag.
+
+    ``load`` — функция ``conn -> данные``, выполняется в read-only пуле БД
+    только при промахе кэша. ``params`` — объявленные параметры маршрута,
+    от которых зависит ``load``; остальная строка запроса в ключ не входит.
+    """
+    path = request.url.path
+    key = ResponseCache.make_key(path, (params or {}).items())
+    entry = response_cache.get(key)
+    if entry is None:
+        generation = response_cache.generation(path)
+        data = await read_pool.run(load)
+        body = json_dumps(data)
+        entry = response_cache.set(key, path, body, generation)
+
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        response_cache.record_not_modified()
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
 
 # ==================== STARTUP ====================
 
 @app.on_event("startup")
 def startup_event():
     """Инициализация приложения при старте"""
+    started = time.perf_counter()
     try:
-        init_database()
-        logger.info("✅ Database ready")
+        with db_pool.connection() as conn:
+            bootstrap_database(conn, seed=settings.APP_ENV == "dev")
+        logger.info(f"✅ Database ready in {(time.perf_counter() - started) * 1000:.1f} ms")
         logger.info("🚀 Restaurant Management System started")
         logger.info("📍 Access at http://127.0.0.1:8000")
     except Exception as e:
         logger.error(f"❌ Startup error: {e}")
 
+# Фоновая сверка счётчиков дашборда (stat_counters) с исходными таблицами
+counters_check_task: Optional[asyncio.Task] = None
+
+async def counters_check_loop(interval: int):
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await db_pool.run(lambda conn: check_counters(conn, repair=True))
+        except Exception as e:
+            logger.error(f"❌ Stat counters check error: {e}")
+
+@app.on_event("startup")
+async def start_counters_check():
+    global counters_check_task
+    if settings.STAT_COUNTERS_CHECK_INTERVAL > 0:
+        counters_check_task = asyncio.create_task(counters_check_loop(settings.STAT_COUNTERS_CHECK_INTERVAL))
+
+# Фоновый агрегатор почасовых и дневных сводок заказов (order_rollups)
+rollups_task: Optional[asyncio.Task] = None
+last_rollup_report: Optional[dict] = None
+
+async def run_rollups():
+    global last_rollup_report
+    last_rollup_report = await db_pool.run(
+        lambda conn: aggregate_rollups(conn, batch_hours=settings.ROLLUP_BATCH_HOURS)
+    )
+    return last_rollup_report
+
+async def rollups_loop(interval: int):
+    while True:
+        try:
+            await run_rollups()
+        except Exception as e:
+            logger.error(f"❌ Order rollups error: {e}")
+        await asyncio.sleep(interval)
+
+@app.on_event("startup")
+async def start_rollups():
+    global rollups_task
+    if settings.ROLLUP_INTERVAL > 0:
+        rollups_task = asyncio.create_task(rollups_loop(settings.ROLLUP_INTERVAL))
+
+@app.on_event("shutdown")
+def shutdown_event():
+    """Закрытие подключений к БД при остановке"""
+    if counters_check_task is not None:
+        counters_check_task.cancel()
+    if rollups_task is not None:
+        rollups_task.cancel()
+    db_pool.close()
+    read_pool.close()
+    slow_query_log.close()
+
+@app.on_event("shutdown")
+async def flush_statistics_buffer():
+    """Дописать накопленные приращения статистики app/api до остановки"""
+    await statistics_buffer.stop()
+
 # ==================== FRONTEND ROUTES ====================
 
 @app.get("/", response_class=HTMLResponse)
@@ -259,6 +291,74 @@ def health_check():
     """Проверка здоровья API"""
     return {"status": "healthy", "timestamp": datetime.utcnow().isoformat()}
 
+@app.get("/api/diagnostics/pool")
+def get_pool_stats():
+    """Статистика пулов подключений к БД: пишущих и read-only, sqlite3 и app/api"""
+    return {
+        "sqlite3": {"writer": db_pool.stats(), "reader": read_pool.stats()},
+        "sqlalchemy": get_engine_pool_stats(),
+    }
+
+@app.get("/api/diagnostics/cache")
+def get_cache_stats():
+    """Счётчики кэша ответов (попадания, промахи, 304)"""
+    return response_cache.stats()
+
+@app.get("/api/diagnostics/reference-cache")
+def get_reference_cache_stats():
+    """Кэши справочников app/api и кэш скомпилированных SQL-выражений: доли попаданий"""
+    return {"caches": reference_cache_stats(), "statements": statement_cache_stats.stats()}
+
+@app.get("/api/diagnostics/statistics")
+def get_statistics_buffer_stats():
+    """Write-behind буфер статистики app/api: размер пачек, задержка и время записи"""
+    return statistics_buffer.stats()
+
+@app.get("/api/diagnostics/slow-queries")
+def get_slow_queries(limit: int = 50):
+    """Последние медленные SQL-запросы SQLAlchemy (порог SQL_SLOW_QUERY_MS)"""
+    return {"stats": slow_query_log.stats(), "queries": slow_query_log.entries(limit)}
+
+@app.delete("/api/diagnostics/slow-queries")
+def clear_slow_queries():
+    """Очистить журнал медленных запросов в памяти"""
+    slow_query_log.clear()
+    return {"success": True}
+
+@app.get("/api/diagnostics/sqlite")
+async def get_sqlite_diagnostics():
+    """Настроенные и фактические PRAGMA для sqlite3 и SQLAlchemy"""
+    def engine_pragmas():
+        with orm_engine.connect() as connection:
+            return read_sqlite_pragmas(connection.connection.dbapi_connection)
+
+    return {
+        "configured": sqlite_pragma_profile(),
+        "sqlite3": await db_pool.run(read_sqlite_pragmas),
+        "sqlite3_read_only": await read_pool.run(read_sqlite_pragmas),
+        "sqlalchemy": await run_in_threadpool(engine_pragmas),
+    }
+
+@app.get("/api/diagnostics/counters")
+async def get_counters_check():
+    """Сверка счётчиков дашборда с исходными таблицами (без исправления)"""
+    return await read_pool.run(check_counters)
+
+@app.post("/api/diagnostics/counters/rebuild")
+async def rebuild_stat_counters():
+    """Сверка счётчиков дашборда и пересборка при расхождении"""
+    return await db_pool.run(lambda conn: check_counters(conn, repair=True))
+
+@app.get("/api/diagnostics/rollups")
+def get_rollups_report():
+    """Последний проход агрегатора сводок: водяной знак, пересчитанные часы, время"""
+    return {"interval": settings.ROLLUP_INTERVAL, "last_run": last_rollup_report}
+
+@app.post("/api/diagnostics/rollups/run")
+async def run_rollups_now():
+    """Внеочередной проход агрегатора сводок"""
+    return await run_rollups()
+
 @app.get("/api/config")
 async def get_config():
     """Получение конфигурации для фронтенда"""
@@ -274,11 +374,11 @@ async def get_config():
 async def login_for_access_token(username: str, password: str):
     """Вход в систему"""
     try:
-        conn = get_db()
-        cursor = conn.cursor()
-        cursor.execute('SELECT id, username, name, role FROM users WHERE username = ? AND password = ?', (username, password))
-        user = cursor.fetchone()
-        conn.close()
+        def query(conn):
+            cursor = conn.cursor()
+            cursor.execute('SELECT id, username, name, role FROM users WHERE username = ? AND password = ?', (username, password))
+            return cursor.fetchone()
+        user = await db_pool.run(query)
         
         if user:
             return {
@@ -308,58 +408,61 @@ async def login_for_access_token(username: str, password: str):
 async def get_user_stats(user_id: int):
     """Статистика пользователя"""
     try:
-        conn = get_db()
-        cursor = conn.cursor()
-        
-        # Всего заказов
-        cursor.execute('SELECT COUNT(*) FROM orders WHERE waiter_id = ?', (user_id,))
-        total_orders = cursor.fetchone()[0]
-        
-        # Активные заказы
-        cursor.execute('SELECT COUNT(*) FROM orders WHERE waiter_id = ? AND status IN ("pending", "cooking")', (user_id,))
-        active_orders = cursor.fetchone()[0]
-        
-        # Занято столов
-        cursor.execute('SELECT COUNT(*) FROM tables WHERE status = "occupied"')
-        occupied_tables = cursor.fetchone()[0]
-        
-        # Всего сотрудников
-        cursor.execute('SELECT COUNT(*) FROM users')
-        total_employees = cursor.fetchone()[0]
-        
-        conn.close()
-        
-        return {
-            "user_id": user_id,
-            "total_orders": total_orders,
-            "active_orders": active_orders,
-            "occupied_tables": occupied_tables,
-            "total_employees": total_employees
-        }
+        # Счётчики поддерживаются триггерами — одно чтение по первичному ключу
+        counters = await read_pool.run(lambda conn: read_user_counters(conn, user_id))
+        return {"user_id": user_id, **counters}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Stats error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# ==================== REPORTS ENDPOINTS ====================
+
+@app.get("/api/reports/{dimension}")
+async def get_rollup_report(
+    dimension: str,
+    grain: str = "hour",
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    key_id: Optional[int] = None,
+):
+    """Выручка и заказы по часам/дням на официанта, повара, блюдо или стол.
+
+    Читает только order_rollups, поэтому время ответа не зависит от
+    размера истории заказов. Даты — ISO 8601 в UTC, диапазон [start, end).
+    """
+    try:
+        report = await read_pool.run(lambda conn: read_rollups(conn, dimension, grain, start, end, key_id))
+        return FastJSONResponse(report)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Rollup report error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 # ==================== DISHES ENDPOINTS ====================
 
 @app.get("/api/dishes/")
-async def get_dishes():
+async def get_dishes(request: Request):
     """Получить все блюда"""
     try:
-        conn = get_db()
-        cursor = conn.cursor()
-        cursor.execute('SELECT id, name, price, category, cooking_time FROM dishes WHERE available = 1')
-        dishes = []
-        for row in cursor.fetchall():
-            dishes.append({
-                'id': row[0],
-                'name': row[1],
-                'price': row[2],
-                'category': row[3],
-                'cooking_time': row[4]
-            })
-        conn.close()
-        return dishes
+        def query(conn):
+            cursor = conn.cursor()
+            cursor.execute('SELECT id, name, price, category, cooking_time FROM dishes WHERE available = 1')
+            dishes = []
+            for row in cursor.fetchall():
+                dishes.append({
+                    'id': row[0],
+                    'name': row[1],
+                    'price': row[2],
+                    'category': row[3],
+                    'cooking_time': row[4]
+                })
+            return dishes
+        return await cached_json_response(request, query)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Get dishes error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -368,17 +471,20 @@ async def get_dishes():
 async def create_dish(name: str, price: float, category: str, cooking_time: int = 15, description: str = ""):
     """Создать новое блюдо"""
     try:
-        conn = get_db()
-        cursor = conn.cursor()
-        cursor.execute(
-            'INSERT INTO dishes (name, price, category, cooking_time, description, available) VALUES (?, ?, ?, ?, ?, 1)',
-            (name, price, category, cooking_time, description)
-        )
-        conn.commit()
-        dish_id = cursor.lastrowid
-        conn.close()
+        def query(conn):
+            cursor = conn.cursor()
+            cursor.execute(
+                'INSERT INTO dishes (name, price, category, cooking_time, description, available) VALUES (?, ?, ?, ?, ?, 1)',
+                (name, price, category, cooking_time, description)
+            )
+            conn.commit()
+            return cursor.lastrowid
+        dish_id = await db_pool.run(query)
+        response_cache.invalidate("/api/dishes/")
         logger.info(f"✅ Dish created: {name} (ID: {dish_id})")
         return {"id": dish_id, "name": name, "price": price, "category": category}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Create dish error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -387,22 +493,25 @@ async def create_dish(name: str, price: float, category: str, cooking_time: int
 async def update_dish(dish_id: int, name: str = None, price: float = None, category: str = None, cooking_time: int = None):
     """Обновить блюдо"""
     try:
-        conn = get_db()
-        cursor = conn.cursor()
-        
-        if name:
-            cursor.execute('UPDATE dishes SET name = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?', (name, dish_id))
-        if price is not None:
-            cursor.execute('UPDATE dishes SET price = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?', (price, dish_id))
-        if category:
-            cursor.execute('UPDATE dishes SET category = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?', (category, dish_id))
-        if cooking_time is not None:
-            cursor.execute('UPDATE dishes SET cooking_time = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?', (cooking_time, dish_id))
-        
-        conn.commit()
-        conn.close()
+        fields = {
+            'name': name or None,
+            'price': price,
+            'category': category or None,
+            'cooking_time': cooking_time,
+        }
+
+        def query(conn):
+            dish = update_row(conn, 'dishes', dish_id, fields, DISH_COLUMNS)
+            conn.commit()
+            return dish
+        dish = await db_pool.run(query)
+        response_cache.invalidate("/api/dishes/")
+        if dish is None:
+            raise HTTPException(status_code=404, detail="Блюдо не найдено")
         logger.info(f"✅ Dish updated: ID {dish_id}")
-        return {"success": True, "dish_id": dish_id}
+        return {"success": True, "dish_id": dish_id, "dish": dish}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Update dish error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -411,13 +520,16 @@ async def update_dish(dish_id: int, name: str = None, price: float = None, categ
 async def delete_dish(dish_id: int):
     """Удалить блюдо"""
     try:
-        conn = get_db()
-        cursor = conn.cursor()
-        cursor.execute('UPDATE dishes SET available = 0, updated_at = CURRENT_TIMESTAMP WHERE id = ?', (dish_id,))
-        conn.commit()
-        conn.close()
+        def query(conn):
+            cursor = conn.cursor()
+            cursor.execute('UPDATE dishes SET available = 0, updated_at = CURRENT_TIMESTAMP WHERE id = ?', (dish_id,))
+            conn.commit()
+        await db_pool.run(query)
+        response_cache.invalidate("/api/dishes/")
         logger.info(f"✅ Dish deleted: ID {dish_id}")
         return {"success": True}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Delete dish error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -425,24 +537,26 @@ async def delete_dish(dish_id: int):
 # ==================== TABLES ENDPOINTS ====================
 
 @app.get("/api/tables/")
-async def get_tables():
+async def get_tables(request: Request):
     """Получить все столы"""
     try:
-        conn = get_db()
-        cursor = conn.cursor()
-        cursor.execute('SELECT id, table_number, capacity, location, status FROM tables')
-        tables = []
-        for row in cursor.fetchall():
-            tables.append({
-                'id': row[0],
-                'table_number': row[1],
-                'capacity': row[2],
-                'location': row[3],
-                'status': row[4]
-            })
-        conn.close()
-        logger.info(f"📊 Tables loaded: {len(tables)}")
-        return tables
+        def query(conn):
+            cursor = conn.cursor()
+            cursor.execute('SELECT id, table_number, capacity, location, status FROM tables')
+            tables = []
+            for row in cursor.fetchall():
+                tables.append({
+                    'id': row[0],
+                    'table_number': row[1],
+                    'capacity': row[2],
+                    'location': row[3],
+                    'status': row[4]
+                })
+            logger.info(f"📊 Tables loaded: {len(tables)}")
+            return tables
+        return await cached_json_response(request, query)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Get tables error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -454,13 +568,16 @@ async def update_table(table_id: int, status: str = None):
         if status not in ['free', 'occupied', 'reserved']:
             raise HTTPException(status_code=400, detail="Invalid status")
         
-        conn = get_db()
-        cursor = conn.cursor()
-        cursor.execute('UPDATE tables SET status = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?', (status, table_id))
-        conn.commit()
-        conn.close()
+        def query(conn):
+            cursor = conn.cursor()
+            cursor.execute('UPDATE tables SET status = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?', (status, table_id))
+            conn.commit()
+        await db_pool.run(query)
+        response_cache.invalidate("/api/tables/")
         logger.info(f"✅ Table {table_id} updated to {status}")
         return {"success": True, "table_id": table_id, "status": status}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Update table error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -471,23 +588,48 @@ async def update_table(table_id: int, status: str = None):
 async def get_orders():
     """Получить все заказы"""
     try:
-        conn = get_db()
-        cursor = conn.cursor()
-        cursor.execute('SELECT id, table_id, waiter_id, status, total_amount, dishes, created_at FROM orders')
-        orders = []
-        for row in cursor.fetchall():
-            orders.append({
-                'id': row[0],
-                'table_id': row[1],
-                'waiter_id': row[2],
-                'status': row[3],
-                'total_amount': row[4],
-                'dishes': json.loads(row[5]) if row[5] else [],
-                'created_at': row[6]
-            })
-        conn.close()
+        def query(conn):
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT o.id, o.table_id, o.waiter_id, o.status, o.total_amount, o.created_at,
+                       oi.menu_id, oi.quantity, oi.price, oi.subtotal, d.name, o.dishes
+                FROM orders o
+                LEFT JOIN order_items oi ON oi.order_id = o.id
+                LEFT JOIN dishes d ON d.id = oi.menu_id
+                ORDER BY o.id, oi.id
+            ''')
+            orders = []
+            current = None
+            for row in cursor.fetchall():
+                if current is None or current['id'] != row[0]:
+                    current = {
+                        'id': row[0],
+                        'table_id': row[1],
+                        'waiter_id': row[2],
+                        'status': row[3],
+                        'total_amount': row[4],
+                        # Старые названия, которых не нашлось в меню при переносе в order_items
+                        'dishes': legacy_dish_names(row[11]) or [],
+                        'items': [],
+                        'created_at': row[5]
+                    }
+                    orders.append(current)
+                if row[6] is not None:
+                    current['dishes'].extend([row[10]] * row[7])
+                    current['items'].append({
+                        'menu_id': row[6],
+                        'name': row[10],
+                        'quantity': row[7],
+                        'price': row[8],
+                        'subtotal': row[9]
+                    })
+            return orders
+        orders = await read_pool.run(query)
         logger.info(f"📋 Orders loaded: {len(orders)}")
-        return orders
+        # Без jsonable_encoder: список сериализуется orjson один раз
+        return FastJSONResponse(orders)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Get orders error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -498,21 +640,28 @@ async def create_order(data: dict = Body(...)):
         # Extract data from JSON body
     table_id = data.get('table_id')
     waiter_id = data.get('waiter_id', 1)  # Default to waiter 1 if not provided
+    cook_id = data.get('cook_id')
     dishes = data.get('dishes', [])
-    total_amount = data.get('total_amount', 0)
+    total_amount = data.get('total_amount')
     
     try:
-        conn = get_db()
-        cursor = conn.cursor()
-        cursor.execute(
-            'INSERT INTO orders (table_id, waiter_id, status, total_amount, dishes) VALUES (?, ?, ?, ?, ?)',
-            (table_id, waiter_id, 'pending', total_amount, json.dumps(dishes))
-        )
-        conn.commit()
-        order_id = cursor.lastrowid
-        conn.close()
+        def query(conn):
+            lines = resolve_order_lines(conn, dishes)
+            amount = total_amount if total_amount is not None else sum(line[3] for line in lines)
+            cursor = conn.cursor()
+            cursor.execute(
+                'INSERT INTO orders (table_id, waiter_id, cook_id, status, total_amount) VALUES (?, ?, ?, ?, ?)',
+                (table_id, waiter_id, cook_id, 'pending', amount)
+            )
+            order_id = cursor.lastrowid
+            insert_order_lines(conn, order_id, lines)
+            conn.commit()
+            return order_id
+        order_id = await db_pool.run(query)
         logger.info(f"✅ Order created: ID {order_id}")
-        return {"id": order_id, "table_id": table_id, "waiter_id": waiter_id, "status": "pending"}
+        return {"id": order_id, "table_id": table_id, "waiter_id": waiter_id, "cook_id": cook_id, "status": "pending"}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Create order error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -526,20 +675,27 @@ async def update_order(order_id: int, data: dict = Body(...)):
     dishes = data.get('dishes')
     
     try:
-        conn = get_db()
-        cursor = conn.cursor()
-        
-        if status:
-            cursor.execute('UPDATE orders SET status = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?', (status, order_id))
-        if total_amount is not None:
-            cursor.execute('UPDATE orders SET total_amount = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?', (total_amount, order_id))
-        if dishes:
-            cursor.execute('UPDATE orders SET dishes = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?', (json.dumps(dishes), order_id))
-        
-        conn.commit()
-        conn.close()
+        fields = {'status': status or None, 'total_amount': total_amount, 'cook_id': data.get('cook_id')}
+
+        def query(conn):
+            lines = resolve_order_lines(conn, dishes) if dishes else None
+            order = update_row(conn, 'orders', order_id, fields, ORDER_COLUMNS, touch=bool(dishes))
+            if order is None:
+                return None
+            if lines is not None:
+                conn.execute('DELETE FROM order_items WHERE order_id = ?', (order_id,))
+                # Новый состав заменяет и старые названия из orders.dishes
+                conn.execute("UPDATE orders SET dishes = '[]' WHERE id = ?", (order_id,))
+                insert_order_lines(conn, order_id, lines)
+            conn.commit()
+            return order
+        order = await db_pool.run(query)
+        if order is None:
+            raise HTTPException(status_code=404, detail="Заказ не найден")
         logger.info(f"✅ Order {order_id} updated")
-        return {"success": True, "order_id": order_id}
+        return {"success": True, "order_id": order_id, "order": order}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Update order error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -548,13 +704,16 @@ async def update_order(order_id: int, data: dict = Body(...)):
 async def delete_order(order_id: int):
     """Удалить заказ"""
     try:
-        conn = get_db()
-        cursor = conn.cursor()
-        cursor.execute('DELETE FROM orders WHERE id = ?', (order_id,))
-        conn.commit()
-        conn.close()
+        def query(conn):
+            cursor = conn.cursor()
+            cursor.execute('DELETE FROM order_items WHERE order_id = ?', (order_id,))
+            cursor.execute('DELETE FROM orders WHERE id = ?', (order_id,))
+            conn.commit()
+        await db_pool.run(query)
         logger.info(f"✅ Order deleted: ID {order_id}")
         return {"success": True}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Delete order error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -565,21 +724,24 @@ async def delete_order(order_id: int):
 async def get_employees():
     """Получить всех сотрудников"""
     try:
-        conn = get_db()
-        cursor = conn.cursor()
-        cursor.execute('SELECT id, username, name, role, created_at FROM users')
-        employees = []
-        for row in cursor.fetchall():
-            employees.append({
-                'id': row[0],
-                'username': row[1],
-                'name': row[2],
-                'role': row[3],
-                'created_at': row[4]
-            })
-        conn.close()
+        def query(conn):
+            cursor = conn.cursor()
+            cursor.execute('SELECT id, username, name, role, created_at FROM users')
+            employees = []
+            for row in cursor.fetchall():
+                employees.append({
+                    'id': row[0],
+                    'username': row[1],
+                    'name': row[2],
+                    'role': row[3],
+                    'created_at': row[4]
+                })
+            return employees
+        employees = await read_pool.run(query)
         logger.info(f"👥 Employees loaded: {len(employees)}")
-        return employees
+        return FastJSONResponse(employees)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Get employees error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -591,22 +753,21 @@ async def create_employee(username: str, password: str, name: str, role: str):
         if role not in ['waiter', 'chef', 'admin']:
             raise HTTPException(status_code=400, detail="Неверная роль")
         
-        conn = get_db()
-        cursor = conn.cursor()
-        
-        # Проверка на дубликат
-        cursor.execute('SELECT id FROM users WHERE username = ?', (username,))
-        if cursor.fetchone():
-            conn.close()
-            raise HTTPException(status_code=400, detail="Пользователь с таким логином уже существует")
-        
-        cursor.execute(
-            'INSERT INTO users (username, password, name, role) VALUES (?, ?, ?, ?)',
-            (username, password, name, role)
-        )
-        conn.commit()
-        employee_id = cursor.lastrowid
-        conn.close()
+        def query(conn):
+            cursor = conn.cursor()
+            
+            # Проверка на дубликат
+            cursor.execute('SELECT id FROM users WHERE username = ?', (username,))
+            if cursor.fetchone():
+                raise HTTPException(status_code=400, detail="Пользователь с таким логином уже существует")
+            
+            cursor.execute(
+                'INSERT INTO users (username, password, name, role) VALUES (?, ?, ?, ?)',
+                (username, password, name, role)
+            )
+            conn.commit()
+            return cursor.lastrowid
+        employee_id = await db_pool.run(query)
         
         logger.info(f"✅ Employee created: {username} (ID: {employee_id})")
         return {
@@ -626,24 +787,25 @@ async def create_employee(username: str, password: str, name: str, role: str):
 async def update_employee(employee_id: int, username: str = None, name: str = None, role: str = None, password: str = None):
     """Обновить информацию о сотруднике"""
     try:
-        conn = get_db()
-        cursor = conn.cursor()
-        
-        if username:
-            cursor.execute('UPDATE users SET username = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?', (username, employee_id))
-        if name:
-            cursor.execute('UPDATE users SET name = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?', (name, employee_id))
-        if role:
-            if role not in ['waiter', 'chef', 'admin']:
-                raise HTTPException(status_code=400, detail="Неверная роль")
-            cursor.execute('UPDATE users SET role = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?', (role, employee_id))
-        if password:
-            cursor.execute('UPDATE users SET password = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?', (password, employee_id))
-        
-        conn.commit()
-        conn.close()
+        if role and role not in ['waiter', 'chef', 'admin']:
+            raise HTTPException(status_code=400, detail="Неверная роль")
+
+        fields = {
+            'username': username or None,
+            'name': name or None,
+            'role': role or None,
+            'password': password or None,
+        }
+
+        def query(conn):
+            employee = update_row(conn, 'users', employee_id, fields, EMPLOYEE_COLUMNS)
+            conn.commit()
+            return employee
+        employee = await db_pool.run(query)
+        if employee is None:
+            raise HTTPException(status_code=404, detail="Сотрудник не найден")
         logger.info(f"✅ Employee {employee_id} updated")
-        return {"success": True, "employee_id": employee_id}
+        return {"success": True, "employee_id": employee_id, "employee": employee}
     except HTTPException:
         raise
     except Exception as e:
@@ -654,21 +816,21 @@ async def update_employee(employee_id: int, username: str = None, name: str = No
 async def delete_employee(employee_id: int):
     """Удалить сотрудника"""
     try:
-        conn = get_db()
-        cursor = conn.cursor()
-        
-        # Не даем удалить администратора
-        cursor.execute('SELECT role FROM users WHERE id = ?', (employee_id,))
-        user = cursor.fetchone()
-        if not user:
-            raise HTTPException(status_code=404, detail="Сотрудник не найден")
-        
-        if user[0] == 'admin':
-            raise HTTPException(status_code=400, detail="Нельзя удалить администратора")
-        
-        cursor.execute('DELETE FROM users WHERE id = ?', (employee_id,))
-        conn.commit()
-        conn.close()
+        def query(conn):
+            cursor = conn.cursor()
+            
+            # Не даем удалить администратора
+            cursor.execute('SELECT role FROM users WHERE id = ?', (employee_id,))
+            user = cursor.fetchone()
+            if not user:
+                raise HTTPException(status_code=404, detail="Сотрудник не найден")
+            
+            if user[0] == 'admin':
+                raise HTTPException(status_code=400, detail="Нельзя удалить администратора")
+            
+            cursor.execute('DELETE FROM users WHERE id = ?', (employee_id,))
+            conn.commit()
+        await db_pool.run(query)
         
         logger.info(f"✅ Employee {employee_id} deleted")
         return {"success": True, "message": "Сотрудник удален"}
@@ -684,7 +846,7 @@ async def delete_employee(employee_id: int):
 async def not_found_handler(request: Request, exc):
     """Обработчик 404 ошибок"""
     if request.url.path.startswith("/api/"):
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=404,
             content={
                 "error": "Not Found",
@@ -701,7 +863,7 @@ async def not_found_handler(request: Request, exc):
 async def server_error_handler(request: Request, exc):
     """Обработчик 500 ошибок"""
     logger.error(f"Server error: {exc}")
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=500,
         content={
             "error": "Internal Server Error",
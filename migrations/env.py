@@ -23,6 +23,7 @@ from app.models.order_items import OrderItemsModel
 from app.models.roles import Role
 from app.models.users import User
 from app.models.migration import MigrationHistory
+from app.models.prep_time_sketch import PrepTimeSketchModel
 
 # Alembic Config object
 config = context.config
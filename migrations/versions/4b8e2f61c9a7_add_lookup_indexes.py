@@ -0,0 +1,73 @@
+"""Add lookup indexes for repository queries
+
+Revision ID: 4b8e2f61c9a7
+Revises: d5109ecebaa5
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b8e2f61c9a7'
+down_revision: Union[str, Sequence[str], None] = 'd5109ecebaa5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('orders', schema=None) as batch_op:
+        batch_op.create_index('ix_orders_waiters_id_status', ['waiters_id', 'status'], unique=False)
+        batch_op.create_index('ix_orders_table_id_status', ['table_id', 'status'], unique=False)
+        batch_op.create_index('ix_orders_status_created_at', ['status', 'created_at'], unique=False)
+
+    with op.batch_alter_table('order_items', schema=None) as batch_op:
+        batch_op.create_index('ix_order_items_order_id', ['order_id'], unique=False)
+        batch_op.create_index('ix_order_items_menu_id', ['menu_id'], unique=False)
+
+    with op.batch_alter_table('tables', schema=None) as batch_op:
+        batch_op.create_index('ix_tables_status', ['status'], unique=False)
+        batch_op.create_index(
+            'ix_tables_available',
+            ['table_number'],
+            unique=False,
+            sqlite_where=sa.text("is_available = 1 AND status = 'available'"),
+        )
+
+    with op.batch_alter_table('waiter_statistics', schema=None) as batch_op:
+        batch_op.create_index('ix_waiter_statistics_waiter_id', ['waiter_id'], unique=False)
+
+    with op.batch_alter_table('cook_statistics', schema=None) as batch_op:
+        batch_op.create_index('ix_cook_statistics_cook_id', ['cook_id'], unique=False)
+
+    with op.batch_alter_table('categories', schema=None) as batch_op:
+        batch_op.create_index('ix_categories_name', ['name'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('categories', schema=None) as batch_op:
+        batch_op.drop_index('ix_categories_name')
+
+    with op.batch_alter_table('cook_statistics', schema=None) as batch_op:
+        batch_op.drop_index('ix_cook_statistics_cook_id')
+
+    with op.batch_alter_table('waiter_statistics', schema=None) as batch_op:
+        batch_op.drop_index('ix_waiter_statistics_waiter_id')
+
+    with op.batch_alter_table('tables', schema=None) as batch_op:
+        batch_op.drop_index('ix_tables_available')
+        batch_op.drop_index('ix_tables_status')
+
+    with op.batch_alter_table('order_items', schema=None) as batch_op:
+        batch_op.drop_index('ix_order_items_menu_id')
+        batch_op.drop_index('ix_order_items_order_id')
+
+    with op.batch_alter_table('orders', schema=None) as batch_op:
+        batch_op.drop_index('ix_orders_status_created_at')
+        batch_op.drop_index('ix_orders_table_id_status')
+        batch_op.drop_index('ix_orders_waiters_id_status')
@@ -0,0 +1,38 @@
+"""Add run result and batch progress columns to migration_history
+
+Revision ID: 9c3d5e7a1f20
+Revises: 4b8e2f61c9a7
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c3d5e7a1f20'
+down_revision: Union[str, Sequence[str], None] = '4b8e2f61c9a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('migration_history', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('duration_ms', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('rows_affected', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('error', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('batch_size', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('batches_done', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('migration_history', schema=None) as batch_op:
+        batch_op.drop_column('batches_done')
+        batch_op.drop_column('batch_size')
+        batch_op.drop_column('error')
+        batch_op.drop_column('rows_affected')
+        batch_op.drop_column('duration_ms')
@@ -0,0 +1,32 @@
+"""Add previous_status and cooking_started_at to orders
+
+Revision ID: e1f4a9c2b7d3
+Revises: 9c3d5e7a1f20
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1f4a9c2b7d3'
+down_revision: Union[str, Sequence[str], None] = '9c3d5e7a1f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('orders', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('previous_status', sa.String(length=50), nullable=True))
+        batch_op.add_column(sa.Column('cooking_started_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('orders', schema=None) as batch_op:
+        batch_op.drop_column('cooking_started_at')
+        batch_op.drop_column('previous_status')
@@ -0,0 +1,36 @@
+"""Add prep_time_sketches
+
+Revision ID: f3b8c1d2e4a6
+Revises: e1f4a9c2b7d3
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b8c1d2e4a6'
+down_revision: Union[str, Sequence[str], None] = 'e1f4a9c2b7d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'prep_time_sketches',
+        sa.Column('kind', sa.String(length=10), nullable=False),
+        sa.Column('key_id', sa.Integer(), nullable=False),
+        sa.Column('sketch', sa.LargeBinary(), nullable=False),
+        sa.Column('samples', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+        sa.PrimaryKeyConstraint('kind', 'key_id'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('prep_time_sketches')
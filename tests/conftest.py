@@ -0,0 +1,17 @@
+# tests/conftest.py
+import pytest
+
+from app.dependencies import statistics_buffer
+from app.services.order_events import order_events
+
+
+@pytest.fixture(autouse=True)
+def detached_statistics_buffer():
+    """События заказов из тестов не доходят до буфера приложения.
+
+    Буфер из app.dependencies подписан на шину при импорте и пишет в
+    рабочую БД (settings.SQLITE_PATH); тесты подписывают свои буферы.
+    """
+    order_events.unsubscribe(statistics_buffer.publish)
+    yield
+    order_events.subscribe(statistics_buffer.publish)
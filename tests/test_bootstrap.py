@@ -0,0 +1,115 @@
+# tests/test_bootstrap.py
+"""Версионная подготовка БД: холодный и тёплый старт, обновление старой БД, перенос orders.dishes."""
+import json
+import shutil
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from app.database.bootstrap import SCHEMA_MIGRATIONS, SCHEMA_VERSION, bootstrap_database
+
+# БД из репозитория — в форме до версионной схемы (user_version = 0)
+BASELINE_DB = Path(__file__).resolve().parent.parent / 'restaurant.db'
+
+
+def schema(conn):
+    return sorted(conn.execute("SELECT type, name FROM sqlite_master WHERE name NOT LIKE 'sqlite_%'"))
+
+
+def row_counts(conn):
+    return {
+        name: conn.execute(f'SELECT COUNT(*) FROM "{name}"').fetchone()[0]
+        for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    }
+
+
+def test_cold_then_warm_boot(tmp_path):
+    conn = sqlite3.connect(tmp_path / 'new.db')
+    try:
+        cold = bootstrap_database(conn, seed=True)
+        assert cold['boot'] == 'cold' and cold['seeded']
+        assert cold['applied_versions'] == sorted(SCHEMA_MIGRATIONS)
+        assert conn.execute('PRAGMA user_version').fetchone()[0] == SCHEMA_VERSION
+        before = schema(conn), row_counts(conn)
+
+        # Повторный старт: ни одна миграция не выполняется, данные не тронуты
+        executed = []
+        conn.set_trace_callback(executed.append)
+        warm = bootstrap_database(conn, seed=True)
+        conn.set_trace_callback(None)
+        assert warm['boot'] == 'warm' and warm['applied_versions'] == [] and not warm['seeded']
+        assert not [sql for sql in executed if sql.lstrip().upper().startswith(('CREATE', 'ALTER', 'INSERT', 'DELETE'))]
+        assert (schema(conn), row_counts(conn)) == before
+    finally:
+        conn.close()
+
+
+def test_upgrade_keeps_baseline_data(tmp_path):
+    path = tmp_path / 'baseline.db'
+    shutil.copy(BASELINE_DB, path)
+    conn = sqlite3.connect(path)
+    try:
+        assert conn.execute('PRAGMA user_version').fetchone()[0] == 0
+        before = row_counts(conn)
+        orders = conn.execute('SELECT id, table_id, waiter_id, status, total_amount FROM orders ORDER BY id').fetchall()
+
+        report = bootstrap_database(conn, seed=True)
+
+        assert report['previous_version'] == 0 and report['applied_versions'] == sorted(SCHEMA_MIGRATIONS)
+        # В непустую БД тестовые данные не досеиваются, старые строки на месте
+        assert not report['seeded']
+        after = row_counts(conn)
+        assert all(after[name] == count for name, count in before.items() if name != 'sqlite_sequence')
+        assert conn.execute('SELECT id, table_id, waiter_id, status, total_amount FROM orders ORDER BY id').fetchall() == orders
+        assert conn.execute('SELECT COUNT(*) FROM stat_counters').fetchone()[0] > 0
+        assert bootstrap_database(conn)['applied_versions'] == []
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def baseline(tmp_path):
+    """БД в форме до order_items: схема v1 и заказы с JSON в orders.dishes"""
+    conn = sqlite3.connect(tmp_path / 'baseline.db')
+    for step in SCHEMA_MIGRATIONS[1]:
+        conn.execute(step)
+    conn.execute('PRAGMA user_version = 1')
+    conn.executemany(
+        "INSERT INTO dishes (id, name, price, category) VALUES (?, ?, ?, 'Основное')",
+        [(1, 'Борщ', 350.0), (2, 'Чай', 100.0)],
+    )
+    conn.executemany(
+        "INSERT INTO orders (id, table_id, waiter_id, dishes) VALUES (?, 1, 1, ?)",
+        [
+            (1, json.dumps(['Борщ', 'Борщ', 'Чай'], ensure_ascii=False)),
+            (2, json.dumps(['Чай', 'Пицца'], ensure_ascii=False)),
+            # Старый POST /api/orders/ сохранял любой JSON клиента
+            (3, json.dumps([{'name': 'Борщ'}], ensure_ascii=False)),
+            (4, json.dumps('Борщ', ensure_ascii=False)),
+            (5, 'not json'),
+            (6, '[]'),
+        ],
+    )
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def test_legacy_dishes_move_to_order_items(baseline):
+    report = bootstrap_database(baseline)
+
+    assert report['previous_version'] == 1 and report['applied_versions'][0] == 2
+    items = baseline.execute(
+        'SELECT order_id, menu_id, quantity, price, subtotal FROM order_items ORDER BY order_id, menu_id'
+    ).fetchall()
+    assert items == [(1, 1, 2, 350.0, 700.0), (1, 2, 1, 100.0, 100.0), (2, 2, 1, 100.0, 100.0)]
+
+    leftovers = dict(baseline.execute('SELECT id, dishes FROM orders'))
+    # Сопоставленные названия убраны, ненайденные остались для GET /api/orders/
+    assert json.loads(leftovers[1]) == []
+    assert json.loads(leftovers[2]) == ['Пицца']
+    # Не список названий — пропущено без изменений, а не разбито по символам
+    assert json.loads(leftovers[3]) == [{'name': 'Борщ'}]
+    assert json.loads(leftovers[4]) == 'Борщ'
+    assert leftovers[5] == 'not json'
@@ -0,0 +1,66 @@
+# tests/test_dto_rows.py
+"""get_page(): тот же JSON, что и ORM + валидация по response_model, без ORM-объектов."""
+import asyncio
+
+import pytest
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.database.database import Base
+from app.models.dishes import DishesModel
+from app.models.order import OrderModel
+from app.models.order_items import OrderItemsModel
+from app.models.tables import TablesModel
+from app.repositories.dishes import DishRepository
+from app.repositories.order_items import OrderItemRepository
+from app.repositories.orders import OrderRepository
+from app.repositories.tables import TableRepository
+from app.schemes.dishes import DishResponse
+from app.schemes.order import OrderResponse
+from app.schemes.order_items import OrderItemResponse
+from app.schemes.tables import TableResponse
+from app.utils.responses import json_dumps
+
+PAGE_CASES = [
+    (OrderRepository, OrderResponse, [OrderModel(table_id=i, waiters_id=1, cook_id=i % 2 or None) for i in range(1, 6)]),
+    (DishRepository, DishResponse, [DishesModel(name=f"Блюдо {i}", price=100.0 * i, category_id=1, admin_id=1) for i in range(1, 6)]),
+    (TableRepository, TableResponse, [TablesModel(table_number=i, location="зал" if i % 2 else None) for i in range(1, 6)]),
+    (OrderItemRepository, OrderItemResponse, [OrderItemsModel(order_id=1, menu_id=i, quantity=i, price=10.0, subtotal=10.0 * i) for i in range(1, 6)]),
+]
+
+
+async def _pages(repository_type, rows):
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with AsyncSession(engine) as session:
+            session.add_all(rows)
+            await session.commit()
+
+        async with AsyncSession(engine) as session:
+            repository = repository_type(session)
+            orm_page = await repository.get_all(limit=3, after=1)
+            session.expunge_all()
+            dto_page = await repository.get_page(limit=3, after=1)
+            # Строки страницы не попадают в identity map сессии
+            assert len(session.identity_map) == 0
+        return orm_page, dto_page
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.parametrize(
+    "repository_type, schema, rows",
+    PAGE_CASES,
+    ids=[case[0].__name__ for case in PAGE_CASES],
+)
+def test_page_rows_serialize_like_response_model(repository_type, schema, rows):
+    orm_page, dto_page = asyncio.run(_pages(repository_type, rows))
+
+    expected = TypeAdapter(list[schema]).dump_json(
+        TypeAdapter(list[schema]).validate_python(orm_page, from_attributes=True)
+    )
+    assert [row.id for row in dto_page] == [2, 3, 4]
+    assert json_dumps(dto_page) == expected
@@ -0,0 +1,89 @@
+# tests/test_migration_runner.py
+"""MigrationRunner: порядок версий, транзакция на миграцию, пакетные миграции данных."""
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.database.database import Base
+from app.database.migration_runner import MigrationRunner, split_statements
+from app.models.migration import MigrationHistory
+
+
+async def _run(tmp_path, migrations):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'runner.db'}")
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[MigrationHistory.__table__])
+        async with session_factory() as session:
+            session.add_all(MigrationHistory(**migration) for migration in migrations)
+            await session.commit()
+
+        report = await MigrationRunner(session_factory).run()
+
+        async with engine.connect() as conn:
+            tables = {
+                row[0] for row in await conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'"))
+            }
+            rows = {}
+            for table in tables & {"notes", "broken"}:
+                rows[table] = (await conn.execute(text(f"SELECT * FROM {table} ORDER BY id"))).all()
+            history = {
+                row.version: row
+                for row in await conn.execute(text("SELECT * FROM migration_history"))
+            }
+        return report, tables, rows, history
+    finally:
+        await engine.dispose()
+
+
+def test_applies_in_version_order_and_stops_on_failure(tmp_path):
+    report, tables, rows, history = asyncio.run(_run(tmp_path, [
+        {"version": "10", "status": "pending", "sql_content": "INSERT INTO notes (body) VALUES ('b'), ('c');"},
+        {"version": "2", "status": "pending", "sql_content": "CREATE TABLE notes (id INTEGER PRIMARY KEY, body TEXT); INSERT INTO notes (body) VALUES ('a; still a');"},
+        {"version": "11", "status": "pending", "sql_content": "CREATE TABLE broken (id INTEGER PRIMARY KEY); INSERT INTO missing VALUES (1);"},
+        {"version": "12", "status": "pending", "sql_content": "CREATE TABLE never (id INTEGER PRIMARY KEY);"},
+    ]))
+
+    assert [m["version"] for m in report["applied"]] == ["2", "10"]
+    assert [row.body for row in rows["notes"]] == ["a; still a", "b", "c"]
+    assert history["10"].rows_affected == 2 and history["10"].duration_ms is not None
+    assert history["2"].applied_at is not None
+
+    # DDL упавшей миграции откатился вместе с ней, следующая не запускалась
+    assert report["failed"]["version"] == "11" and "missing" in report["failed"]["error"]
+    assert "broken" not in tables and "never" not in tables
+    assert history["12"].status == "pending"
+    assert report["pending"] == 2
+
+
+def test_batched_data_migration_commits_progress_per_batch(tmp_path):
+    seed = "CREATE TABLE notes (id INTEGER PRIMARY KEY, body TEXT, done INTEGER DEFAULT 0);" + "".join(
+        f"INSERT INTO notes (body) VALUES ('{i}');" for i in range(25)
+    )
+    report, _, rows, history = asyncio.run(_run(tmp_path, [
+        {"version": "1", "status": "pending", "sql_content": seed},
+        {
+            "version": "2",
+            "status": "pending",
+            "batch_size": 10,
+            "sql_content": "UPDATE notes SET done = 1 WHERE id IN (SELECT id FROM notes WHERE done = 0 LIMIT :batch_size);",
+        },
+    ]))
+
+    assert report["failed"] is None
+    assert all(row.done == 1 for row in rows["notes"])
+    assert (history["2"].status, history["2"].batches_done, history["2"].rows_affected) == ("success", 3, 25)
+
+
+def test_split_statements_keeps_trigger_bodies():
+    sql = """
+        CREATE TABLE t (id INTEGER PRIMARY KEY, n INTEGER);
+        CREATE TRIGGER t_bump AFTER INSERT ON t BEGIN UPDATE t SET n = 1 WHERE id = new.id; END;
+        INSERT INTO t (n) VALUES (0)
+    """
+    statements = split_statements(sql + ";")
+
+    assert len(statements) == 3
+    assert statements[1].startswith("CREATE TRIGGER") and statements[1].endswith("END;")
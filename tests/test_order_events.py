@@ -0,0 +1,100 @@
+# tests/test_order_events.py
+"""События заказов -> статистика официантов и поваров пачками приращений."""
+import asyncio
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.database.database import Base
+from app.database.db_manager import DBManager
+from app.models.cook_statistics import CookStatisticsModel
+from app.models.order import OrderModel
+from app.schemes.order import OrderCreate, OrderUpdate
+from app.services.order import OrderService
+from app.services.order_events import OrderStatusChanged, order_events, statistics_deltas
+from app.services.statistics_buffer import StatisticsBuffer
+
+
+def test_deltas_follow_status_and_cancel_out_on_revert():
+    events = [
+        OrderStatusChanged(1, waiter_id=5, cook_id=9, old_status=None, new_status="Создан", total_amount=300.0),
+        OrderStatusChanged(1, waiter_id=5, cook_id=9, old_status="Создан", new_status="cooking", total_amount=300.0),
+        OrderStatusChanged(1, waiter_id=5, cook_id=9, old_status="cooking", new_status="ready", total_amount=300.0, cooking_minutes=12.0),
+        OrderStatusChanged(1, waiter_id=5, cook_id=9, old_status="ready", new_status="completed", total_amount=300.0),
+        # Второй заказ выдали по ошибке и вернули обратно
+        OrderStatusChanged(2, waiter_id=5, cook_id=None, old_status="ready", new_status="Выдан", total_amount=50.0),
+        OrderStatusChanged(2, waiter_id=5, cook_id=None, old_status="Выдан", new_status="ready", total_amount=50.0),
+    ]
+    waiters, cooks = statistics_deltas(events)
+
+    assert (waiters[5].total_orders, waiters[5].total_revenue) == (1, 300.0)
+    assert (cooks[9].active_orders, cooks[9].completed_orders, cooks[9].cooking_minutes) == (0, 1, 12.0)
+
+
+async def _lifecycle(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'events.db'}")
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    buffer = StatisticsBuffer(session_factory)
+    order_events.subscribe(buffer.publish)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with session_factory() as session:
+            session.add(CookStatisticsModel(cook_id=2, completed_orders=1, average_cooking_time=20.0))
+            await session.commit()
+
+        async def request(action):
+            async with DBManager(session_factory) as db:
+                result = await action(OrderService(db.orders))
+                await db.commit()
+                return result
+
+        ids = []
+        for amount in (100.0, 250.0):
+            order = await request(lambda s: s.create_order(OrderCreate(table_id=1, waiters_id=1, cook_id=2)))
+            async with DBManager(session_factory) as db:
+                await db.session.execute(update(OrderModel).where(OrderModel.id == order.id).values(total_amount=amount))
+                await db.commit()
+            ids.append(order.id)
+
+        for order_id in ids:
+            await request(lambda s: s.update_order(order_id, OrderUpdate(status="cooking")))
+        mid_cook = await buffer_snapshot(buffer, session_factory)
+
+        for order_id in ids:
+            await request(lambda s: s.update_order(order_id, OrderUpdate(status="ready")))
+            await request(lambda s: s.update_order(order_id, OrderUpdate(status="completed")))
+
+        # Откаченная смена статуса не публикуется
+        async with DBManager(session_factory) as db:
+            await OrderService(db.orders).update_order(ids[0], OrderUpdate(status="cooking"))
+
+        final = await buffer_snapshot(buffer, session_factory)
+        return mid_cook, final, buffer.stats()
+    finally:
+        order_events.unsubscribe(buffer.publish)
+        await buffer.stop()
+        await engine.dispose()
+
+
+async def buffer_snapshot(buffer, session_factory):
+    await buffer.flush()
+    async with DBManager(session_factory) as db:
+        waiter = await db.waiter_statistics.get_by_waiter(1)
+        cook = await db.cook_statistics.get_by_cook(2)
+        return (
+            (waiter.total_orders, waiter.total_revenue) if waiter else None,
+            (cook.active_orders, cook.completed_orders, cook.average_cooking_time),
+        )
+
+
+def test_order_lifecycle_updates_statistics(tmp_path):
+    mid_cook, final, stats = asyncio.run(_lifecycle(tmp_path))
+
+    assert mid_cook == (None, (2, 1, 20.0))
+    waiter, (active, completed, average) = final
+    assert waiter == (2, 350.0)
+    assert (active, completed) == (0, 3)
+    # Два быстрых заказа (доли минуты) сдвигают среднее с 20 минут к нулю
+    assert 0 < average < 20.0 / 3 + 0.1
+    assert stats["failed_flushes"] == 0 and stats["events"] == 8
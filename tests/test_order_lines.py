@@ -0,0 +1,57 @@
+# tests/test_order_lines.py
+"""Заказы main.py: проверка состава заказа и старые названия из orders.dishes."""
+import json
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from app.database.bootstrap import bootstrap_database
+from app.database.pool import SQLitePool
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    path = str(tmp_path / 'orders.db')
+    conn = sqlite3.connect(path)
+    bootstrap_database(conn, seed=True)
+    # Заказ, у которого при переносе в order_items осталось ненайденное блюдо
+    conn.execute("INSERT INTO orders (id, table_id, waiter_id, dishes) VALUES (50, 1, 1, ?)",
+                 (json.dumps(['Пицца'], ensure_ascii=False),))
+    conn.execute("INSERT INTO order_items (order_id, menu_id, quantity, price, subtotal) VALUES (50, 1, 1, 10, 10)")
+    conn.commit()
+    conn.close()
+
+    writer, reader = SQLitePool(path, size=1), SQLitePool(path, size=1, read_only=True)
+    monkeypatch.setattr(main, 'db_pool', writer)
+    monkeypatch.setattr(main, 'read_pool', reader)
+    # Без with: startup-задачи приложения (bootstrap рабочей БД) не запускаются
+    yield TestClient(main.app)
+    writer.close()
+    reader.close()
+
+
+@pytest.mark.parametrize('dishes', [
+    [{'quantity': 2}],
+    [{'menu_id': 'борщ'}],
+    [{'menu_id': 1, 'quantity': 'две'}],
+    [{'menu_id': 1, 'quantity': 0}],
+    [{'menu_id': 1, 'quantity': -3}],
+    [{'menu_id': True}],
+    [['Борщ']],
+    'Борщ',
+])
+def test_invalid_order_lines_are_rejected(client, dishes):
+    response = client.post('/api/orders/', json={'table_id': 1, 'dishes': dishes})
+    assert response.status_code == 400, response.json()
+    assert client.put('/api/orders/50', json={'dishes': dishes}).status_code == 400
+
+
+def test_legacy_dish_names_are_listed_until_replaced(client):
+    order = next(order for order in client.get('/api/orders/').json() if order['id'] == 50)
+    assert 'Пицца' in order['dishes'] and len(order['dishes']) == 2
+
+    assert client.put('/api/orders/50', json={'dishes': [{'menu_id': 1, 'quantity': 2}]}).status_code == 200
+    order = next(order for order in client.get('/api/orders/').json() if order['id'] == 50)
+    assert 'Пицца' not in order['dishes'] and order['items'][0]['quantity'] == 2
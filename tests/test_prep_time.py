@@ -0,0 +1,109 @@
+# tests/test_prep_time.py
+"""Скетч времени готовки: точность квантилей, слияние, хранение и обновление событиями."""
+import asyncio
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.database.database import Base
+from app.database.db_manager import DBManager
+from app.models.order import OrderModel
+from app.models.order_items import OrderItemsModel
+from app.schemes.order import OrderCreate, OrderUpdate
+from app.services.order import OrderService
+from app.services.order_events import order_events
+from app.services.prep_time import PrepTimeService
+from app.services.statistics_buffer import StatisticsBuffer
+from app.utils.latency_sketch import RELATIVE_ACCURACY, LatencySketch
+
+
+def exact_quantile(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def test_sketch_quantiles_merge_and_round_trip():
+    rng = random.Random(7)
+    # Медиана ~12 минут и длинный хвост, как в час пик
+    values = [rng.lognormvariate(2.5, 0.6) for _ in range(20_000)]
+    whole, left, right = LatencySketch(), LatencySketch(), LatencySketch()
+    for i, value in enumerate(values):
+        whole.add(value)
+        (left if i % 2 else right).add(value)
+
+    for q in (0.5, 0.9, 0.99):
+        exact = exact_quantile(values, q)
+        assert abs(whole.quantile(q) - exact) <= exact * RELATIVE_ACCURACY * 1.5
+
+    merged = left.merge(right)
+    assert merged.bins == whole.bins and merged.count == whole.count
+
+    data = whole.to_bytes()
+    assert len(data) < 1024
+    restored = LatencySketch.from_bytes(data)
+    assert restored.summary() == whole.summary()
+    assert LatencySketch().summary()["p50"] is None
+
+
+async def _prep_times(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'prep.db'}")
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    buffer = StatisticsBuffer(session_factory, flush_interval_ms=60_000)
+    order_events.subscribe(buffer.publish)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        async with DBManager(session_factory) as db:
+            service = OrderService(db.orders)
+            order = await service.create_order(OrderCreate(table_id=1, waiters_id=1, cook_id=5, status="cooking"))
+            db.session.add_all([
+                OrderItemsModel(order_id=order.id, menu_id=menu_id, quantity=1, price=100.0, subtotal=100.0)
+                for menu_id in (31, 32, 32)
+            ])
+            await db.session.execute(
+                update(OrderModel).where(OrderModel.id == order.id)
+                .values(cooking_started_at=datetime.utcnow() - timedelta(minutes=12))
+            )
+            await db.commit()
+        async with DBManager(session_factory) as db:
+            await OrderService(db.orders).update_order(order.id, OrderUpdate(status="ready"))
+            await db.commit()
+
+        # Ещё не записано — чтение накладывает буфер на пустую таблицу
+        async with DBManager(session_factory) as db:
+            pending_dish = await PrepTimeService(db.prep_time, buffer).get_prep_time("dish", 32)
+
+        history = [float(minutes) for minutes in range(5, 45)]
+        for minutes in history:
+            buffer.add_prep_time("cook", 5, minutes)
+        await buffer.flush()
+
+        async with DBManager(session_factory) as db:
+            cook = await PrepTimeService(db.prep_time).get_prep_time("cook", 5)
+            stored = await db.prep_time.get_sketch("dish", 31)
+            unknown = await PrepTimeService(db.prep_time, buffer).get_prep_time("dish", 99)
+        return pending_dish, cook, stored, unknown, history
+    finally:
+        order_events.unsubscribe(buffer.publish)
+        await buffer.stop()
+        await engine.dispose()
+
+
+def test_cooking_to_ready_updates_cook_and_dish_sketches(tmp_path):
+    pending_dish, cook, stored, unknown, history = asyncio.run(_prep_times(tmp_path))
+
+    # Одно наблюдение на блюдо, хоть оно и в заказе дважды
+    assert pending_dish["samples"] == 1
+    assert abs(pending_dish["p50"] - 12.0) < 0.1
+
+    samples = history + [pending_dish["p50"]]
+    assert cook["samples"] == len(samples)
+    for name, q in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99)):
+        exact = exact_quantile(samples, q)
+        assert abs(cook[name] - exact) <= exact * RELATIVE_ACCURACY
+
+    assert stored.count == 1
+    assert unknown is None
@@ -0,0 +1,149 @@
+# tests/test_query_plans.py
+"""Регрессионный контроль планов запросов.
+
+Каждый фильтрующий запрос репозиториев (и горячие запросы main.py)
+прогоняется через EXPLAIN QUERY PLAN. Тест падает, если SQLite выбирает
+полный просмотр таблицы вместо индекса.
+"""
+import asyncio
+import re
+import sqlite3
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.database.bootstrap import bootstrap_database
+from app.database.database import Base
+from app.database.rollups import CHANGED_HOURS_SQL, RANGE_SQL
+from app.models.admin import AdminModel  # noqa: F401
+from app.models.categories import CategoriesModel  # noqa: F401
+from app.models.cook import CookModel  # noqa: F401
+from app.models.cook_statistics import CookStatisticsModel  # noqa: F401
+from app.models.dishes import DishesModel  # noqa: F401
+from app.models.migration import MigrationHistory  # noqa: F401
+from app.models.order import OrderModel  # noqa: F401
+from app.models.order_items import OrderItemsModel  # noqa: F401
+from app.models.roles import Role  # noqa: F401
+from app.models.tables import TablesModel  # noqa: F401
+from app.models.users import User  # noqa: F401
+from app.models.waiter import WaiterModel  # noqa: F401
+from app.models.waiter_statistics import WaiterStatisticsModel  # noqa: F401
+from app.repositories.admin import AdminRepository
+from app.repositories.categories import CategoryRepository
+from app.repositories.cook import CookRepository
+from app.repositories.cook_statistics import CookStatisticsRepository
+from app.repositories.migration import MigrationRepository
+from app.repositories.order_items import OrderItemRepository
+from app.repositories.orders import OrderRepository
+from app.repositories.roles import RoleRepository
+from app.repositories.tables import TableRepository
+from app.repositories.users import UserRepository
+from app.repositories.waiter import WaiterRepository
+from app.repositories.waiter_statistics import WaiterStatisticsRepository
+
+# "SCAN orders" без "USING INDEX" / "USING COVERING INDEX" — полный просмотр
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+
+def full_scans(conn, sql, params=()):
+    plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    return [row[3] for row in plan if FULL_SCAN.match(row[3])]
+
+
+async def _explain_repository_query(call):
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    statements = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        statements.clear()
+
+        async with AsyncSession(engine) as session:
+            await call(session)
+        captured = list(statements)
+
+        async with engine.connect() as conn:
+            plans = []
+            for sql, params in captured:
+                result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", params)
+                plans.append((sql, [row[3] for row in result]))
+        return plans
+    finally:
+        await engine.dispose()
+
+
+REPOSITORY_QUERIES = [
+    ("OrderRepository.get_by_id", lambda db: OrderRepository(db).get_by_id(1)),
+    ("OrderRepository.get_by_status", lambda db: OrderRepository(db).get_by_status("created")),
+    ("OrderRepository.get_by_table", lambda db: OrderRepository(db).get_by_table(1)),
+    ("OrderRepository.get_by_waiter", lambda db: OrderRepository(db).get_by_waiter(1)),
+    # Keyset-страница: SEARCH по первичному ключу, а не SCAN с OFFSET
+    ("OrderRepository.get_all after", lambda db: OrderRepository(db).get_all(limit=50, after=1000)),
+    ("OrderItemRepository.get_all after", lambda db: OrderItemRepository(db).get_all(limit=50, after=1000)),
+    ("WaiterStatisticsRepository.get_all after", lambda db: WaiterStatisticsRepository(db).get_all(limit=50, after=1000)),
+    ("CookStatisticsRepository.get_all after", lambda db: CookStatisticsRepository(db).get_all(limit=50, after=1000)),
+    ("OrderItemRepository.get_by_id", lambda db: OrderItemRepository(db).get_by_id(1)),
+    ("OrderItemRepository.get_by_order", lambda db: OrderItemRepository(db).get_by_order(1)),
+    ("OrderItemRepository.get_by_menu", lambda db: OrderItemRepository(db).get_by_menu(1)),
+    ("TableRepository.get_by_number", lambda db: TableRepository(db).get_by_number(1)),
+    ("TableRepository.get_available_tables", lambda db: TableRepository(db).get_available_tables()),
+    ("WaiterStatisticsRepository.get_by_waiter", lambda db: WaiterStatisticsRepository(db).get_by_waiter(1)),
+    ("CookStatisticsRepository.get_by_cook", lambda db: CookStatisticsRepository(db).get_by_cook(1)),
+    ("CategoryRepository.get_by_name", lambda db: CategoryRepository(db).get_by_name("Супы")),
+    ("RoleRepository.get_by_name", lambda db: RoleRepository(db).get_by_name("admin")),
+    ("UserRepository.get_by_username", lambda db: UserRepository(db).get_by_username("admin")),
+    ("UserRepository.get_by_email", lambda db: UserRepository(db).get_by_email("a@b.c")),
+    ("AdminRepository.get_by_login", lambda db: AdminRepository(db).get_by_login("admin")),
+    ("CookRepository.get_by_login", lambda db: CookRepository(db).get_by_login("cook")),
+    ("WaiterRepository.get_by_login", lambda db: WaiterRepository(db).get_by_login("waiter")),
+    ("MigrationRepository.get_by_version", lambda db: MigrationRepository(db).get_by_version("001")),
+]
+
+
+@pytest.mark.parametrize("name, call", REPOSITORY_QUERIES, ids=[q[0] for q in REPOSITORY_QUERIES])
+def test_repository_query_uses_index(name, call):
+    plans = asyncio.run(_explain_repository_query(call))
+    assert plans, f"{name} не выполнил ни одного запроса"
+
+    for sql, details in plans:
+        scans = [detail for detail in details if FULL_SCAN.match(detail)]
+        assert not scans, f"{name}: полный просмотр {scans} в запросе\n{sql}"
+
+
+@pytest.fixture(scope="module")
+def legacy_db():
+    conn = sqlite3.connect(":memory:")
+    bootstrap_database(conn, seed=True)
+    yield conn
+    conn.close()
+
+
+# Горячие запросы main.py с фильтрами по индексируемым колонкам
+MAIN_QUERIES = [
+    ("dashboard counters", "SELECT owner_id, name, value FROM stat_counters WHERE owner_id IN (?, ?)", (0, 1)),
+    ("login", "SELECT id, username, name, role FROM users WHERE username = ? AND password = ?", ("a", "b")),
+    ("stats: orders by waiter", "SELECT COUNT(*) FROM orders WHERE waiter_id = ?", (1,)),
+    ("stats: active orders", "SELECT COUNT(*) FROM orders WHERE waiter_id = ? AND status IN ('pending', 'cooking')", (1,)),
+    ("stats: occupied tables", "SELECT COUNT(*) FROM tables WHERE status = 'occupied'", ()),
+    ("menu", "SELECT id, name, price, category, cooking_time FROM dishes WHERE available = 1", ()),
+    ("resolve dishes by name", "SELECT id, name, price FROM dishes WHERE name IN (?, ?) ORDER BY available, id DESC", ("Борщ", "Чай")),
+    ("order lines", "SELECT * FROM order_items WHERE order_id = ?", (1,)),
+    ("dish usage", "SELECT * FROM order_items WHERE menu_id = ?", (1,)),
+    ("orders by table", "SELECT * FROM orders WHERE table_id = ? AND status = ?", (1, "pending")),
+    ("orders by status", "SELECT * FROM orders WHERE status = ? ORDER BY created_at", ("pending",)),
+    ("rollups: changed orders", CHANGED_HOURS_SQL, ("2026-01-01 00:00:00", "2026-01-02 00:00:00")),
+    ("rollups: range report", RANGE_SQL + " AND key_id = ?", ("waiter", "hour", "2026-01-01", "2026-01-02", 1)),
+]
+
+
+@pytest.mark.parametrize("name, sql, params", MAIN_QUERIES, ids=[q[0] for q in MAIN_QUERIES])
+def test_main_query_uses_index(legacy_db, name, sql, params):
+    scans = full_scans(legacy_db, sql, params)
+    assert not scans, f"{name}: полный просмотр {scans}"
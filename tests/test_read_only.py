@@ -0,0 +1,63 @@
+# tests/test_read_only.py
+"""Read-only подключения для GET: читают то, что зафиксировал писатель, и не пишут."""
+import asyncio
+import sqlite3
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.database.pool import SQLitePool, engine_pool_stats
+from app.database.pragmas import apply_sqlite_pragmas, read_only_uri
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = str(tmp_path / "restaurant.db")
+    writer = SQLitePool(path, size=1)
+    with writer.connection() as conn:
+        conn.execute("CREATE TABLE dishes (id INTEGER PRIMARY KEY, name TEXT)")
+        conn.execute("INSERT INTO dishes (name) VALUES ('Борщ')")
+        conn.commit()
+    yield path, writer
+    writer.close()
+
+
+def test_read_only_pool_sees_commits_and_rejects_writes(database):
+    path, writer = database
+    reader = SQLitePool(path, size=1, read_only=True)
+    try:
+        with writer.connection() as conn:
+            conn.execute("INSERT INTO dishes (name) VALUES ('Чай')")
+            conn.commit()
+
+        with reader.connection() as conn:
+            assert [row["name"] for row in conn.execute("SELECT name FROM dishes ORDER BY id")] == ["Борщ", "Чай"]
+            assert conn.execute("PRAGMA query_only").fetchone()[0] == 1
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("DELETE FROM dishes")
+
+        assert reader.stats()["read_only"] is True
+    finally:
+        reader.close()
+
+
+async def _read_engine(path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{read_only_uri(path)}&uri=true")
+    event.listen(engine.sync_engine, "connect", lambda conn, record: apply_sqlite_pragmas(conn, read_only=True))
+    try:
+        async with engine.connect() as conn:
+            count = (await conn.execute(text("SELECT count(*) FROM dishes"))).scalar_one()
+            with pytest.raises(Exception, match="readonly"):
+                await conn.execute(text("UPDATE dishes SET name = 'X'"))
+        return count, engine_pool_stats(engine)
+    finally:
+        await engine.dispose()
+
+
+def test_async_read_engine_is_read_only(database):
+    path, _ = database
+    count, stats = asyncio.run(_read_engine(path))
+
+    assert count == 1
+    assert stats["checkedout"] == 0 and stats["checkedin"] == 1
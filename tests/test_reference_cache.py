@@ -0,0 +1,108 @@
+# tests/test_reference_cache.py
+"""Кэш справочных строк: TTL, LRU, сброс после commit и identity map сессии."""
+import asyncio
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.database import reference_cache
+from app.database.database import Base
+from app.database.reference_cache import ReferenceCache, cached_lookup, invalidate_on_commit
+from app.models.categories import CategoriesModel
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(reference_cache.time, "monotonic", lambda: now[0])
+    cache = ReferenceCache("test", ttl=10, max_size=10)
+    cache.set("a", {"id": 1})
+
+    now[0] = 109.0
+    assert cache.get("a") == {"id": 1}
+    now[0] = 110.5
+    assert cache.get("a") is None
+    assert cache.stats()["expired"] == 1
+
+
+def test_size_is_bounded_by_lru():
+    cache = ReferenceCache("test", ttl=60, max_size=2)
+    cache.set("a", {"id": 1})
+    cache.set("b", {"id": 2})
+    cache.get("a")
+    cache.set("c", {"id": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"id": 1} and cache.get("c") == {"id": 3}
+    assert cache.stats()["evictions"] == 1
+
+
+def _statement(category_id):
+    return select(*CategoriesModel.__table__.columns).where(CategoriesModel.id == category_id)
+
+
+async def _sessions():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_factory() as session:
+        session.add(CategoriesModel(id=1, name="Супы"))
+        await session.commit()
+    return engine, session_factory
+
+
+async def _invalidation():
+    engine, session_factory = await _sessions()
+    cache = ReferenceCache("test", ttl=60, max_size=10)
+    try:
+        async with session_factory() as session:
+            await cached_lookup(session, cache, 1, CategoriesModel, _statement(1))
+        cached = cache.stats()["entries"]
+
+        # Откат: повторного сброса нет, закэшированное после него остаётся
+        async with session_factory() as session:
+            invalidate_on_commit(session, cache)
+            await cached_lookup(session, cache, 1, CategoriesModel, _statement(1))
+            await session.rollback()
+        after_rollback = cache.stats()["entries"]
+
+        # Строку успели закэшировать между записью и commit — commit её сбрасывает
+        async with session_factory() as session:
+            invalidate_on_commit(session, cache)
+            async with session_factory() as other:
+                await cached_lookup(other, cache, 1, CategoriesModel, _statement(1))
+            before_commit = cache.stats()["entries"]
+            await session.commit()
+        return cached, after_rollback, before_commit, cache.stats()["entries"]
+    finally:
+        await engine.dispose()
+
+
+def test_invalidate_on_commit_clears_after_commit_only():
+    cached, after_rollback, before_commit, after_commit = asyncio.run(_invalidation())
+
+    assert (cached, after_rollback, before_commit, after_commit) == (1, 1, 1, 0)
+
+
+async def _identity_map():
+    engine, session_factory = await _sessions()
+    cache = ReferenceCache("test", ttl=60, max_size=10)
+    try:
+        async with session_factory() as session:
+            await cached_lookup(session, cache, 1, CategoriesModel, _statement(1))
+        async with session_factory() as session:
+            loaded = await session.get(CategoriesModel, 1)
+            loaded.name = "Супы дня"
+            # Снимок «Супы» из кэша не затирает несброшенное изменение
+            found = await cached_lookup(session, cache, 1, CategoriesModel, _statement(1))
+            return found is loaded, found.name, cache.stats()["hits"]
+    finally:
+        await engine.dispose()
+
+
+def test_cached_row_does_not_overwrite_session_state():
+    same, name, hits = asyncio.run(_identity_map())
+
+    assert same and name == "Супы дня" and hits == 1
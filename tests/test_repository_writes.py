@@ -0,0 +1,233 @@
+# tests/test_repository_writes.py
+"""Число SQL-запросов на запись в репозиториях.
+
+update() и delete() должны укладываться в один UPDATE/DELETE ... RETURNING
+без предварительного SELECT и refresh после записи.
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.database.database import Base
+from app.models.admin import AdminModel
+from app.models.categories import CategoriesModel
+from app.models.cook import CookModel
+from app.models.cook_statistics import CookStatisticsModel
+from app.models.dishes import DishesModel
+from app.models.migration import MigrationHistory
+from app.models.order import OrderModel
+from app.models.order_items import OrderItemsModel
+from app.models.roles import Role
+from app.models.tables import TablesModel
+from app.models.users import User
+from app.models.waiter import WaiterModel
+from app.models.waiter_statistics import WaiterStatisticsModel
+from app.repositories.admin import AdminRepository
+from app.repositories.categories import CategoryRepository
+from app.repositories.cook import CookRepository
+from app.repositories.cook_statistics import CookStatisticsRepository
+from app.repositories.dishes import DishRepository
+from app.repositories.migration import MigrationRepository
+from app.repositories.order_items import OrderItemRepository
+from app.repositories.orders import OrderRepository
+from app.repositories.roles import RoleRepository
+from app.repositories.tables import TableRepository
+from app.repositories.users import UserRepository
+from app.repositories.waiter import WaiterRepository
+from app.repositories.waiter_statistics import WaiterStatisticsRepository
+from app.schemes.admin import AdminUpdate
+from app.schemes.categories import CategoryUpdate
+from app.schemes.cook_statistics import CookStatisticsUpdate
+from app.schemes.dishes import DishUpdate
+from app.schemes.migration import MigrationUpdate
+from app.schemes.order import OrderUpdate
+from app.schemes.order_items import OrderItemCreate, OrderItemUpdate
+from app.schemes.roles import RoleUpdate
+from app.schemes.tables import TableUpdate
+from app.schemes.users import UserUpdate
+from app.schemes.waiter import WaiterUpdate
+from app.schemes.waiter_statistics import WaiterStatisticsUpdate
+
+# (репозиторий, строка для вставки, вызов update, ожидаемые поля результата)
+WRITE_CASES = [
+    (
+        OrderRepository, OrderModel(table_id=1, waiters_id=1),
+        lambda repo, id: repo.update(id, OrderUpdate(status="ready")),
+        {"status": "ready", "table_id": 1},
+    ),
+    (
+        OrderItemRepository, OrderItemsModel(order_id=1, menu_id=1, quantity=1, price=10.0),
+        lambda repo, id: repo.update(id, OrderItemUpdate(quantity=3)),
+        {"quantity": 3, "price": 10.0},
+    ),
+    (
+        TableRepository, TablesModel(table_number=5, capacity=4),
+        lambda repo, id: repo.update(id, TableUpdate(location="терраса")),
+        {"location": "терраса", "table_number": 5},
+    ),
+    (
+        TableRepository, TablesModel(table_number=6, capacity=2),
+        lambda repo, id: repo.update_status(id, "occupied"),
+        {"status": "occupied", "is_available": False},
+    ),
+    (
+        DishRepository, DishesModel(name="Борщ", price=350.0, category_id=1, admin_id=1),
+        lambda repo, id: repo.update(id, DishUpdate(price=400.0)),
+        {"price": 400.0, "name": "Борщ"},
+    ),
+    (
+        CategoryRepository, CategoriesModel(name="Супы"),
+        lambda repo, id: repo.update(id, CategoryUpdate(description="Горячее")),
+        {"description": "Горячее", "name": "Супы"},
+    ),
+    (
+        RoleRepository, Role(name="admin"),
+        lambda repo, id: repo.update(id, RoleUpdate(description="Администратор")),
+        {"description": "Администратор"},
+    ),
+    (
+        UserRepository, User(username="u", email="u@example.com", hashed_password="p"),
+        lambda repo, id: repo.update(id, UserUpdate(password="new")),
+        {"hashed_password": "new", "username": "u"},
+    ),
+    (
+        AdminRepository, AdminModel(login="a", password="p"),
+        lambda repo, id: repo.update(id, AdminUpdate(role="owner")),
+        {"role": "owner"},
+    ),
+    (
+        CookRepository, CookModel(login="c", password="p"),
+        lambda repo, id: repo.update_last_login(id),
+        {"login": "c"},
+    ),
+    (
+        WaiterRepository, WaiterModel(login="w", password="p"),
+        lambda repo, id: repo.update(id, WaiterUpdate(login="w2")),
+        {"login": "w2"},
+    ),
+    (
+        MigrationRepository, MigrationHistory(version="1", status="pending"),
+        lambda repo, id: repo.update(id, MigrationUpdate(status="success")),
+        {"status": "success"},
+    ),
+    (
+        WaiterStatisticsRepository, WaiterStatisticsModel(waiter_id=1),
+        lambda repo, id: repo.update(id, WaiterStatisticsUpdate(occupied_tables=2)),
+        {"occupied_tables": 2},
+    ),
+    (
+        CookStatisticsRepository, CookStatisticsModel(cook_id=1),
+        lambda repo, id: repo.update(id, CookStatisticsUpdate(active_orders=4)),
+        {"active_orders": 4},
+    ),
+]
+
+
+async def _run_write(repository_type, row, call):
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    statements = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            session.add(row)
+            await session.commit()
+            row_id = row.id
+
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            repository = repository_type(session)
+
+            statements.clear()
+            updated = await call(repository, row_id)
+            update_statements = list(statements)
+
+            statements.clear()
+            missing = await call(repository, row_id + 1000)
+            missing_statements = list(statements)
+
+            statements.clear()
+            deleted = await repository.delete(row_id)
+            deleted_again = await repository.delete(row_id)
+            delete_statements = list(statements)
+            await session.commit()
+
+        return updated, update_statements, missing, missing_statements, (deleted, deleted_again), delete_statements
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.parametrize(
+    "repository_type, row, call, expected",
+    WRITE_CASES,
+    ids=[f"{case[0].__name__}-{i}" for i, case in enumerate(WRITE_CASES)],
+)
+def test_update_and_delete_are_single_statements(repository_type, row, call, expected):
+    updated, update_statements, missing, missing_statements, deletes, delete_statements = asyncio.run(
+        _run_write(repository_type, row, call)
+    )
+
+    assert len(update_statements) == 1, update_statements
+    assert update_statements[0].startswith("UPDATE") and "RETURNING" in update_statements[0]
+    assert {key: updated[key] for key in expected} == expected
+
+    assert missing is None
+    assert len(missing_statements) == 1, missing_statements
+
+    # Первое удаление находит строку, второе — уже нет; по одному DELETE на вызов
+    assert deletes == (True, False)
+    assert len(delete_statements) == 2, delete_statements
+    assert all(sql.startswith("DELETE") and "RETURNING" in sql for sql in delete_statements)
+
+
+async def _run_batch():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    statements = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        async with AsyncSession(engine) as session:
+            repository = OrderItemRepository(session)
+            entries = [
+                OrderItemCreate(order_id=1, menu_id=menu_id, quantity=menu_id % 3 + 1, price=10.0 * menu_id)
+                for menu_id in range(12, 0, -1)
+            ]
+
+            statements.clear()
+            created = await repository.create_many(entries)
+            insert_statements = list(statements)
+
+            statements.clear()
+            deleted = await repository.delete_many([created[0]["id"], created[-1]["id"], 10_000])
+            delete_statements = list(statements)
+            await session.commit()
+
+        return entries, created, insert_statements, deleted, delete_statements
+    finally:
+        await engine.dispose()
+
+
+def test_order_item_batch_is_one_statement_per_call():
+    entries, created, insert_statements, deleted, delete_statements = asyncio.run(_run_batch())
+
+    assert len(insert_statements) == 1 and insert_statements[0].count("(?, ?, ?, ?, ?)") == len(entries)
+    # Порядок ответа совпадает с порядком пакета, subtotal посчитан на сервере
+    assert [row["menu_id"] for row in created] == [entry.menu_id for entry in entries]
+    assert all(row["subtotal"] == row["quantity"] * row["price"] for row in created)
+
+    assert len(delete_statements) == 1
+    assert sorted(deleted) == sorted([created[0]["id"], created[-1]["id"]])
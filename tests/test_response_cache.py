@@ -0,0 +1,85 @@
+# tests/test_response_cache.py
+"""Кэш ответов меню и столов: ETag, 304, сброс при записи и предел размера."""
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from app.database.bootstrap import bootstrap_database
+from app.database.pool import SQLitePool
+from app.utils.response_cache import ResponseCache
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    path = str(tmp_path / 'cache.db')
+    conn = sqlite3.connect(path)
+    bootstrap_database(conn, seed=True)
+    conn.close()
+
+    writer, reader = SQLitePool(path, size=1), SQLitePool(path, size=1, read_only=True)
+    monkeypatch.setattr(main, 'db_pool', writer)
+    monkeypatch.setattr(main, 'read_pool', reader)
+    monkeypatch.setattr(main, 'response_cache', ResponseCache())
+    # Без with: startup-задачи приложения (bootstrap рабочей БД) не запускаются
+    yield TestClient(main.app)
+    writer.close()
+    reader.close()
+
+
+def test_etag_and_not_modified(client):
+    first = client.get('/api/dishes/')
+    etag = first.headers['etag']
+    assert first.status_code == 200 and first.json()
+
+    again = client.get('/api/dishes/', headers={'If-None-Match': etag})
+    assert again.status_code == 304 and again.content == b''
+    assert again.headers['etag'] == etag
+    assert client.get('/api/dishes/', headers={'If-None-Match': '"other"'}).status_code == 200
+
+    stats = main.response_cache.stats()
+    assert (stats['misses'], stats['hits'], stats['not_modified']) == (1, 2, 1)
+
+
+def test_query_string_does_not_grow_cache(client):
+    for i in range(20):
+        assert client.get('/api/dishes/', params={'x': i}).status_code == 200
+    stats = main.response_cache.stats()
+    assert stats['entries'] == 1 and stats['misses'] == 1
+
+
+@pytest.mark.parametrize('path, write', [
+    ('/api/dishes/', lambda c: c.post('/api/dishes/', params={'name': 'Квас', 'price': 90, 'category': 'Напитки'})),
+    ('/api/dishes/', lambda c: c.put('/api/dishes/1', params={'price': 999})),
+    ('/api/dishes/', lambda c: c.delete('/api/dishes/1')),
+    ('/api/tables/', lambda c: c.put('/api/tables/1', params={'status': 'reserved'})),
+])
+def test_writes_invalidate_cached_list(client, path, write):
+    before = client.get(path)
+    assert write(client).status_code == 200
+
+    after = client.get(path)
+    assert after.headers['etag'] != before.headers['etag']
+    assert after.json() != before.json()
+    # Старый ETag больше не совпадает — клиент получает новые данные
+    assert client.get(path, headers={'If-None-Match': before.headers['etag']}).status_code == 200
+
+
+def test_entries_are_bounded_by_lru():
+    cache = ResponseCache(max_entries=2)
+    for name in ('a', 'b'):
+        cache.set(ResponseCache.make_key(f'/{name}'), f'/{name}', name.encode(), 0)
+    # Последнее обращение к /a — вытесняется /b
+    assert cache.get(ResponseCache.make_key('/a')) is not None
+    cache.set(ResponseCache.make_key('/c'), '/c', b'c', 0)
+
+    assert cache.get(ResponseCache.make_key('/b')) is None
+    assert cache.get(ResponseCache.make_key('/a')).body == b'a'
+    assert cache.stats()['entries'] == 2 and cache.stats()['evictions'] == 1
+
+    # Ответ, собранный до сброса маршрута, не кэшируется
+    generation = cache.generation('/a')
+    cache.invalidate('/a')
+    cache.set(ResponseCache.make_key('/a'), '/a', b'old', generation)
+    assert cache.get(ResponseCache.make_key('/a')) is None
@@ -0,0 +1,151 @@
+# tests/test_rollups.py
+"""Сводки заказов по часам и дням: инкрементальный агрегатор по водяному знаку."""
+import sqlite3
+import time
+from collections import defaultdict
+
+import pytest
+
+from app.database.bootstrap import bootstrap_database
+from app.database.rollups import aggregate_rollups, read_rollups
+
+# (id, table_id, waiter_id, cook_id, status, total_amount, created_at)
+ORDERS = [
+    (1, 1, 10, 20, 'completed', 500.0, '2026-03-01 18:05:00'),
+    (2, 2, 10, 21, 'cooking', 300.0, '2026-03-01 18:40:00'),
+    (3, 1, 11, 20, 'completed', 800.0, '2026-03-01 19:10:00'),
+    (4, 3, 11, None, 'pending', 150.0, '2026-03-01 23:59:59'),
+    (5, 2, 10, 21, 'completed', 450.0, '2026-03-02 12:00:00'),
+]
+# (order_id, menu_id, quantity, price)
+ITEMS = [
+    (1, 1, 2, 150.0), (1, 2, 1, 200.0),
+    (2, 2, 1, 300.0),
+    (3, 1, 4, 200.0),
+    (4, 3, 1, 150.0),
+    (5, 1, 3, 150.0),
+]
+
+
+def brute_force(conn, dimension, grain):
+    """Та же сводка полным просмотром orders — эталон для сравнения"""
+    size = 13 if grain == 'hour' else 10
+    column = {'waiter': 'o.waiter_id', 'cook': 'o.cook_id', 'table': 'o.table_id'}.get(dimension)
+    totals = defaultdict(lambda: [set(), set(), 0.0, 0])
+    if column:
+        rows = conn.execute(
+            f"SELECT o.id, {column}, o.status, o.total_amount, o.created_at, "
+            "(SELECT COALESCE(SUM(quantity), 0) FROM order_items WHERE order_id = o.id) FROM orders o"
+        )
+        for order_id, key, status, amount, created_at, quantity in rows:
+            if key is None:
+                continue
+            total = totals[(created_at[:size], key)]
+            total[0].add(order_id)
+            if status == 'completed':
+                total[1].add(order_id)
+            total[2] += amount
+            total[3] += quantity
+    else:
+        rows = conn.execute(
+            "SELECT o.id, oi.menu_id, o.status, oi.subtotal, o.created_at, oi.quantity "
+            "FROM orders o JOIN order_items oi ON oi.order_id = o.id"
+        )
+        for order_id, key, status, subtotal, created_at, quantity in rows:
+            total = totals[(created_at[:size], key)]
+            total[0].add(order_id)
+            if status == 'completed':
+                total[1].add(order_id)
+            total[2] += subtotal
+            total[3] += quantity
+    return {
+        key: (len(orders), len(completed), revenue, quantity)
+        for key, (orders, completed, revenue, quantity) in totals.items()
+    }
+
+
+def stored(conn, dimension, grain):
+    size = 13 if grain == 'hour' else 10
+    report = read_rollups(conn, dimension, grain, start='2026-01-01', end='2027-01-01')
+    return {
+        (row['bucket'][:size], row['key_id']): (row['orders'], row['completed_orders'], row['revenue'], row['quantity'])
+        for row in report['rows']
+    }
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = sqlite3.connect(tmp_path / 'rollups.db')
+    bootstrap_database(conn)
+    conn.executemany(
+        'INSERT INTO orders (id, table_id, waiter_id, cook_id, status, total_amount, created_at, updated_at) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?, ?7)',
+        ORDERS,
+    )
+    conn.executemany(
+        'INSERT INTO order_items (order_id, menu_id, quantity, price, subtotal) VALUES (?, ?, ?, ?4, ?3 * ?4)',
+        ITEMS,
+    )
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def assert_matches_orders(conn):
+    for dimension in ('waiter', 'cook', 'dish', 'table'):
+        for grain in ('hour', 'day'):
+            assert stored(conn, dimension, grain) == brute_force(conn, dimension, grain), (dimension, grain)
+
+
+def test_first_run_builds_hour_and_day_rollups(conn):
+    report = aggregate_rollups(conn, batch_hours=2)
+
+    # 4 часа истории пачками по 2 часа
+    assert (report['hours'], report['days'], report['batches']) == (4, 2, 2)
+    assert_matches_orders(conn)
+
+    evening = read_rollups(conn, 'waiter', 'hour', start='2026-03-01T18:00:00', end='2026-03-01T20:00:00')
+    assert [total['key_id'] for total in evening['totals']] == [10, 11]
+    assert evening['totals'][0]['revenue'] == 800.0
+    assert evening['as_of'] == report['watermark']
+
+    # Повторный проход без изменений ничего не пересчитывает
+    assert aggregate_rollups(conn)['hours'] == 0
+
+
+def test_changes_refresh_only_touched_hours(conn):
+    aggregate_rollups(conn)
+    # Изменения получают CURRENT_TIMESTAMP, отсечка водяного знака — прошлая секунда
+    time.sleep(1.1)
+    conn.execute("UPDATE orders SET status = 'completed', cook_id = 22, updated_at = CURRENT_TIMESTAMP WHERE id = 2")
+    conn.execute("DELETE FROM order_items WHERE order_id = 5")
+    conn.execute("DELETE FROM orders WHERE id = 5")
+    conn.commit()
+    time.sleep(1.1)
+
+    report = aggregate_rollups(conn)
+
+    assert (report['hours'], report['days']) == (2, 2)
+    assert_matches_orders(conn)
+    assert read_rollups(conn, 'waiter', 'day', start='2026-03-02', end='2026-03-03')['rows'] == []
+
+
+def test_report_arguments_are_validated(conn):
+    with pytest.raises(ValueError):
+        read_rollups(conn, 'kitchen')
+    with pytest.raises(ValueError):
+        read_rollups(conn, 'waiter', grain='week')
+    with pytest.raises(ValueError):
+        read_rollups(conn, 'waiter', start='yesterday')
+
+
+def test_bootstrap_tolerates_existing_cook_id(conn):
+    # cook_id уже есть (схема по ORM, прерванный прогон), а версия ниже 5
+    conn.execute('PRAGMA user_version = 4')
+    conn.commit()
+
+    bootstrap_database(conn)
+
+    columns = [row[1] for row in conn.execute('PRAGMA table_info(orders)')]
+    assert columns.count('cook_id') == 1
+    assert conn.execute('PRAGMA user_version').fetchone()[0] >= 5
@@ -0,0 +1,78 @@
+# tests/test_sql_logging.py
+"""Лог SQL: без параметров запросов, файл пишет фоновый поток, упавшие запросы не текут."""
+import json
+import logging
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.database import sql_logging
+from app.database.sql_logging import SlowQueryLog, install_sql_logging
+
+SECRET = "pbkdf2$very-secret-hash"
+
+
+@pytest.fixture
+def logged(tmp_path, monkeypatch):
+    path = tmp_path / "slow.jsonl"
+    # Порог 0: медленным считается каждый запрос
+    log = SlowQueryLog(threshold_ms=0, path=str(path))
+    monkeypatch.setattr(sql_logging, "slow_query_log", log)
+    engine = create_engine(f"sqlite:///{tmp_path / 'log.db'}")
+    install_sql_logging(engine, "test", sample_rate=1)
+    yield engine, log, path
+    log.close()
+    engine.dispose()
+
+
+def test_parameters_are_not_logged(logged, caplog):
+    engine, log, path = logged
+    with caplog.at_level(logging.INFO, logger="app.sql"), engine.begin() as conn:
+        conn.execute(text("CREATE TABLE users (name TEXT, password TEXT)"))
+        conn.execute(text("INSERT INTO users VALUES (:name, :password)"), {"name": "a", "password": SECRET})
+
+    entry = log.entries(1)[0]
+    assert entry["statement"].startswith("INSERT INTO users") and entry["rowcount"] == 1
+    assert "parameters" not in entry
+    assert SECRET not in caplog.text
+
+    # Файл дописывает поток QueueListener; close() дожидается очереди
+    log.close()
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [line["statement"] for line in lines] == [entry["statement"] for entry in log.entries()[::-1]]
+    assert SECRET not in path.read_text(encoding="utf-8")
+
+
+def test_failed_statement_does_not_leave_timer(logged):
+    engine, log, _ = logged
+    with engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            conn.execute(text("SELECT * FROM missing_table"))
+        assert conn.info.get("query_started") == []
+        conn.execute(text("SELECT 1"))
+        assert conn.info["query_started"] == []
+
+
+def test_statement_cache_stats_are_kept_per_engine_name(tmp_path, monkeypatch):
+    stats = sql_logging.StatementCacheStats()
+    monkeypatch.setattr(sql_logging, "statement_cache_stats", stats)
+    # Один файл и один драйвер, как у пишущего и read-only движков app/api
+    writer = create_engine(f"sqlite:///{tmp_path / 'same.db'}")
+    reader = create_engine(f"sqlite:///{tmp_path / 'same.db'}")
+    install_sql_logging(writer, "writer", sample_rate=0)
+    install_sql_logging(reader, "reader", sample_rate=0)
+    try:
+        for _ in range(3):
+            with writer.connect() as conn:
+                conn.execute(text("SELECT 1"))
+        with reader.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    finally:
+        writer.dispose()
+        reader.dispose()
+
+    result = stats.stats()
+    assert set(result) == {"writer", "reader"}
+    assert (result["writer"]["cache_hit"], result["writer"]["cache_miss"]) == (2, 1)
+    assert result["reader"]["cache_miss"] == 1 and result["reader"].get("cache_hit", 0) == 0
@@ -0,0 +1,95 @@
+# tests/test_stat_counters.py
+"""Счётчики дашборда на триггерах: совпадают с COUNT(*) после любых изменений."""
+import sqlite3
+
+import pytest
+
+from app.database.bootstrap import bootstrap_database
+from app.database.counters import check_counters, read_user_counters
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = sqlite3.connect(tmp_path / 'counters.db')
+    bootstrap_database(conn)
+    yield conn
+    conn.close()
+
+
+def stored(conn):
+    return {
+        (owner_id, name): value
+        for owner_id, name, value in conn.execute('SELECT owner_id, name, value FROM stat_counters')
+        if value
+    }
+
+
+def counted(conn):
+    """Те же счётчики полным подсчётом — эталон"""
+    expected = {}
+    for waiter_id, total, active in conn.execute(
+        "SELECT waiter_id, COUNT(*), SUM(status IN ('pending', 'cooking')) FROM orders GROUP BY waiter_id"
+    ):
+        expected[(waiter_id, 'orders_total')] = total
+        expected[(waiter_id, 'orders_active')] = active
+    expected[(0, 'tables_occupied')] = conn.execute("SELECT COUNT(*) FROM tables WHERE status = 'occupied'").fetchone()[0]
+    expected[(0, 'employees')] = conn.execute('SELECT COUNT(*) FROM users').fetchone()[0]
+    return {key: value for key, value in expected.items() if value}
+
+
+def test_triggers_follow_inserts_updates_and_deletes(conn):
+    conn.executemany(
+        "INSERT INTO users (id, username, password, name, role) VALUES (?, ?, 'x', ?, 'waiter')",
+        [(1, 'w1', 'Официант 1'), (2, 'w2', 'Официант 2'), (3, 'w3', 'Официант 3')],
+    )
+    conn.executemany(
+        "INSERT INTO tables (id, table_number, capacity, location, status) VALUES (?, ?, 4, 'зал', ?)",
+        [(1, 1, 'free'), (2, 2, 'occupied'), (3, 3, 'reserved')],
+    )
+    conn.executemany(
+        "INSERT INTO orders (id, table_id, waiter_id, status) VALUES (?, ?, ?, ?)",
+        [(1, 1, 1, 'pending'), (2, 2, 1, 'cooking'), (3, 2, 2, 'ready'), (4, 3, 2, 'pending')],
+    )
+    assert stored(conn) == counted(conn)
+    assert read_user_counters(conn, 1) == {
+        'total_orders': 2, 'active_orders': 2, 'occupied_tables': 1, 'total_employees': 3,
+    }
+
+    steps = [
+        "UPDATE orders SET status = 'completed' WHERE id = 1",
+        "UPDATE orders SET status = 'pending' WHERE id = 3",
+        # Заказ переходит к другому официанту вместе со сменой статуса
+        "UPDATE orders SET waiter_id = 3, status = 'cooking' WHERE id = 2",
+        # Изменение колонок, на которые триггеры не смотрят
+        "UPDATE orders SET total_amount = 500 WHERE id = 4",
+        "DELETE FROM orders WHERE id = 4",
+        "UPDATE tables SET status = 'occupied' WHERE id IN (1, 3)",
+        "UPDATE tables SET status = 'free' WHERE id = 2",
+        "DELETE FROM tables WHERE id = 3",
+        "DELETE FROM users WHERE id = 3",
+    ]
+    for step in steps:
+        conn.execute(step)
+        assert stored(conn) == counted(conn), step
+    conn.commit()
+
+    assert check_counters(conn)['drift'] == []
+
+
+def test_check_counters_finds_and_repairs_drift(conn):
+    conn.execute("INSERT INTO users (id, username, password, name, role) VALUES (1, 'w1', 'x', 'О', 'waiter')")
+    conn.execute("INSERT INTO orders (table_id, waiter_id, status) VALUES (1, 1, 'pending')")
+    # Изменения в обход триггеров: ручная правка и потерянная строка
+    conn.execute("UPDATE stat_counters SET value = 7 WHERE owner_id = 1 AND name = 'orders_total'")
+    conn.execute("DELETE FROM stat_counters WHERE name = 'employees'")
+    conn.commit()
+
+    report = check_counters(conn)
+    assert {(d['name'], d['stored'], d['expected']) for d in report['drift']} == {
+        ('orders_total', 7, 1), ('employees', 0, 1),
+    }
+    assert not report['repaired'] and stored(conn) != counted(conn)
+
+    repaired = check_counters(conn, repair=True)
+    assert repaired['repaired'] and stored(conn) == counted(conn)
+    assert check_counters(conn)['drift'] == []
@@ -0,0 +1,256 @@
+# tests/test_statistics_buffer.py
+"""Write-behind буфер статистики: слияние приращений, пачки, чтение с незаписанным."""
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.database.database import Base
+from app.database.db_manager import DBManager
+from app.models.cook_statistics import CookStatisticsModel
+from app.models.waiter_statistics import WaiterStatisticsModel
+from app.services.cook_statistics import CookStatisticsService
+from app.services.order_events import CookDelta, WaiterDelta
+from app.services.statistics_buffer import StatisticsBuffer
+from app.services.waiter_statistics import WaiterStatisticsService
+from app.utils.pagination import NEXT_CURSOR_HEADER, encode_cursor
+
+
+async def _database(tmp_path, create=True):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'buffer.db'}")
+    if create:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with async_sessionmaker(engine)() as session:
+            session.add_all([
+                WaiterStatisticsModel(waiter_id=1, total_orders=10, total_revenue=1000.0),
+                CookStatisticsModel(cook_id=1, active_orders=0, completed_orders=2, average_cooking_time=10.0),
+            ])
+            await session.commit()
+    return engine, async_sessionmaker(engine, expire_on_commit=False)
+
+
+async def _read(session_factory, buffer):
+    async with DBManager(session_factory) as db:
+        waiter = await WaiterStatisticsService(db.waiter_statistics, buffer).get_statistic_by_waiter(1)
+        cooks = await CookStatisticsService(db.cook_statistics, buffer).get_all_statistics()
+        stored = await db.waiter_statistics.get_by_waiter(1)
+        # Сервис отдаёт ORM-строку или её копию с наложенной дельтой
+        as_dict = lambda row: {c.key: getattr(row, c.key) for c in row.__table__.columns}
+        return as_dict(waiter)["total_orders"], stored.total_orders, [as_dict(cook) for cook in cooks]
+
+
+async def _coalesce(tmp_path):
+    engine, session_factory = await _database(tmp_path)
+    buffer = StatisticsBuffer(session_factory, flush_interval_ms=100, flush_events=10_000)
+    updates = []
+    event.listen(engine.sync_engine, "before_cursor_execute",
+                 lambda conn, cursor, sql, *args: sql.startswith("UPDATE") and updates.append(sql))
+    try:
+        for i in range(300):
+            buffer.add_waiter(i % 3 + 1, WaiterDelta(total_orders=1, total_revenue=10.0))
+            if i % 2:
+                buffer.add_cook(1, CookDelta(active_orders=-1, completed_orders=1, cooking_minutes=4.0))
+            else:
+                buffer.add_cook(2, CookDelta(active_orders=1))
+        pending = await _read(session_factory, buffer)
+        pending_stats = buffer.stats()
+
+        await asyncio.sleep(0.3)
+        flushed = await _read(session_factory, buffer)
+        return pending, pending_stats, flushed, buffer.stats(), updates
+    finally:
+        await buffer.stop()
+        await engine.dispose()
+
+
+def test_deltas_are_coalesced_and_merged_into_reads(tmp_path):
+    pending, pending_stats, flushed, stats, updates = asyncio.run(_coalesce(tmp_path))
+
+    # До записи: в БД старое значение, чтение через сервис уже с приращениями
+    waiter_total, stored_total, cooks = pending
+    assert (waiter_total, stored_total) == (110, 10)
+    assert pending_stats["pending_events"] == 600 and pending_stats["pending_rows"] == 5
+    cook = cooks[0]
+    assert cook["active_orders"] == 0
+    assert cook["completed_orders"] == 152
+    assert abs(cook["average_cooking_time"] - (10.0 * 2 + 4.0 * 150) / 152) < 1e-9
+
+    # Одна пачка по интервалу: одна транзакция, UPDATE на строку, а не на событие
+    waiter_total, stored_total, cooks = flushed
+    assert waiter_total == stored_total == 110
+    assert (stats["flushes"], stats["last_batch_events"], stats["last_batch_rows"]) == (1, 600, 5)
+    assert stats["pending_events"] == 0 and stats["failed_flushes"] == 0
+    assert len(updates) == 5
+    assert cooks[0]["completed_orders"] == 152 and len(cooks) == 2
+
+
+async def _thresholds(tmp_path):
+    engine, session_factory = await _database(tmp_path)
+    try:
+        by_count = StatisticsBuffer(session_factory, flush_interval_ms=60_000, flush_events=5)
+        for _ in range(5):
+            by_count.add_waiter(1, WaiterDelta(total_orders=1))
+        await asyncio.sleep(0.1)
+        after_count = by_count.stats()["flushes"]
+
+        on_shutdown = StatisticsBuffer(session_factory, flush_interval_ms=60_000, flush_events=1000)
+        on_shutdown.add_waiter(1, WaiterDelta(total_orders=1))
+        await on_shutdown.stop()
+        await by_count.stop()
+
+        async with DBManager(session_factory) as db:
+            return after_count, (await db.waiter_statistics.get_by_waiter(1)).total_orders
+    finally:
+        await engine.dispose()
+
+
+def test_flush_by_event_count_and_on_shutdown(tmp_path):
+    after_count, total_orders = asyncio.run(_thresholds(tmp_path))
+
+    assert after_count == 1
+    assert total_orders == 10 + 5 + 1
+
+
+async def _failed_flush(tmp_path):
+    engine, session_factory = await _database(tmp_path, create=False)
+    buffer = StatisticsBuffer(session_factory, flush_interval_ms=60_000)
+    try:
+        buffer.add_cook(4, CookDelta(active_orders=2))
+        failed = await buffer.flush()
+        stats = buffer.stats()
+
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        retried = await buffer.flush()
+        async with DBManager(session_factory) as db:
+            return failed, stats, retried, (await db.cook_statistics.get_by_cook(4)).active_orders
+    finally:
+        await buffer.stop()
+        await engine.dispose()
+
+
+def test_failed_flush_keeps_deltas_for_retry(tmp_path):
+    failed, stats, retried, active = asyncio.run(_failed_flush(tmp_path))
+
+    assert failed == 0
+    assert stats["failed_flushes"] == 1 and stats["pending_events"] == 1
+    assert retried == 1
+    # Строки не было — первая запись её создаёт
+    assert active == 2
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    """Роутеры статистики над временной БД и своим буфером"""
+    import app.api.dependencies as api_dependencies
+    import app.dependencies as dependencies
+    from app.api.cook_statistics import router as cook_router
+    from app.api.waiter_statistics import router as waiter_router
+
+    engine, session_factory = asyncio.run(_database(tmp_path))
+    async def second_row():
+        async with DBManager(session_factory) as db:
+            db.session.add(WaiterStatisticsModel(waiter_id=2, total_orders=1, total_revenue=50.0))
+            await db.commit()
+    asyncio.run(second_row())
+
+    buffer = StatisticsBuffer(session_factory, flush_interval_ms=60_000)
+    monkeypatch.setattr(dependencies, "AsyncSessionLocal", session_factory)
+    monkeypatch.setattr(dependencies, "ReadSessionLocal", session_factory)
+    monkeypatch.setattr(api_dependencies, "statistics_buffer", buffer)
+    app = FastAPI()
+    app.include_router(waiter_router)
+    app.include_router(cook_router)
+    try:
+        with TestClient(app) as client:
+            yield client, buffer, session_factory
+    finally:
+        asyncio.run(buffer.stop())
+        asyncio.run(engine.dispose())
+
+
+def test_list_pages_while_deltas_are_pending(api):
+    client, buffer, _ = api
+
+    # Ручное приращение идёт через тот же буфер, что и события заказов
+    added = client.patch("/waiter-statistics/waiter/2/add-order", params={"revenue": 30.0})
+    assert added.status_code == 200 and added.json()["total_orders"] == 2
+    assert buffer.stats()["pending_events"] == 1
+
+    # Последняя строка страницы — копия с дельтой, курсор берётся с неё
+    page = client.get("/waiter-statistics/", params={"limit": 2})
+    assert page.status_code == 200
+    assert [row["total_orders"] for row in page.json()] == [10, 2]
+    assert page.headers[NEXT_CURSOR_HEADER] == encode_cursor(2)
+
+    rest = client.get("/waiter-statistics/", params={"limit": 2, "after": page.headers[NEXT_CURSOR_HEADER]})
+    assert rest.json() == []
+    assert client.patch("/waiter-statistics/waiter/9/add-order").status_code == 404
+
+
+def test_put_returns_updated_row_with_pending_delta(api):
+    client, buffer, session_factory = api
+
+    # Без дельты: строка из UPDATE ... RETURNING как есть
+    waiter = client.put("/waiter-statistics/1", json={"tips_amount": 70.0})
+    assert waiter.status_code == 200
+    assert (waiter.json()["tips_amount"], waiter.json()["total_orders"]) == (70.0, 10)
+    cook = client.put("/cook-statistics/1", json={"active_orders": 3})
+    assert cook.status_code == 200 and cook.json()["active_orders"] == 3
+
+    # С дельтой (ручные приращения ждут в буфере): она накладывается на ту же строку
+    client.patch("/waiter-statistics/waiter/1/add-order")
+    client.patch("/waiter-statistics/waiter/1/add-order")
+    client.patch("/cook-statistics/cook/1/update-orders")
+    assert buffer.stats()["pending_events"] == 3
+    waiter = client.put("/waiter-statistics/1", json={"occupied_tables": 4})
+    assert (waiter.json()["occupied_tables"], waiter.json()["total_orders"]) == (4, 12)
+    assert client.put("/cook-statistics/1", json={}).json()["active_orders"] == 4
+    assert client.put("/waiter-statistics/99", json={"tips_amount": 1.0}).status_code == 404
+
+    async def add_hours():
+        async with DBManager(session_factory) as db:
+            row = await WaiterStatisticsService(db.waiter_statistics, buffer).update_waiter_hours(1, 2.5)
+            await db.commit()
+            return row
+    hours = asyncio.run(add_hours())
+    assert (hours["hours_worked"], hours["total_orders"]) == (2.5, 12)
+
+
+async def _read_during_flush(tmp_path, monkeypatch):
+    engine, session_factory = await _database(tmp_path)
+    buffer = StatisticsBuffer(session_factory, flush_interval_ms=60_000)
+    committed, release = asyncio.Event(), asyncio.Event()
+    close = DBManager.__aexit__
+
+    async def slow_exit(self, *args):
+        # commit уже прошёл, закрытие сессии задерживается
+        committed.set()
+        await release.wait()
+        await close(self, *args)
+
+    try:
+        buffer.add_waiter(1, WaiterDelta(total_orders=5))
+        monkeypatch.setattr(DBManager, "__aexit__", slow_exit)
+        flushing = asyncio.create_task(buffer.flush())
+        await committed.wait()
+        monkeypatch.setattr(DBManager, "__aexit__", close)
+        during, stored, _ = await _read(session_factory, buffer)
+        release.set()
+        await flushing
+        return during, stored
+    finally:
+        release.set()
+        await buffer.stop()
+        await engine.dispose()
+
+
+def test_read_between_commit_and_session_close_counts_once(tmp_path, monkeypatch):
+    during, stored = asyncio.run(_read_during_flush(tmp_path, monkeypatch))
+
+    assert stored == 15
+    assert during == 15
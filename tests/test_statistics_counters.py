@@ -0,0 +1,71 @@
+# tests/test_statistics_counters.py
+"""Счётчики статистики: атомарные UPDATE ... RETURNING без потерянных приращений."""
+import asyncio
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.database.database import Base
+from app.models.cook_statistics import CookStatisticsModel
+from app.models.waiter_statistics import WaiterStatisticsModel
+from app.repositories.cook_statistics import CookStatisticsRepository
+from app.repositories.waiter_statistics import WaiterStatisticsRepository
+
+PARALLEL = 50
+
+
+async def _run_parallel(tmp_path):
+    # Файловая БД и отдельное подключение на каждую сессию — как у параллельных запросов
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'stats.db'}",
+        pool_size=PARALLEL,
+        connect_args={"timeout": 30},
+    )
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    statements = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with session_factory() as session:
+            session.add_all([WaiterStatisticsModel(waiter_id=7), CookStatisticsModel(cook_id=3, active_orders=1)])
+            await session.commit()
+
+        async def finish_order(i):
+            async with session_factory() as session:
+                waiters = WaiterStatisticsRepository(session)
+                await waiters.increment_orders(7, revenue=100.0, tips=float(i % 2))
+                await waiters.update_hours_worked(7, 0.5)
+                await CookStatisticsRepository(session).update_active_orders(3, 1 if i % 2 else -1)
+                await session.commit()
+
+        statements.clear()
+        await asyncio.gather(*(finish_order(i) for i in range(PARALLEL)))
+        written = [sql for sql in statements if sql.startswith(("SELECT", "UPDATE"))]
+
+        async with session_factory() as session:
+            waiter = await WaiterStatisticsRepository(session).get_by_waiter(7)
+            clamped = await CookStatisticsRepository(session).update_active_orders(3, -100)
+            missing = await WaiterStatisticsRepository(session).increment_orders(999)
+        return waiter, clamped, missing, written
+    finally:
+        await engine.dispose()
+
+
+def test_parallel_increments_are_not_lost(tmp_path):
+    waiter, clamped, missing, written = asyncio.run(_run_parallel(tmp_path))
+
+    assert waiter.total_orders == PARALLEL
+    assert waiter.total_revenue == 100.0 * PARALLEL
+    assert waiter.tips_amount == PARALLEL // 2
+    assert waiter.hours_worked == 0.5 * PARALLEL
+    # Одно выражение на вызов, без SELECT перед UPDATE
+    assert len(written) == 3 * PARALLEL
+    assert all(sql.startswith("UPDATE") and "RETURNING" in sql for sql in written)
+
+    assert clamped["active_orders"] == 0
+    assert missing is None
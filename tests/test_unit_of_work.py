@@ -0,0 +1,54 @@
+# tests/test_unit_of_work.py
+"""Unit of work запроса app/api: commit до отправки ответа, ошибка commit — 5xx."""
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import app.dependencies as dependencies
+from app.api.tables import router
+from app.database.database import Base
+from app.database.db_manager import DBManager
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'uow.db'}")
+
+    async def create():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    asyncio.run(create())
+
+    # Писатель и «читатель» — один файл: GET видит только зафиксированное
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(dependencies, "AsyncSessionLocal", session_factory)
+    monkeypatch.setattr(dependencies, "ReadSessionLocal", session_factory)
+    api = FastAPI()
+    api.include_router(router)
+    with TestClient(api, raise_server_exceptions=False) as client:
+        yield client
+    asyncio.run(engine.dispose())
+
+
+def test_write_is_committed_before_response(client):
+    created = client.post("/tables/", json={"table_number": 7})
+    assert created.status_code == 201
+
+    listed = client.get("/tables/")
+    assert [table["table_number"] for table in listed.json()] == [7]
+
+
+def test_failed_commit_is_reported_as_server_error(client, monkeypatch):
+    async def busy(self):
+        raise OperationalError("COMMIT", {}, Exception("database is locked"))
+    with monkeypatch.context() as patch:
+        patch.setattr(DBManager, "commit", busy)
+        response = client.post("/tables/", json={"table_number": 8})
+    assert response.status_code == 500
+
+    # Незафиксированная вставка откачена
+    assert client.get("/tables/").json() == []